@@ -68,6 +68,11 @@ class Config(object):
         or os.environ.get("PM_LOGGR_BOT_API_ID")
         or 0
     )
+    # seconds pm and tag logs are buffered before they are sent as one batch
+    LOG_BATCH_INTERVAL = float(os.environ.get("LOG_BATCH_INTERVAL") or 5)
+    # mask secrets in outgoing text instead of moving the message to the bot log group
+    REDACT_SECRETS = os.environ.get("REDACT_SECRETS", False)
+    REDACT_SECRETS = bool(REDACT_SECRETS and (REDACT_SECRETS.lower() != "false"))
 
     # Custom vars for userbot
     # set this will channel id of your custom plugins
@@ -80,6 +85,14 @@ class Config(object):
     )
     # specify NO_LOAD with plugin names for not loading in userbot
     NO_LOAD = list(os.environ.get("NO_LOAD", "").split())
+    # import plugins only when one of their commands is first used
+    LAZY_PLUGINS = os.environ.get("LAZY_PLUGINS", False)
+    LAZY_PLUGINS = bool(LAZY_PLUGINS and (LAZY_PLUGINS.lower() != "false"))
+    PLUGIN_MANIFEST = os.environ.get(
+        "PLUGIN_MANIFEST", "userbot/cache/plugin_manifest.json"
+    )
+    # plugins that take longer than this to import are logged as slow
+    SLOW_PLUGIN_MS = int(os.environ.get("SLOW_PLUGIN_MS") or 500)
     # specify command handler that should be used for the plugins
     # this should be a valid "regex" pattern
     COMMAND_HAND_LER = os.environ.get("COMMAND_HAND_LER", r".")
@@ -90,6 +103,26 @@ class Config(object):
     TEMP_DIR = os.environ.get("TEMP_DIR", "./temp/")
     # SpamWatch, CAS, SpamProtection ban Needed or not
     ANTISPAMBOT_BAN = os.environ.get("ANTISPAMBOT_BAN", False)
+    # shared http client pool for plugins and helpers
+    HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE") or 100)
+    HTTP_PER_HOST_LIMIT = int(os.environ.get("HTTP_PER_HOST_LIMIT") or 10)
+    HTTP_TIMEOUT = int(os.environ.get("HTTP_TIMEOUT") or 60)
+    HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES") or 2)
+    # cache for repeated api lookups, set HTTP_CACHE_DB to a file path to keep it across restarts
+    HTTP_CACHE_SIZE = int(os.environ.get("HTTP_CACHE_SIZE") or 512)
+    HTTP_CACHE_TTL = int(os.environ.get("HTTP_CACHE_TTL") or 300)
+    HTTP_CACHE_STALE = int(os.environ.get("HTTP_CACHE_STALE") or 600)
+    HTTP_CACHE_DB = os.environ.get("HTTP_CACHE_DB", None)
+    # worker processes for image rendering, 0 means one per cpu core
+    PROCESS_POOL_WORKERS = int(os.environ.get("PROCESS_POOL_WORKERS") or 0)
+    # ffmpeg, cwebp and other heavy tools allowed to run at once, 0 means one per cpu core
+    HEAVY_PROCESS_LIMIT = int(os.environ.get("HEAVY_PROCESS_LIMIT") or 0)
+    # megabytes of converted stickers/gifs kept to answer repeat conversions, 0 disables it
+    CONVERT_CACHE_SIZE = int(os.environ.get("CONVERT_CACHE_SIZE") or 100)
+    # compress profile (fast, balanced or small) and the video length in seconds
+    # from which it is split and encoded on all cores, 0 turns that off
+    FFMPEG_PROFILE = os.environ.get("FFMPEG_PROFILE", "balanced")
+    FFMPEG_PARALLEL_MIN = int(os.environ.get("FFMPEG_PARALLEL_MIN") or 300)
     # progress bar progress
     FINISHED_PROGRESS_STR = os.environ.get("FINISHED_PROGRESS_STR", "▰")
     UNFINISHED_PROGRESS_STR = os.environ.get("UNFINISHED_PROGRESS_STR", "▱")
@@ -119,6 +152,9 @@ class Config(object):
     G_DRIVE_FOLDER_ID = os.environ.get("G_DRIVE_FOLDER_ID", None)
     G_DRIVE_DATA = os.environ.get("G_DRIVE_DATA", None)
     G_DRIVE_INDEX_LINK = os.environ.get("G_DRIVE_INDEX_LINK", None)
+    # megabytes sent per request and files moved at once for folder transfers
+    G_DRIVE_CHUNK_SIZE = int(os.environ.get("G_DRIVE_CHUNK_SIZE") or 32)
+    G_DRIVE_PARALLEL = int(os.environ.get("G_DRIVE_PARALLEL") or 4)
     # For transfer channel 2 step verification code of telegram
     TG_2STEP_VERIFICATION_CODE = os.environ.get("TG_2STEP_VERIFICATION_CODE", None)
     # JustWatch Country for watch plugin
@@ -14,6 +14,7 @@ import time
 import heroku3
 
 from .Config import Config
+from .core import http
 from .core.logger import logging
 from .core.session import catub
 from .helpers.functions.converter import Convert
@@ -37,6 +38,7 @@ catversion = "3.3.0"
 
 def close_connection(*_):
     print("Closing Userbot connection.")
+    runasync(http.close())
     runasync(catub.disconnect())
     sys.exit(143)
 
@@ -14,11 +14,15 @@ import userbot
 from userbot import BOTLOG_CHATID, PM_LOGGER_GROUP_ID
 
 from .Config import Config
+from .core.cmdindex import build_search_index
+from .core.helpmenu import warm_help_menus
 from .core.logger import logging
+from .core.peercache import start_peer_cache
+from .core.pool import start_process_pool
 from .core.session import catub
 from .utils import (
     add_bot_to_logger_group,
-    install_externalrepo,
+    install_externalrepos,
     load_plugins,
     setup_bot,
     startupmessage,
@@ -45,6 +49,10 @@ async def startup_process():
     await verifyLoggerGroup()
     await load_plugins("plugins")
     await load_plugins("assistant")
+    start_process_pool()
+    warm_help_menus()
+    build_search_index()
+    start_peer_cache(catub)
     LOGS.info(
         "============================================================================"
     )
@@ -66,18 +74,16 @@ async def startup_process():
 
 async def externalrepo():
     string = "<b>Your external repo plugins have imported.<b>\n\n"
+    repos = []
     if Config.EXTERNAL_REPO:
-        data = await install_externalrepo(
-            Config.EXTERNAL_REPO, Config.EXTERNAL_REPOBRANCH, "xtraplugins"
-        )
-        string += f"<b>➜ Repo:  </b><a href='{data[0]}'><b>{data[1]}</b></a>\n<b>     • Imported Plugins:</b>  <code>{data[2]}</code>\n<b>     • Failed to Import:</b>  <code>{', '.join(data[3])}</code>\n\n"
+        repos.append((Config.EXTERNAL_REPO, Config.EXTERNAL_REPOBRANCH, "xtraplugins"))
     if Config.BADCAT:
-        data = await install_externalrepo(
-            Config.BADCAT_REPO, Config.BADCAT_REPOBRANCH, "badcatext"
-        )
-        string += f"<b>➜ Repo:  </b><a href='{data[0]}'><b>{data[1]}</b></a>\n<b>     • Imported Plugins:</b>  <code>{data[2]}</code>\n<b>     • Failed to Import:</b>  <code>{', '.join(data[3])}</code>\n\n"
+        repos.append((Config.BADCAT_REPO, Config.BADCAT_REPOBRANCH, "badcatext"))
     if Config.VCMODE:
-        data = await install_externalrepo(Config.VC_REPO, Config.VC_REPOBRANCH, "catvc")
+        repos.append((Config.VC_REPO, Config.VC_REPOBRANCH, "catvc"))
+    if not repos:
+        return
+    for data in await install_externalrepos(repos):
         string += f"<b>➜ Repo:  </b><a href='{data[0]}'><b>{data[1]}</b></a>\n<b>     • Imported Plugins:</b>  <code>{data[2]}</code>\n<b>     • Failed to Import:</b>  <code>{', '.join(data[3])}</code>\n\n"
     if "Imported Plugins" in string:
         await catub.tgbot.send_message(BOTLOG_CHATID, string, parse_mode="html")
@@ -92,3 +98,4 @@ if len(sys.argv) in {1, 3, 4}:
         catub.run_until_disconnected()
 else:
     catub.disconnect()
+catub._kill_running_processes()
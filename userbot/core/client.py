@@ -9,14 +9,14 @@
 
 import asyncio
 import datetime
-import inspect
 import re
 import sys
+import time
 import traceback
 from pathlib import Path
 from typing import Dict, List, Union
 
-from telethon import TelegramClient, events
+from telethon import TelegramClient, events, functions
 from telethon.errors import (
     AlreadyInConversationError,
     BotInlineDisabledError,
@@ -44,12 +44,25 @@ from .data import (
 )
 from .events import *
 from .fasttelethon import download_file, upload_file
+from .jobs import JobCancelled, catjobs
 from .logger import logging
 from .managers import edit_delete
 from .pluginManager import get_message_link, restart_script
+from .procs import current_command, kill_child, running_processes
 
 LOGS = logging.getLogger(__name__)
 
+# seconds get_me() answers from memory before asking telegram again
+ME_TTL = 300
+# requests that change our own user, get_me() asks telegram again after them
+PROFILE_REQUESTS = (
+    functions.account.UpdateProfileRequest,
+    functions.account.UpdateUsernameRequest,
+    functions.photos.UploadProfilePhotoRequest,
+    functions.photos.UpdateProfilePhotoRequest,
+    functions.photos.DeletePhotosRequest,
+)
+
 
 class REGEX:
     def __init__(self):
@@ -76,6 +89,8 @@ class CatUserBotClient(TelegramClient):
         disable_errors: bool = False,
         command: str or tuple = None,
         public: bool = False,
+        job: str = None,
+        plugin: str = None,
         **kwargs,
     ) -> callable:  # sourcery no-metrics
         if not public:
@@ -84,10 +99,14 @@ class CatUserBotClient(TelegramClient):
         if gvarstatus("blacklist_chats") is not None:
             kwargs["blacklist_chats"] = True
             kwargs["chats"] = blacklist_chats_list()
-        stack = inspect.stack()
-        previous_stack_frame = stack[1]
-        file_test = Path(previous_stack_frame.filename)
-        file_test = file_test.stem.replace(".py", "")
+        if plugin is None:
+            # only the caller's file name is needed, inspect.stack() reads
+            # source context for every frame
+            file_test = Path(sys._getframe(1).f_code.co_filename)
+            file_test = file_test.stem.replace(".py", "")
+        else:
+            # lazy stub registered on behalf of a plugin that isn't imported yet
+            file_test = plugin
         if command is not None:
             command = list(command)
             if command[1] not in BOT_INFO:
@@ -118,6 +137,8 @@ class CatUserBotClient(TelegramClient):
                 REGEX_.regex2 = re.compile(reg2 + pattern)
 
         def decorator(func):  # sourcery no-metrics
+            job_name = command[0] if command is not None else func.__name__
+
             async def wrapper(check):  # sourcery no-metrics
                 # sourcery skip: low-code-quality
                 if groups_only and not check.is_group:
@@ -126,12 +147,25 @@ class CatUserBotClient(TelegramClient):
                     return await edit_delete(
                         check, "`I don't think this is a personal Chat.`"
                     )
+                owner = current_command.set(job_name)
                 try:
-                    await func(check)
+                    if job is None:
+                        await func(check)
+                    else:
+                        # sudo users queue behind the owner's own jobs
+                        async with catjobs.track(
+                            job_name,
+                            job,
+                            priority=int(check.sender_id in _sudousers_list()),
+                            chat_id=check.chat_id,
+                        ):
+                            await func(check)
                 except events.StopPropagation as e:
                     raise events.StopPropagation from e
                 except KeyboardInterrupt:
                     pass
+                except JobCancelled:
+                    await edit_delete(check, "`This job was cancelled.`")
                 except MessageNotModifiedError:
                     LOGS.error("Message was same as previous message")
                 except MessageIdInvalidError:
@@ -206,6 +240,8 @@ class CatUserBotClient(TelegramClient):
                         await check.client.send_message(
                             Config.PRIVATE_GROUP_BOT_API_ID, text, link_preview=False
                         )
+                finally:
+                    current_command.reset(owner)
 
             from .session import catub
 
@@ -358,6 +394,23 @@ class CatUserBotClient(TelegramClient):
 
         return decorator
 
+    async def get_me(self, input_peer: bool = False):
+        "own user, kept in memory so handlers can call it on every event"
+        if input_peer:
+            return await super().get_me(input_peer=True)
+        me, fetched = getattr(self, "_cached_me", (None, 0))
+        if me is None or time.monotonic() - fetched > ME_TTL:
+            me = await super().get_me()
+            self._cached_me = (me, time.monotonic())
+        return me
+
+    async def __call__(self, request, *args, **kwargs):
+        "send a request, forgetting the cached get_me() once our profile changes"
+        result = await super().__call__(request, *args, **kwargs)
+        if isinstance(request, PROFILE_REQUESTS):
+            self._cached_me = (None, 0)
+        return result
+
     async def get_traceback(self, exc: Exception) -> str:
         return "".join(
             traceback.format_exception(etype=type(exc), value=exc, tb=exc.__traceback__)
@@ -367,7 +420,7 @@ class CatUserBotClient(TelegramClient):
         """Kill all the running asyncio subprocessess"""
         for _, process in self.running_processes.items():
             try:
-                process.kill()
+                kill_child(process)
                 LOGS.debug("Killed %d which was still running.", process.pid)
             except Exception as e:
                 LOGS.debug(e)
@@ -379,6 +432,7 @@ CatUserBotClient.fast_upload_file = upload_file
 CatUserBotClient.reload = restart_script
 CatUserBotClient.get_msg_link = get_message_link
 CatUserBotClient.check_testcases = checking
+CatUserBotClient.running_processes = running_processes
 try:
     send_message_check = TelegramClient.send_message
 except AttributeError:
@@ -0,0 +1,140 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Optional, Set, Tuple
+
+from . import CMD_INFO, GRP_INFO, PLG_INFO
+
+# telegram rejects inline answers with more results than this
+MAX_RESULTS = 50
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class CommandIndex:
+    """
+    Trigram index over command names, plugin names and command headers,
+    rebuilt lazily after plugins are loaded or removed.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.sizes = None
+
+    @staticmethod
+    def current_sizes() -> tuple:
+        return len(CMD_INFO), len(PLG_INFO), len(GRP_INFO)
+
+    def build(self) -> None:
+        self.plugin_of: Dict[str, str] = {}
+        self.category_of: Dict[str, str] = {}
+        self.texts: Dict[tuple, str] = {}
+        self.grams: Dict[str, Set[tuple]] = defaultdict(set)
+        for plugin, cmds in PLG_INFO.items():
+            self.add(("plugin", plugin), plugin)
+            for cmd in cmds:
+                self.plugin_of.setdefault(cmd, plugin)
+        for category, plugins in GRP_INFO.items():
+            for plugin in plugins:
+                self.category_of.setdefault(plugin, category)
+        for cmd, about in CMD_INFO.items():
+            self.add(("cmd", cmd), cmd)
+            if len(about) > 1:
+                self.add(("header", cmd), about[1])
+        self.sizes = self.current_sizes()
+        self.ready = True
+
+    def add(self, key: tuple, text: str) -> None:
+        text = text.lower()
+        self.texts[key] = text
+        for gram in _trigrams(text):
+            self.grams[gram].add(key)
+
+    def candidates(self, query: str):
+        grams = _trigrams(query)
+        if not grams:
+            # too short for trigrams, these are rare enough to scan
+            return self.texts
+        keys = None
+        for gram in sorted(grams, key=lambda g: len(self.grams.get(g, ()))):
+            found = self.grams.get(gram, set())
+            keys = set(found) if keys is None else keys & found
+            if not keys:
+                break
+        return keys
+
+    def search(self, query: str, kind: str) -> Tuple[str, ...]:
+        query = query.lower()
+        ranked = {}
+        for key in self.candidates(query):
+            ktype, name = key
+            if (kind == "plugin") != (ktype == "plugin"):
+                continue
+            text = self.texts[key]
+            if query not in text:
+                continue
+            if ktype == "header":
+                rank = 3
+            elif text == query:
+                rank = 0
+            else:
+                rank = 1 if text.startswith(query) else 2
+            ranked[name] = min(rank, ranked.get(name, rank))
+        return tuple(sorted(ranked, key=lambda name: (ranked[name], name)))
+
+
+_INDEX = CommandIndex()
+
+
+def _index() -> CommandIndex:
+    # sizes catch commands registered outside of load_module
+    if not _INDEX.ready or _INDEX.sizes != _INDEX.current_sizes():
+        _INDEX.build()
+        _search.cache_clear()
+    return _INDEX
+
+
+@lru_cache(maxsize=256)
+def _search(query: str, kind: str) -> Tuple[str, ...]:
+    return _INDEX.search(query, kind)
+
+
+def search_commands(query: str) -> Tuple[str, ...]:
+    "commands whose name or header contains query, best matches first"
+    _index()
+    return _search(query, "cmd")
+
+
+def search_plugins(query: str) -> Tuple[str, ...]:
+    "plugins whose name contains query, best matches first"
+    _index()
+    return _search(query, "plugin")
+
+
+def plugin_of(cmd: str) -> Optional[str]:
+    return _index().plugin_of.get(cmd)
+
+
+def category_of(plugin: str) -> Optional[str]:
+    return _index().category_of.get(plugin)
+
+
+def build_search_index() -> None:
+    "index all loaded plugins now instead of on the first search"
+    _index()
+
+
+def clear_search_index() -> None:
+    "call when plugins are loaded or removed"
+    _INDEX.ready = False
+    _search.cache_clear()
@@ -13,6 +13,7 @@ from urlextract import URLExtract
 
 from ..Config import Config
 from . import CMD_INFO, GRP_INFO, PLG_INFO
+from .cmdindex import category_of, plugin_of
 from .managers import edit_delete
 
 extractor = URLExtract()
@@ -117,19 +118,11 @@ def _format_about(
 
 
 def get_key(val):
-    for key, value in PLG_INFO.items():
-        for cmd in value:
-            if val == cmd:
-                return key
-    return None
+    return plugin_of(val)
 
 
 def getkey(val):
-    for key, value in GRP_INFO.items():
-        for plugin in value:
-            if val == plugin:
-                return key
-    return None
+    return category_of(val)
 
 
 async def cmdinfo(input_str, event, plugin=False):
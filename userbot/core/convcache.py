@@ -0,0 +1,162 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from telethon.errors import FileReferenceExpiredError, FileReferenceInvalidError
+from telethon.utils import get_input_media
+
+from ..Config import Config
+from .logger import logging
+from .pool import run_in_thread
+
+LOGS = logging.getLogger(__name__)
+
+
+class ConversionCache:
+    """
+    Converted media kept on disk, keyed by the telegram id of the source
+    file plus the operation and its parameters. The least recently used
+    outputs are dropped once the folder grows past max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._files: Dict[str, str] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        # output path handed to a caller -> key, and key -> uploaded media
+        self._handed: Dict[str, str] = {}
+        self._uploaded: Dict[str, object] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def key(self, message, operation: str, **params) -> Optional[str]:
+        "None when the source isn't a telegram file, e.g. a generated image"
+        if not self.enabled:
+            return None
+        media = getattr(message, "document", None) or getattr(message, "photo", None)
+        if media is None:
+            return None
+        raw = json.dumps(
+            [type(media).__name__, media.id, operation, params],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        found = []
+        for name in os.listdir(self.path):
+            stat = os.stat(os.path.join(self.path, name))
+            found.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(found):
+            key = os.path.splitext(name)[0]
+            self._entries[key] = size
+            self._files[key] = name
+        self._loaded = True
+
+    @staticmethod
+    def _copy(src: str, dst: str) -> None:
+        # no hardlinks, plugins edit their outputs in place
+        if os.path.lexists(dst):
+            os.remove(dst)
+        shutil.copyfile(src, dst)
+
+    def fetch(self, key: str, dest: str) -> bool:
+        "put the cached output of key at dest, False on a miss"
+        with self._lock:
+            self._load()
+            if key not in self._entries:
+                return False
+            cached = os.path.join(self.path, self._files[key])
+            try:
+                self._copy(cached, dest)
+                os.utime(cached)
+            except OSError as e:
+                LOGS.debug(f"dropping broken conversion cache entry {key}: {e}")
+                self._forget(key)
+                return False
+            self._entries.move_to_end(key)
+            self._handed[os.path.realpath(dest)] = key
+            return True
+
+    def store(self, key: str, output: str) -> None:
+        with self._lock:
+            self._load()
+            name = key + os.path.splitext(output)[1]
+            cached = os.path.join(self.path, name)
+            try:
+                self._copy(output, cached)
+            except OSError as e:
+                return LOGS.debug(f"could not cache conversion {key}: {e}")
+            if key in self._entries and self._files[key] != name:
+                self._forget(key)
+            self._entries[key] = os.path.getsize(cached)
+            self._files[key] = name
+            self._entries.move_to_end(key)
+            self._handed[os.path.realpath(output)] = key
+            while sum(self._entries.values()) > self.max_bytes and self._entries:
+                self._forget(next(iter(self._entries)))
+
+    def _forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._uploaded.pop(key, None)
+        name = self._files.pop(key, None)
+        if name is not None:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+
+    async def get(self, key: Optional[str], dest: str) -> bool:
+        if key is None:
+            return False
+        return await run_in_thread(self.fetch)(key, dest)
+
+    async def put(self, key: Optional[str], output: str) -> None:
+        if key is not None and os.path.exists(output):
+            await run_in_thread(self.store)(key, output)
+
+    async def send_file(self, client, chat, path: str, **kwargs):
+        """
+        Send a converted file. Once an output went up to telegram its
+        document is reused, so repeats don't upload anything.
+        """
+        key = self._handed.pop(os.path.realpath(path), None)
+        document = self._uploaded.get(key)
+        if document is not None:
+            try:
+                return await client.send_file(chat, document, **kwargs)
+            except (FileReferenceExpiredError, FileReferenceInvalidError):
+                self._uploaded.pop(key, None)
+        message = await client.send_file(chat, path, **kwargs)
+        if key in self._entries and getattr(message, "media", None):
+            try:
+                self._uploaded[key] = get_input_media(message.media)
+            except TypeError:
+                pass
+        return message
+
+
+convcache = ConversionCache(
+    os.path.join(Config.TEMP_DIR, "convcache"), Config.CONVERT_CACHE_SIZE << 20
+)
@@ -21,6 +21,8 @@ from telethon.tl.types import (
 from ..Config import Config
 from ..sql_helper.globals import gvarstatus
 from .managers import edit_or_reply
+from .pool import run_in_thread
+from .redact import scanner
 
 
 @events.common.name_inner_event
@@ -99,53 +101,25 @@ class MessageEdited(NewMessage):
         pass
 
 
-async def safe_check_text(msg):  # sourcery no-metrics
-    # sourcery skip: low-code-quality
+async def _load_phone():
+    if scanner.phone is None:
+        from .session import catub
+
+        scanner.set_phone((await catub.get_me()).phone)
+
+
+async def safe_check_text(msg):
     if not msg:
         return False
-    msg = str(msg)
-    from .session import catub
-
-    phone = str((await catub.get_entity(catub.uid)).phone)
-    return bool(
-        (
-            (Config.STRING_SESSION in msg)
-            or (phone[-10:] in msg)
-            or (Config.API_HASH in msg)
-            or (Config.TG_BOT_TOKEN in msg)
-            or (Config.HEROKU_API_KEY and Config.HEROKU_API_KEY in msg)
-            or (Config.OPEN_WEATHER_MAP_APPID and Config.OPEN_WEATHER_MAP_APPID in msg)
-            or (Config.IBM_WATSON_CRED_URL and Config.IBM_WATSON_CRED_URL in msg)
-            or (Config.OCR_SPACE_API_KEY and Config.OCR_SPACE_API_KEY in msg)
-            or (Config.OPENAI_API_KEY and Config.OPENAI_API_KEY in msg)
-            or (Config.GENIUS_API_TOKEN and Config.GENIUS_API_TOKEN in msg)
-            or (Config.REM_BG_API_KEY and Config.REM_BG_API_KEY in msg)
-            or (Config.CURRENCY_API and Config.CURRENCY_API in msg)
-            or (Config.G_DRIVE_CLIENT_ID and Config.G_DRIVE_CLIENT_ID in msg)
-            or (Config.G_DRIVE_CLIENT_SECRET and Config.G_DRIVE_CLIENT_SECRET in msg)
-            or (Config.G_DRIVE_DATA and Config.G_DRIVE_DATA in msg)
-            or (Config.LASTFM_API and Config.LASTFM_API in msg)
-            or (Config.LASTFM_SECRET and Config.LASTFM_SECRET in msg)
-            or (Config.LASTFM_PASSWORD and Config.LASTFM_PASSWORD in msg)
-            or (Config.SPAMWATCH_API and Config.SPAMWATCH_API in msg)
-            or (Config.SPOTIFY_CLIENT_ID and Config.SPOTIFY_CLIENT_ID in msg)
-            or (Config.SPOTIFY_CLIENT_SECRET and Config.SPOTIFY_CLIENT_SECRET in msg)
-            or (Config.GITHUB_ACCESS_TOKEN and Config.GITHUB_ACCESS_TOKEN in msg)
-            or (Config.DEEP_AI and Config.DEEP_AI in msg)
-            or (
-                Config.SCREEN_SHOT_LAYER_ACCESS_KEY
-                and Config.SCREEN_SHOT_LAYER_ACCESS_KEY in msg
-            )
-            or (
-                Config.IBM_WATSON_CRED_PASSWORD
-                and Config.IBM_WATSON_CRED_PASSWORD in msg
-            )
-            or (
-                Config.TG_2STEP_VERIFICATION_CODE
-                and Config.TG_2STEP_VERIFICATION_CODE in msg
-            )
-        )
-    )
+    await _load_phone()
+    return scanner.contains(str(msg))
+
+
+def redact_text(msg):
+    "mask secrets in place when REDACT_SECRETS is set, None if it can't"
+    if Config.REDACT_SECRETS and isinstance(msg, str):
+        return scanner.mask(msg)
+    return None
 
 
 async def send_message(
@@ -207,6 +181,8 @@ async def send_message(
         )
     msg = message
     safecheck = await safe_check_text(msg)
+    if safecheck and (masked := redact_text(msg)) is not None:
+        msg, safecheck = masked, False
     if safecheck:
         if Config.BOTLOG:
             response = await client.sendmessage(
@@ -363,14 +339,12 @@ async def send_file(
 
     msg = caption
     safecheck = await safe_check_text(msg)
-    try:
-        if checker:
-            filemsg = pathlib.Path(checker).read_text()
-        else:
-            filemsg = pathlib.Path(file).read_text()
-    except Exception:
-        filemsg = ""
-    safe_file_check = await safe_check_text(filemsg)
+    if safecheck and (masked := redact_text(msg)) is not None:
+        msg, safecheck = masked, False
+    safe_file_check = False
+    if isinstance(checker or file, (str, pathlib.Path)):
+        await _load_phone()
+        safe_file_check = await run_in_thread(scanner.contains_file)(checker or file)
     if safecheck or safe_file_check:
         if Config.BOTLOG:
             response = await client.sendfile(
@@ -485,6 +459,8 @@ async def edit_message(
 
     main_msg = text
     safecheck = await safe_check_text(main_msg)
+    if safecheck and (masked := redact_text(main_msg)) is not None:
+        main_msg, safecheck = masked, False
     if safecheck:
         if Config.BOTLOG:
             response = await client.sendmessage(
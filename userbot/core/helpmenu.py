@@ -0,0 +1,200 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+
+import math
+from collections import OrderedDict
+
+from telethon import Button
+
+from ..sql_helper.globals import gvarstatus
+from . import GRP_INFO, PLG_INFO
+
+# dB vars that change how the help menu is laid out
+HELP_VARS = ("HELP_EMOJI", "NO_OF_ROWS_IN_HELP", "NO_OF_COLUMNS_IN_HELP")
+MENU_CACHE_SIZE = 512
+
+_MENUS = OrderedDict()
+_COUNTS = {}
+_LAYOUT = None
+
+
+def command_in_category(cname):
+    if cname not in _COUNTS:
+        _COUNTS[cname] = sum(len(PLG_INFO[i]) for i in GRP_INFO[cname])
+    return _COUNTS[cname]
+
+
+def help_layout():
+    "rows, columns and emoji of the help menu, read from the database once"
+    global _LAYOUT
+    if _LAYOUT is None:
+        try:
+            number_of_rows = int(gvarstatus("NO_OF_ROWS_IN_HELP") or 5)
+        except (ValueError, TypeError):
+            number_of_rows = 5
+        try:
+            number_of_cols = int(gvarstatus("NO_OF_COLUMNS_IN_HELP") or 2)
+        except (ValueError, TypeError):
+            number_of_cols = 2
+        _LAYOUT = (number_of_rows, number_of_cols, gvarstatus("HELP_EMOJI") or " ")
+    return _LAYOUT
+
+
+def clear_help_cache():
+    "drop prerendered menus, call when plugins or the help vars change"
+    global _LAYOUT
+    _LAYOUT = None
+    _COUNTS.clear()
+    _MENUS.clear()
+
+
+def warm_help_menus():
+    "prerender every page of every category menu"
+    number_of_rows, number_of_cols, _ = help_layout()
+    for category, plugins in GRP_INFO.items():
+        helpable = [p for p in plugins if not p.startswith("_")]
+        rows = math.ceil(len(helpable) / number_of_cols)
+        for page in range(max(math.ceil(rows / number_of_rows), 1)):
+            paginate_help(page, plugins, category)
+        command_in_category(category)
+
+
+def paginate_help(
+    page_number,
+    loaded_plugins,
+    prefix,
+    plugins=True,
+    category_plugins=None,
+    category_pgno=0,
+):
+    key = (
+        page_number,
+        tuple(loaded_plugins),
+        prefix,
+        plugins,
+        category_plugins,
+        category_pgno,
+    )
+    if key in _MENUS:
+        _MENUS.move_to_end(key)
+        return _MENUS[key]
+    _MENUS[key] = _paginate_help(*key)
+    while len(_MENUS) > MENU_CACHE_SIZE:
+        _MENUS.popitem(last=False)
+    return _MENUS[key]
+
+
+def _paginate_help(
+    page_number,
+    loaded_plugins,
+    prefix,
+    plugins=True,
+    category_plugins=None,
+    category_pgno=0,
+):  # sourcery no-metrics  # sourcery skip: low-code-quality
+    number_of_rows, number_of_cols, HELP_EMOJI = help_layout()
+    helpable_plugins = [p for p in loaded_plugins if not p.startswith("_")]
+    helpable_plugins = sorted(helpable_plugins)
+    if len(HELP_EMOJI) == 2:
+        if plugins:
+            modules = [
+                Button.inline(
+                    f"{HELP_EMOJI[0]} {x} {HELP_EMOJI[1]}",
+                    data=f"{x}_prev(1)_command_{prefix}_{page_number}",
+                )
+                for x in helpable_plugins
+            ]
+        else:
+            modules = [
+                Button.inline(
+                    f"{HELP_EMOJI[0]} {x} {HELP_EMOJI[1]}",
+                    data=f"{x}_cmdhelp_{prefix}_{page_number}_{category_plugins}_{category_pgno}",
+                )
+                for x in helpable_plugins
+            ]
+    elif plugins:
+        modules = [
+            Button.inline(
+                f"{HELP_EMOJI} {x} {HELP_EMOJI}",
+                data=f"{x}_prev(1)_command_{prefix}_{page_number}",
+            )
+            for x in helpable_plugins
+        ]
+    else:
+        modules = [
+            Button.inline(
+                f"{HELP_EMOJI} {x} {HELP_EMOJI}",
+                data=f"{x}_cmdhelp_{prefix}_{page_number}_{category_plugins}_{category_pgno}",
+            )
+            for x in helpable_plugins
+        ]
+    if number_of_cols == 1:
+        pairs = list(zip(modules[::number_of_cols]))
+    elif number_of_cols == 2:
+        pairs = list(zip(modules[::number_of_cols], modules[1::number_of_cols]))
+    else:
+        pairs = list(
+            zip(
+                modules[::number_of_cols],
+                modules[1::number_of_cols],
+                modules[2::number_of_cols],
+            )
+        )
+    if len(modules) % number_of_cols == 1:
+        pairs.append((modules[-1],))
+    elif len(modules) % number_of_cols == 2:
+        pairs.append((modules[-2], modules[-1]))
+    max_num_pages = math.ceil(len(pairs) / number_of_rows)
+    modulo_page = page_number % max_num_pages
+    if plugins:
+        if len(pairs) > number_of_rows:
+            pairs = pairs[
+                modulo_page * number_of_rows : number_of_rows * (modulo_page + 1)
+            ] + [
+                (
+                    Button.inline("⌫", data=f"{prefix}_prev({modulo_page})_plugin"),
+                    Button.inline("⚙️ Main Menu", data="mainmenu"),
+                    Button.inline("⌦", data=f"{prefix}_next({modulo_page})_plugin"),
+                )
+            ]
+        else:
+            pairs = pairs + [(Button.inline("⚙️ Main Menu", data="mainmenu"),)]
+    elif len(pairs) > number_of_rows:
+        if category_pgno < 0:
+            category_pgno = len(pairs) + category_pgno
+        pairs = pairs[
+            modulo_page * number_of_rows : number_of_rows * (modulo_page + 1)
+        ] + [
+            (
+                Button.inline(
+                    "⌫",
+                    data=f"{prefix}_prev({modulo_page})_command_{category_plugins}_{category_pgno}",
+                ),
+                Button.inline(
+                    "⬅️ Back ",
+                    data=f"back_plugin_{category_plugins}_{category_pgno}",
+                ),
+                Button.inline(
+                    "⌦",
+                    data=f"{prefix}_next({modulo_page})_command_{category_plugins}_{category_pgno}",
+                ),
+            )
+        ]
+    else:
+        if category_pgno < 0:
+            category_pgno = len(pairs) + category_pgno
+        pairs = pairs + [
+            (
+                Button.inline(
+                    "⬅️ Back ",
+                    data=f"back_plugin_{category_plugins}_{category_pgno}",
+                ),
+            )
+        ]
+    return pairs
@@ -0,0 +1,212 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+
+import asyncio
+import json
+from typing import Any, Dict, Mapping, Optional, Union
+
+import aiohttp
+from multidict import CIMultiDict
+
+from ..Config import Config
+from .httpcache import response_cache
+from .logger import logging
+
+LOGS = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# methods that are safe to send twice, others only retry when asked to
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+_SESSION: Optional[aiohttp.ClientSession] = None
+_INFLIGHT: Dict[str, asyncio.Task] = {}
+
+
+class HttpStatusError(aiohttp.ClientError):
+    """Raised by HttpResponse.raise_for_status for 4xx and 5xx answers."""
+
+    def __init__(self, status: int, message: str, url: str):
+        super().__init__(status, message, url)
+        self.status = status
+        self.message = message
+        self.url = url
+
+    def __str__(self) -> str:
+        return f"{self.status}, message={self.message!r}, url={self.url!r}"
+
+
+class HttpResponse:
+    """Fully read response, so callers never have to manage the connection."""
+
+    def __init__(
+        self,
+        status: int,
+        content: bytes,
+        headers: Optional[Mapping[str, str]] = None,
+        url: str = "",
+        reason: Optional[str] = None,
+        cookies: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+    ):
+        self.status = self.status_code = status
+        self.content = content
+        self.headers = CIMultiDict(headers or {})
+        self.url = url
+        self.reason = reason
+        self.cookies = cookies or {}
+        self.encoding = encoding
+
+    @classmethod
+    def from_aiohttp(cls, resp: aiohttp.ClientResponse, content: bytes):
+        return cls(
+            resp.status,
+            content,
+            headers=resp.headers,
+            url=str(resp.url),
+            reason=resp.reason,
+            cookies={key: morsel.value for key, morsel in resp.cookies.items()},
+            encoding=resp.get_encoding() if content else "utf-8",
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, "replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise HttpStatusError(self.status, self.reason or "", self.url)
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the process wide session, creating it on first use"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        connector = aiohttp.TCPConnector(
+            limit=Config.HTTP_POOL_SIZE,
+            limit_per_host=Config.HTTP_PER_HOST_LIMIT,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            enable_cleanup_closed=True,
+        )
+        _SESSION = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=Config.HTTP_TIMEOUT),
+            # shared by every plugin, so cookies must be passed explicitly
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+    return _SESSION
+
+
+async def request(
+    method: str,
+    url: str,
+    retries: Optional[int] = None,
+    backoff: float = 0.5,
+    timeout: Optional[float] = None,
+    cache: Union[bool, float, None] = None,
+    **kwargs: Any,
+) -> HttpResponse:
+    """
+    Send a request through the shared connection pool.
+
+    Connection errors, timeouts and 429/5xx answers are retried with
+    exponential backoff, honouring Retry-After when the server sends it.
+    Only idempotent methods are retried by default, a POST is retried only
+    when the caller passes retries explicitly. Pass cache=True to use the
+    endpoint ttl from httpcache, or a number of seconds to override it.
+    """
+    if retries is None:
+        retries = Config.HTTP_RETRIES if method.upper() in IDEMPOTENT_METHODS else 0
+    if timeout is not None:
+        kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+    if not cache:
+        return await _send(method, url, retries, backoff, **kwargs)
+    ttl = response_cache.ttl_for(url) if cache is True else cache
+    key = response_cache.make_key(method, url, kwargs)
+    entry = await response_cache.lookup(key)
+    if entry is not None and entry.fresh:
+        return entry.value
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = _INFLIGHT[key] = asyncio.create_task(
+            _refresh(key, ttl, method, url, retries, backoff, **kwargs)
+        )
+        task.add_done_callback(_refresh_done)
+    if entry is not None and entry.usable:
+        # stale while revalidate, the refresh above updates it in background
+        return entry.value
+    return await asyncio.shield(task)
+
+
+async def _refresh(key, ttl, method, url, retries, backoff, **kwargs):
+    try:
+        response = await _send(method, url, retries, backoff, **kwargs)
+        if response.ok:
+            await response_cache.store(key, response, ttl, Config.HTTP_CACHE_STALE)
+        return response
+    finally:
+        _INFLIGHT.pop(key, None)
+
+
+def _refresh_done(task: asyncio.Task) -> None:
+    # a stale hit returns before the refresh finishes, so nobody else may
+    # ever retrieve its exception
+    if task.cancelled():
+        return
+    if error := task.exception():
+        LOGS.warning(f"Background refresh failed: {error!r}")
+
+
+async def _send(method, url, retries, backoff, **kwargs) -> HttpResponse:
+    attempt = 0
+    while True:
+        delay = backoff * (2**attempt)
+        try:
+            async with get_session().request(method, url, **kwargs) as resp:
+                content = await resp.read()
+                response = HttpResponse.from_aiohttp(resp, content)
+            if response.status not in RETRY_STATUSES or attempt >= retries:
+                return response
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt >= retries:
+                raise
+            LOGS.debug(f"{method} {url} failed ({e!r}), retrying in {delay}s")
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+async def get(url: str, **kwargs: Any) -> HttpResponse:
+    return await request("GET", url, **kwargs)
+
+
+async def post(url: str, **kwargs: Any) -> HttpResponse:
+    return await request("POST", url, **kwargs)
+
+
+async def head(url: str, **kwargs: Any) -> HttpResponse:
+    return await request("HEAD", url, **kwargs)
+
+
+async def close() -> None:
+    """Close the shared session and its pooled connections"""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
@@ -0,0 +1,171 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from ..Config import Config
+from .logger import logging
+from .pool import run_in_thread
+
+LOGS = logging.getLogger(__name__)
+
+# seconds a response stays fresh, looked up by host when a caller passes cache=True
+ENDPOINT_TTLS: Dict[str, int] = {
+    "api.dictionaryapi.dev": 86400,
+    "api.urbandictionary.com": 3600,
+    "graphql.anilist.co": 3600,
+    "api.jikan.moe": 3600,
+    "kitsu.io": 86400,
+    "api.openweathermap.org": 600,
+    "wttr.in": 900,
+    "api.spotify.com": 300,
+    "api.github.com": 600,
+    "raw.githubusercontent.com": 3600,
+    "dl.twrp.me": 3600,
+    "api.genius.com": 86400,
+}
+
+# request headers that change what the server answers, so they are part of the key
+KEY_HEADERS = ("accept", "accept-language", "authorization", "cookie")
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    expires: float
+    stale_until: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires
+
+    @property
+    def usable(self) -> bool:
+        return time.time() < self.stale_until
+
+
+class ResponseCache:
+    """
+    Two tier cache: a bounded in-memory LRU in front of an optional
+    sqlite file that survives restarts.
+    """
+
+    def __init__(self, maxsize: int = 512, db_path: Optional[str] = None):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY,"
+                    " value BLOB, expires REAL, stale_until REAL)"
+                )
+                self._db.execute(
+                    "DELETE FROM responses WHERE stale_until < ?", (time.time(),)
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                LOGS.error(f"Persistent http cache disabled: {e}")
+                self._db = None
+
+    @staticmethod
+    def make_key(method: str, url: str, kwargs: Dict[str, Any]) -> str:
+        parts = [method.upper(), url] + [
+            kwargs.get(name) for name in ("params", "data", "json", "auth")
+        ]
+        headers = kwargs.get("headers") or {}
+        parts.append(
+            {
+                name.lower(): value
+                for name, value in headers.items()
+                if name.lower() in KEY_HEADERS or name.lower().startswith("x-")
+            }
+        )
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    @staticmethod
+    def ttl_for(url: str) -> int:
+        host = urlparse(url).hostname or ""
+        for endpoint, ttl in ENDPOINT_TTLS.items():
+            if host == endpoint or host.endswith(f".{endpoint}"):
+                return ttl
+        return Config.HTTP_CACHE_TTL
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value, expires, stale_until FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(pickle.loads(row[0]), row[1], row[2])
+        self._remember(key, entry)
+        return entry
+
+    def set(self, key: str, value: Any, ttl: float, stale: float = 0) -> None:
+        now = time.time()
+        entry = CacheEntry(value, now + ttl, now + ttl + stale)
+        self._remember(key, entry)
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute(
+                "REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, pickle.dumps(value), entry.expires, entry.stale_until),
+            )
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def lookup(self, key: str) -> Optional[CacheEntry]:
+        # memory hits never leave the loop, only the disk tier needs a thread
+        if key in self._entries or self._db is None:
+            return self.get(key)
+        return await run_in_thread(self.get)(key)
+
+    async def store(self, key: str, value: Any, ttl: float, stale: float = 0):
+        if self._db is None:
+            return self.set(key, value, ttl, stale)
+        return await run_in_thread(self.set)(key, value, ttl, stale)
+
+
+response_cache = ResponseCache(
+    maxsize=Config.HTTP_CACHE_SIZE, db_path=Config.HTTP_CACHE_DB
+)
@@ -8,7 +8,6 @@
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
 import json
-import math
 import os
 import random
 import re
@@ -34,7 +33,9 @@ from ..helpers.functions.utube import (
 from ..plugins import mention
 from ..sql_helper.globals import gvarstatus
 from . import CMD_INFO, GRP_INFO, PLG_INFO, check_owner
+from .cmdindex import MAX_RESULTS, search_commands, search_plugins
 from .cmdinfo import cmdinfo, get_key, getkey, plugininfo
+from .helpmenu import command_in_category, paginate_help
 from .logger import logging
 
 LOGS = logging.getLogger(__name__)
@@ -298,132 +299,6 @@ async def article_builder(event, method):
     )
 
 
-def command_in_category(cname):
-    cmds = 0
-    for i in GRP_INFO[cname]:
-        for _ in PLG_INFO[i]:
-            cmds += 1
-    return cmds
-
-
-def paginate_help(
-    page_number,
-    loaded_plugins,
-    prefix,
-    plugins=True,
-    category_plugins=None,
-    category_pgno=0,
-):  # sourcery no-metrics  # sourcery skip: low-code-quality
-    try:
-        number_of_rows = int(gvarstatus("NO_OF_ROWS_IN_HELP") or 5)
-    except (ValueError, TypeError):
-        number_of_rows = 5
-    try:
-        number_of_cols = int(gvarstatus("NO_OF_COLUMNS_IN_HELP") or 2)
-    except (ValueError, TypeError):
-        number_of_cols = 2
-    HELP_EMOJI = gvarstatus("HELP_EMOJI") or " "
-    helpable_plugins = [p for p in loaded_plugins if not p.startswith("_")]
-    helpable_plugins = sorted(helpable_plugins)
-    if len(HELP_EMOJI) == 2:
-        if plugins:
-            modules = [
-                Button.inline(
-                    f"{HELP_EMOJI[0]} {x} {HELP_EMOJI[1]}",
-                    data=f"{x}_prev(1)_command_{prefix}_{page_number}",
-                )
-                for x in helpable_plugins
-            ]
-        else:
-            modules = [
-                Button.inline(
-                    f"{HELP_EMOJI[0]} {x} {HELP_EMOJI[1]}",
-                    data=f"{x}_cmdhelp_{prefix}_{page_number}_{category_plugins}_{category_pgno}",
-                )
-                for x in helpable_plugins
-            ]
-    elif plugins:
-        modules = [
-            Button.inline(
-                f"{HELP_EMOJI} {x} {HELP_EMOJI}",
-                data=f"{x}_prev(1)_command_{prefix}_{page_number}",
-            )
-            for x in helpable_plugins
-        ]
-    else:
-        modules = [
-            Button.inline(
-                f"{HELP_EMOJI} {x} {HELP_EMOJI}",
-                data=f"{x}_cmdhelp_{prefix}_{page_number}_{category_plugins}_{category_pgno}",
-            )
-            for x in helpable_plugins
-        ]
-    if number_of_cols == 1:
-        pairs = list(zip(modules[::number_of_cols]))
-    elif number_of_cols == 2:
-        pairs = list(zip(modules[::number_of_cols], modules[1::number_of_cols]))
-    else:
-        pairs = list(
-            zip(
-                modules[::number_of_cols],
-                modules[1::number_of_cols],
-                modules[2::number_of_cols],
-            )
-        )
-    if len(modules) % number_of_cols == 1:
-        pairs.append((modules[-1],))
-    elif len(modules) % number_of_cols == 2:
-        pairs.append((modules[-2], modules[-1]))
-    max_num_pages = math.ceil(len(pairs) / number_of_rows)
-    modulo_page = page_number % max_num_pages
-    if plugins:
-        if len(pairs) > number_of_rows:
-            pairs = pairs[
-                modulo_page * number_of_rows : number_of_rows * (modulo_page + 1)
-            ] + [
-                (
-                    Button.inline("⌫", data=f"{prefix}_prev({modulo_page})_plugin"),
-                    Button.inline("⚙️ Main Menu", data="mainmenu"),
-                    Button.inline("⌦", data=f"{prefix}_next({modulo_page})_plugin"),
-                )
-            ]
-        else:
-            pairs = pairs + [(Button.inline("⚙️ Main Menu", data="mainmenu"),)]
-    elif len(pairs) > number_of_rows:
-        if category_pgno < 0:
-            category_pgno = len(pairs) + category_pgno
-        pairs = pairs[
-            modulo_page * number_of_rows : number_of_rows * (modulo_page + 1)
-        ] + [
-            (
-                Button.inline(
-                    "⌫",
-                    data=f"{prefix}_prev({modulo_page})_command_{category_plugins}_{category_pgno}",
-                ),
-                Button.inline(
-                    "⬅️ Back ",
-                    data=f"back_plugin_{category_plugins}_{category_pgno}",
-                ),
-                Button.inline(
-                    "⌦",
-                    data=f"{prefix}_next({modulo_page})_command_{category_plugins}_{category_pgno}",
-                ),
-            )
-        ]
-    else:
-        if category_pgno < 0:
-            category_pgno = len(pairs) + category_pgno
-        pairs = pairs + [
-            (
-                Button.inline(
-                    "⬅️ Back ",
-                    data=f"back_plugin_{category_plugins}_{category_pgno}",
-                ),
-            )
-        ]
-    return pairs
-
-
 @catub.tgbot.on(InlineQuery)
 async def inline_handler(event):
     builder = event.builder
@@ -861,8 +736,8 @@ async def on_plug_in_callback_query_handler(event):
 async def inline_search(event, query):
     answers = []
     builder = event.builder
-    if found := [i for i in sorted(list(CMD_INFO)) if query in i]:
-        for cmd in found:
+    if found := search_commands(query):
+        for cmd in found[:MAX_RESULTS]:
             title = f"Command:  {cmd}"
             plugin = get_key(cmd)
             try:
@@ -879,8 +754,10 @@ async def inline_search(event, query):
             )
             answers.append(result)
 
-    if found := [i for i in sorted(list(PLG_INFO.keys())) if query in i]:
+    if found := search_plugins(query):
         for plugin in found:
+            if len(answers) >= MAX_RESULTS:
+                break
             count = len(PLG_INFO[plugin])
             if count > 1:
                 title = f"Plugin:  {plugin}"
@@ -0,0 +1,157 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from .logger import logging
+from .pool import run_in_thread
+
+LOGS = logging.getLogger(__name__)
+
+# how many jobs of a category may run at once, the rest wait in a priority queue
+JOB_LIMITS: Dict[str, int] = {
+    "ffmpeg": 2,
+    "transfer": 4,
+    "scan": 2,
+    "admin": 2,
+    "broadcast": 1,
+    "archive": 2,
+}
+DEFAULT_LIMIT = 4
+
+
+class JobCancelled(Exception):
+    """
+    Raised inside a job when it is cancelled with .cancel
+    """
+
+
+class Job:
+    def __init__(self, jid, name, category, priority, chat_id, task):
+        self.id = jid
+        self.name = name
+        self.category = category
+        self.priority = priority
+        self.chat_id = chat_id
+        self.task = task
+        self.state = "queued"
+        self.created = time.time()
+        self.started = None
+        self._waiter = asyncio.get_running_loop().create_future()
+
+    @property
+    def runtime(self) -> float:
+        return time.time() - (self.started or self.created)
+
+
+class JobManager:
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = limits
+        self.jobs: Dict[int, Job] = {}
+        self._running = defaultdict(int)
+        self._queues = defaultdict(list)
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+
+    def limit(self, category: str) -> int:
+        return self.limits.get(category, DEFAULT_LIMIT)
+
+    def _start(self, job: Job) -> None:
+        self._running[job.category] += 1
+        job.state = "running"
+        job.started = time.time()
+
+    async def _acquire(self, job: Job) -> None:
+        category = job.category
+        if not self._queues[category] and self._running[category] < self.limit(
+            category
+        ):
+            return self._start(job)
+        heapq.heappush(self._queues[category], (job.priority, next(self._seq), job))
+        await job._waiter
+
+    def _release(self, job: Job) -> None:
+        category = job.category
+        self._running[category] -= 1
+        queue = self._queues[category]
+        while queue and self._running[category] < self.limit(category):
+            _, _, waiting = heapq.heappop(queue)
+            if waiting.state != "queued":
+                continue
+            self._start(waiting)
+            waiting._waiter.set_result(None)
+
+    @asynccontextmanager
+    async def track(
+        self,
+        name: str,
+        category: str = "default",
+        priority: int = 0,
+        chat_id: Optional[int] = None,
+    ):
+        """
+        Registers the current task as a job and holds it until a slot of its
+        category is free. Lower priority values are started first.
+        """
+        task = asyncio.current_task()
+        job = Job(next(self._ids), name, category, priority, chat_id, task)
+        self.jobs[job.id] = job
+        try:
+            try:
+                await self._acquire(job)
+            except asyncio.CancelledError:
+                # a slot may have been handed over right before the cancel landed
+                if job.started is not None:
+                    self._release(job)
+                if job.state != "cancelled":
+                    job.state = "cancelled"
+                    raise
+                if job.started is not None and hasattr(task, "uncancel"):
+                    task.uncancel()
+                raise JobCancelled from None
+            try:
+                yield job
+            except asyncio.CancelledError:
+                if job.state != "cancelled":
+                    raise
+                if hasattr(task, "uncancel"):
+                    task.uncancel()
+                raise JobCancelled from None
+            finally:
+                self._release(job)
+        finally:
+            del self.jobs[job.id]
+
+    def cancel(self, job_id: int) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job.state == "cancelled":
+            return False
+        previous, job.state = job.state, "cancelled"
+        if previous == "queued":
+            job._waiter.cancel()
+        else:
+            job.task.cancel()
+        return True
+
+    def list(self) -> List[Job]:
+        return sorted(self.jobs.values(), key=lambda job: job.id)
+
+    @staticmethod
+    async def offload(func, *args, **kwargs):
+        "run blocking parts of a job on the shared thread pool"
+        return await run_in_thread(func)(*args, **kwargs)
+
+
+catjobs = JobManager(JOB_LIMITS)
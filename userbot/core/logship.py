@@ -0,0 +1,179 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+import asyncio
+from collections import defaultdict, deque
+from typing import Dict, NamedTuple, Optional
+
+from telethon.errors import FloodWaitError
+
+from ..Config import Config
+from .logger import logging
+
+LOGS = logging.getLogger(__name__)
+
+# telegram limits for one forward_messages call and one message
+FORWARD_BATCH = 100
+MESSAGE_LIMIT = 4096
+# entries kept per destination, the oldest are dropped past this
+MAX_PENDING = 2000
+
+
+class LogEntry(NamedTuple):
+    # forwards carry their chat, message id and header, notices only text
+    peer: Optional[int]
+    msg_id: Optional[int]
+    text: Optional[str]
+
+
+class LogShipper:
+    """
+    Buffers log events per destination chat and sends them every
+    LOG_BATCH_INTERVAL seconds. Forwards from one chat go out in
+    forward_messages calls of up to 100 ids, and notices are joined
+    into digest messages.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING):
+        self.max_pending = max_pending
+        self._queues: Dict[int, deque] = defaultdict(deque)
+        self._dropped: Dict[int, int] = defaultdict(int)
+        self._last_peer: Dict[int, int] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def _put(self, client, dest: int, entry: LogEntry) -> None:
+        queue = self._queues[dest]
+        if len(queue) >= self.max_pending:
+            # shed the oldest entries rather than stall the event handlers
+            queue.popleft()
+            self._dropped[dest] += 1
+        queue.append(entry)
+        if dest not in self._tasks:
+            self._tasks[dest] = asyncio.create_task(self._ship(client, dest))
+
+    def forward(self, client, dest: int, message, header: Optional[str] = None):
+        """
+        Queue a message to be forwarded to dest. The header is sent before
+        each run of messages from one chat, with "a new message" replaced by
+        the number of messages that follow it ("N more" when the run carries
+        on from the previous flush).
+        """
+        self._put(client, dest, LogEntry(message.chat_id, message.id, header))
+
+    def notice(self, client, dest: int, text: str) -> None:
+        "Queue an html notice, notices are sent joined into digests"
+        self._put(client, dest, LogEntry(None, None, text))
+
+    async def _ship(self, client, dest: int) -> None:
+        try:
+            while self._queues[dest] or self._dropped.get(dest):
+                await asyncio.sleep(Config.LOG_BATCH_INTERVAL)
+                await self.flush(client, dest)
+        finally:
+            self._tasks.pop(dest, None)
+
+    async def flush(self, client, dest: int) -> None:
+        queue = self._queues[dest]
+        batch = list(queue)
+        queue.clear()
+        if dropped := self._dropped.pop(dest, 0):
+            # a report that fails is carried into the next flush
+            await self._send(
+                dest,
+                dropped,
+                client.send_message,
+                dest,
+                f"#LOGS\n`{dropped}` log entries dropped",
+            )
+        i = 0
+        while i < len(batch):
+            entry = batch[i]
+            j = i + 1
+            if entry.peer is None:
+                while j < len(batch) and batch[j].peer is None:
+                    j += 1
+                self._last_peer.pop(dest, None)
+                for text, count in _digests([item.text for item in batch[i:j]]):
+                    await self._send(
+                        dest,
+                        count,
+                        client.send_message,
+                        dest,
+                        text,
+                        parse_mode="html",
+                        link_preview=False,
+                    )
+            else:
+                while j < len(batch) and batch[j].peer == entry.peer:
+                    j += 1
+                await self._forward_run(client, dest, batch[i:j])
+            i = j
+
+    async def _forward_run(self, client, dest, run) -> None:
+        peer = run[0].peer
+        if run[0].text:
+            # a run only continues the previous one across a flush, its
+            # header then counts the messages added since the last header
+            more = " more" if self._last_peer.get(dest) == peer else ""
+            header = run[0].text
+            if len(run) > 1 or more:
+                plural = "s" if len(run) > 1 else ""
+                header = header.replace(
+                    "a new message", f"{len(run)}{more} message{plural}"
+                )
+            await self._send(dest, 0, client.send_message, dest, header)
+        self._last_peer[dest] = peer
+        ids = [item.msg_id for item in run]
+        for start in range(0, len(ids), FORWARD_BATCH):
+            chunk = ids[start : start + FORWARD_BATCH]
+            await self._send(
+                dest,
+                len(chunk),
+                client.forward_messages,
+                dest,
+                chunk,
+                peer,
+                silent=True,
+            )
+
+    async def _send(self, dest: int, count: int, request, *args, **kwargs):
+        """
+        call a telegram request, waiting out flood waits instead of failing.
+        If it still fails its count entries are reported as dropped.
+        """
+        for _ in range(3):
+            try:
+                return await request(*args, **kwargs)
+            except FloodWaitError as e:
+                LOGS.info(f"log shipping paused for {e.seconds}s by a flood wait")
+                await asyncio.sleep(e.seconds + 1)
+            except Exception as e:
+                LOGS.warning(f"log shipping failed: {e}")
+                break
+        else:
+            LOGS.warning("log shipping gave up after repeated flood waits")
+        self._dropped[dest] += count
+        return None
+
+
+def _digests(texts):
+    "join notices into as few messages as fit telegram's length limit, with counts"
+    digest = ""
+    count = 0
+    for text in texts:
+        if digest and len(digest) + len(text) + 2 > MESSAGE_LIMIT:
+            yield digest, count
+            digest = ""
+            count = 0
+        digest = f"{digest}\n\n{text}" if digest else text
+        count += 1
+    if digest:
+        yield digest, count
+
+
+logshipper = LogShipper()
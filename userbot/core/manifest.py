@@ -0,0 +1,239 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+
+import ast
+import contextlib
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from ..Config import Config
+from .logger import logging
+
+LOGS = logging.getLogger(__name__)
+
+# plugin name -> {"hash": sha1 of the source, "lazy": bool, "commands": [...]}
+MANIFEST: Dict[str, Dict[str, Any]] = {}
+# bumped when the indexing rules change, older entries are indexed again
+MANIFEST_VERSION = 2
+
+
+def file_hash(path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def load_manifest() -> None:
+    if not os.path.exists(Config.PLUGIN_MANIFEST):
+        return
+    try:
+        with open(Config.PLUGIN_MANIFEST) as f:
+            MANIFEST.update(json.load(f))
+    except (OSError, ValueError) as e:
+        LOGS.warning(f"Ignoring broken plugin manifest: {e}")
+
+
+def save_manifest() -> None:
+    try:
+        os.makedirs(os.path.dirname(Config.PLUGIN_MANIFEST) or ".", exist_ok=True)
+        with open(f"{Config.PLUGIN_MANIFEST}.part", "w") as f:
+            json.dump(MANIFEST, f, indent=1, sort_keys=True)
+        os.replace(f"{Config.PLUGIN_MANIFEST}.part", Config.PLUGIN_MANIFEST)
+    except OSError as e:
+        LOGS.warning(f"Couldn't write plugin manifest: {e}")
+
+
+def refresh_manifest(files) -> None:
+    "statically index plugin files that are new or changed since the manifest"
+    for path in files:
+        plugin = os.path.splitext(os.path.basename(path))[0]
+        try:
+            digest = file_hash(path)
+            entry = MANIFEST.get(plugin, {})
+            if (
+                entry.get("hash") != digest
+                or entry.get("version") != MANIFEST_VERSION
+            ):
+                MANIFEST[plugin] = extract_plugin(path, digest)
+        except (OSError, SyntaxError, ValueError) as e:
+            LOGS.debug(f"Couldn't index {path}: {e}")
+            MANIFEST.pop(plugin, None)
+
+
+def lazy_entry(plugin: str, path) -> Optional[Dict[str, Any]]:
+    "manifest entry if the plugin can be registered without importing it"
+    entry = MANIFEST.get(plugin)
+    if not entry or not entry["lazy"]:
+        return None
+    try:
+        return entry if entry["hash"] == file_hash(path) else None
+    except OSError:
+        return None
+
+
+# decorators that only wrap a function, so running them later is harmless
+SAFE_DECORATORS = {"run_in_process", "run_in_thread"}
+
+
+def _is_cat_cmd(decorator) -> bool:
+    return (
+        isinstance(decorator, ast.Call)
+        and isinstance(decorator.func, ast.Attribute)
+        and decorator.func.attr == "cat_cmd"
+    )
+
+
+def _is_safe_decorator(decorator) -> bool:
+    if isinstance(decorator, ast.Name):
+        return decorator.id in SAFE_DECORATORS
+    return _is_cat_cmd(decorator)
+
+
+def _evaluate(node, names: Dict[str, Any]) -> Any:
+    if isinstance(node, ast.Name):
+        if node.id not in names:
+            raise ValueError(f"{node.id} is not a module constant")
+        return names[node.id]
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return [_evaluate(item, names) for item in node.elts]
+    if isinstance(node, ast.Dict):
+        return {
+            _evaluate(key, names): _evaluate(value, names)
+            for key, value in zip(node.keys, node.values)
+        }
+    return ast.literal_eval(node)
+
+
+def _command_spec(decorator, func, names: Dict[str, Any]) -> Dict[str, Any]:
+    spec = {
+        "pattern": None,
+        "command": None,
+        "info": None,
+        "allow_sudo": True,
+        "edited": True,
+        "forword": False,
+        "public": False,
+        "custom_func": False,
+        "kwargs": {},
+        "doc": ast.get_docstring(func, clean=False),
+    }
+    if decorator.args:
+        spec["pattern"] = _evaluate(decorator.args[0], names)
+    for keyword in decorator.keywords:
+        if keyword.arg == "func":
+            spec["custom_func"] = True
+        elif keyword.arg in spec:
+            spec[keyword.arg] = _evaluate(keyword.value, names)
+        elif keyword.arg in ("groups_only", "private_only", "disable_errors", "job"):
+            continue
+        else:
+            spec["kwargs"][keyword.arg] = _evaluate(keyword.value, names)
+    return spec
+
+
+def extract_plugin(path, digest: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read the cat_cmd arguments of a plugin from its source without importing
+    it. A plugin whose arguments aren't plain literals is kept, but not lazy.
+    """
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    names = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            with contextlib.suppress(ValueError):
+                if isinstance(target, ast.Name):
+                    names[target.id] = ast.literal_eval(node.value)
+    commands = []
+    lazy = _lazy_safe(tree)
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        # decorators apply bottom up
+        for decorator in reversed(node.decorator_list):
+            if not _is_cat_cmd(decorator):
+                continue
+            try:
+                spec = _command_spec(decorator, node, names)
+            except (ValueError, TypeError, SyntaxError):
+                lazy = False
+                continue
+            if spec["pattern"] is None or spec["command"] is None:
+                lazy = False
+            lazy = lazy and not spec["custom_func"]
+            commands.append(spec)
+    return {
+        "hash": digest or file_hash(path),
+        "version": MANIFEST_VERSION,
+        "lazy": bool(commands) and lazy,
+        "commands": commands,
+    }
+
+
+def lazy_safe(source: str) -> bool:
+    """
+    A plugin can be loaded lazily when importing it has no side effects
+    besides its cat_cmd handlers, no loops started or other handlers added.
+    """
+    return _lazy_safe(ast.parse(source))
+
+
+# calls that only read state, so a module constant built from them is safe
+PURE_CALLS = {"gvarstatus", "getLogger"}
+
+
+def _pure_value(node) -> bool:
+    "a literal, name, attribute or gvarstatus read, anything else may hold state"
+    if node is None or isinstance(node, (ast.Constant, ast.Name)):
+        return True
+    if isinstance(node, ast.Attribute):
+        return _pure_value(node.value)
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return all(_pure_value(item) for item in node.elts)
+    if isinstance(node, ast.Dict):
+        return all(map(_pure_value, node.keys + node.values))
+    if isinstance(node, ast.JoinedStr):
+        return all(_pure_value(value) for value in node.values)
+    if isinstance(node, ast.FormattedValue):
+        return _pure_value(node.value)
+    if isinstance(node, ast.BinOp):
+        return _pure_value(node.left) and _pure_value(node.right)
+    if isinstance(node, ast.UnaryOp):
+        return _pure_value(node.operand)
+    if isinstance(node, ast.BoolOp):
+        return all(_pure_value(value) for value in node.values)
+    if isinstance(node, ast.Subscript):
+        return _pure_value(node.value) and _pure_value(node.slice)
+    if isinstance(node, ast.Call):
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+        return (
+            name in PURE_CALLS
+            and all(_pure_value(arg) for arg in node.args)
+            and all(_pure_value(keyword.value) for keyword in node.keywords)
+        )
+    return False
+
+
+def _lazy_safe(tree) -> bool:
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            continue
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and _pure_value(node.value):
+            continue
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+            continue
+        if isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        ) and all(_is_safe_decorator(decorator) for decorator in node.decorator_list):
+            continue
+        return False
+    return True
@@ -0,0 +1,69 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+import asyncio
+from collections import OrderedDict
+
+from telethon.errors import FileReferenceExpiredError, FileReferenceInvalidError
+
+from .logger import logging
+
+LOGS = logging.getLogger(__name__)
+
+# saved logger group messages (snips, filters, welcomes) kept in memory
+MEDIA_CACHE_SIZE = 256
+
+_MESSAGES = OrderedDict()
+_FETCHING = {}
+
+
+async def stored_message(client, chat, msg_id, refresh=False):
+    """
+    Message saved in the logger group, fetched once and then served from
+    memory. Its media keeps the file reference, so sending it again costs
+    a single request.
+    """
+    key = (chat, int(msg_id))
+    if not refresh and key in _MESSAGES:
+        _MESSAGES.move_to_end(key)
+        return _MESSAGES[key]
+    # a note fired a few times at once only needs one fetch
+    task = _FETCHING.get(key)
+    if task is None:
+        task = _FETCHING[key] = asyncio.create_task(
+            client.get_messages(entity=chat, ids=key[1])
+        )
+    try:
+        message = await asyncio.shield(task)
+    finally:
+        _FETCHING.pop(key, None)
+    if message is None:
+        _MESSAGES.pop(key, None)
+        return None
+    _MESSAGES[key] = message
+    _MESSAGES.move_to_end(key)
+    while len(_MESSAGES) > MEDIA_CACHE_SIZE:
+        _MESSAGES.popitem(last=False)
+    return message
+
+
+async def send_stored(client, chat, msg_id, send):
+    """
+    Call send with the stored message. When telegram says its file
+    reference went stale the message is fetched again and sent once more.
+    """
+    message = await stored_message(client, chat, msg_id)
+    if message is None:
+        return None
+    try:
+        return await send(message)
+    except (FileReferenceExpiredError, FileReferenceInvalidError):
+        LOGS.debug(f"file reference of {msg_id} expired, refreshing it")
+        message = await stored_message(client, chat, msg_id, refresh=True)
+        return None if message is None else await send(message)
+
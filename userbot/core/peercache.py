@@ -0,0 +1,89 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+import asyncio
+
+from telethon.sessions import SQLiteSession
+
+from .logger import logging
+from .pool import run_in_thread
+
+LOGS = logging.getLogger(__name__)
+
+# seconds between saving newly seen peers to the database
+SAVE_INTERVAL = 600
+
+_SAVED = set()
+_WARMER = None
+
+
+def _entity_rows(client):
+    # (id, access_hash, username, phone, name) rows kept by telethon's
+    # memory session, a string session never writes them anywhere
+    if isinstance(client.session, SQLiteSession):
+        return None
+    return getattr(client.session, "_entities", None)
+
+
+def restore_peers(client):
+    "feed peers saved by earlier runs back into a string session"
+    entities = _entity_rows(client)
+    if entities is None:
+        return 0
+    from ..sql_helper.peer_cache_sql import get_peers
+
+    try:
+        rows = get_peers()
+    except Exception as e:
+        LOGS.error(f"unable to restore the peer cache: {e}")
+        return 0
+    entities.update(rows)
+    _SAVED.update(rows)
+    return len(rows)
+
+
+async def save_peers(client):
+    "store access hashes and names of peers seen since the last save"
+    entities = _entity_rows(client)
+    if entities is None:
+        return 0
+    from ..sql_helper.peer_cache_sql import save_peers as _save
+
+    rows = set(entities) - _SAVED
+    if not rows:
+        return 0
+    try:
+        await run_in_thread(_save)(rows)
+    except Exception as e:
+        LOGS.error(f"unable to save the peer cache: {e}")
+        return 0
+    _SAVED.update(rows)
+    return len(rows)
+
+
+async def warm_peers(client):
+    """
+    Resolve every dialog once so their peers are known without a request,
+    then keep saving newly seen peers in the background.
+    """
+    try:
+        async for _ in client.iter_dialogs():
+            pass
+    except Exception as e:
+        LOGS.error(f"unable to warm the peer cache: {e}")
+    while True:
+        if count := await save_peers(client):
+            LOGS.debug(f"saved {count} peers to the peer cache")
+        await asyncio.sleep(SAVE_INTERVAL)
+
+
+def start_peer_cache(client):
+    "warm and keep saving the peer cache in the background"
+    global _WARMER
+    if _WARMER is None or _WARMER.done():
+        _WARMER = asyncio.get_event_loop().create_task(warm_peers(client))
@@ -84,6 +84,8 @@ async def restart_script(client: TelegramClient, sandy):
         add_to_collectionlist("restart_update", [sandy.chat_id, sandy.id])
     except Exception as e:
         LOGS.error(e)
+    # exec keeps children alive, don't leave orphaned ffmpeg/cwebp behind
+    client._kill_running_processes()
     executable = sys.executable.replace(" ", "\\ ")
     args = [executable, "-m", "userbot"]
     os.execle(executable, *args, os.environ)
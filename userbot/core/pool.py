@@ -8,12 +8,16 @@
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
 import asyncio
-from concurrent.futures import Future, ThreadPoolExecutor
-from functools import partial, wraps
-from typing import Any, Callable
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial, wraps
+from typing import Any, Callable, Dict, Optional
 
 from motor.frameworks.asyncio import _EXECUTOR
 
+from ..Config import Config
 from .logger import logging
 
 _LOG = logging.getLogger(__name__)
@@ -36,6 +40,102 @@ def run_in_thread(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
     return wrapper
 
 
+# fonts every render worker loads once when it starts
+FONT_PRELOAD = [
+    ("./temp/Roboto-Medium.ttf", 41),
+    ("./temp/Roboto-Regular.ttf", 33),
+    ("./temp/ArialUnicodeMS.ttf", 41),
+    ("./temp/Quivira.otf", 41),
+    ("userbot/helpers/styles/impact.ttf", 60),
+    ("userbot/helpers/styles/ProductSans-Light.ttf", 60),
+]
+
+_PROCESS_FUNCS: Dict[str, Callable] = {}
+_PROCESS_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_PROCESS_KEYS = frozenset()
+_PROCESS_SLOTS: Optional[asyncio.Semaphore] = None
+_PROCESS_WORKERS = Config.PROCESS_POOL_WORKERS or os.cpu_count() or 1
+
+
+@lru_cache(maxsize=64)
+def load_font(path: str, size: int, encoding: str = ""):
+    """truetype font cached per process, so workers parse each font only once"""
+    from PIL import ImageFont
+
+    return ImageFont.truetype(path, size, encoding=encoding)
+
+
+def _warm_worker() -> None:
+    for path, size in FONT_PRELOAD:
+        if os.path.exists(path):
+            load_font(path, size)
+
+
+def _call_registered(key: str, args: tuple, kwargs: dict) -> Any:
+    return _PROCESS_FUNCS[key](*args, **kwargs)
+
+
+def _get_process_pool() -> Optional[ProcessPoolExecutor]:
+    global _PROCESS_EXECUTOR, _PROCESS_KEYS
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    if _PROCESS_EXECUTOR is None:
+        # workers are forked, so they only know the functions registered before
+        _PROCESS_KEYS = frozenset(_PROCESS_FUNCS)
+        _PROCESS_EXECUTOR = ProcessPoolExecutor(
+            max_workers=_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_warm_worker,
+        )
+        _LOG.info(_LOG_STR, f"Started Process Pool : {_PROCESS_WORKERS} Workers")
+    return _PROCESS_EXECUTOR
+
+
+def start_process_pool() -> None:
+    """
+    fork and warm all render workers. Render functions live in helpers,
+    which are imported before this runs, so every one is registered.
+    """
+    if not _PROCESS_FUNCS:
+        return
+    pool = _get_process_pool()
+    for _ in range(_PROCESS_WORKERS if pool else 0):
+        pool.submit(os.getpid)
+
+
+def run_in_process(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    run a cpu bound function in the render process pool, arguments and
+    result must be picklable. Waiting calls are capped so a burst of
+    commands can't pile up unbounded work.
+    """
+    key = f"{func.__module__}.{func.__qualname__}"
+    _PROCESS_FUNCS[key] = func
+    if _PROCESS_EXECUTOR is not None:
+        _LOG.warning(f"{key} registered after the process pool started, uses threads")
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        global _PROCESS_EXECUTOR, _PROCESS_SLOTS
+        if _PROCESS_SLOTS is None:
+            _PROCESS_SLOTS = asyncio.Semaphore(_PROCESS_WORKERS * 2)
+        loop = asyncio.get_running_loop()
+        async with _PROCESS_SLOTS:
+            pool = _get_process_pool()
+            if pool is not None and key in _PROCESS_KEYS:
+                try:
+                    return await loop.run_in_executor(
+                        pool, _call_registered, key, args, kwargs
+                    )
+                except BrokenProcessPool as e:
+                    _LOG.error(_LOG_STR, f"Process pool broken : {e}")
+                    _PROCESS_EXECUTOR = None
+            # no fork support, a late registration or a dead worker
+            return await loop.run_in_executor(_EXECUTOR, partial(func, *args, **kwargs))
+
+    return wrapper
+
+
 def _get() -> ThreadPoolExecutor:
     return _EXECUTOR
 
@@ -44,6 +144,9 @@ def _stop():
     _EXECUTOR.shutdown()
     # pylint: disable=protected-access
     _LOG.info(_LOG_STR, f"Stopped Pool : {_EXECUTOR._max_workers} Workers")
+    if _PROCESS_EXECUTOR is not None:
+        _PROCESS_EXECUTOR.shutdown()
+        _LOG.info(_LOG_STR, f"Stopped Process Pool : {_PROCESS_WORKERS} Workers")
 
 
 # pylint: disable=protected-access
@@ -0,0 +1,105 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+import asyncio
+import contextvars
+import os
+import shlex
+import shutil
+import signal
+import time
+from contextlib import asynccontextmanager, nullcontext, suppress
+from typing import Dict
+
+from ..Config import Config
+from .logger import logging
+
+LOGS = logging.getLogger(__name__)
+
+# tools that eat whole cpu cores, only a few of them may run at once
+HEAVY_COMMANDS = {"ffmpeg", "cwebp", "lottie_convert.py", "convert", "magick"}
+HEAVY_NICE = 10
+
+# pid -> child process, the client kills whatever is left here on shutdown
+running_processes: Dict[int, asyncio.subprocess.Process] = {}
+# command that started the current handler, recorded as owner of its children
+current_command = contextvars.ContextVar("current_command", default=None)
+
+_SLOTS = None
+
+
+def heavy_limit() -> int:
+    return Config.HEAVY_PROCESS_LIMIT or os.cpu_count() or 1
+
+
+def _slots() -> asyncio.Semaphore:
+    global _SLOTS
+    if _SLOTS is None:
+        _SLOTS = asyncio.Semaphore(heavy_limit())
+    return _SLOTS
+
+
+def is_heavy(cmd) -> bool:
+    args = cmd.split(None, 1) if isinstance(cmd, str) else list(cmd)
+    return bool(args) and os.path.basename(args[0]) in HEAVY_COMMANDS
+
+
+def _low_priority() -> list:
+    prefix = ["nice", "-n", str(HEAVY_NICE)]
+    if shutil.which("ionice"):
+        prefix += ["ionice", "-c", "3"]
+    return prefix
+
+
+def kill_child(process) -> None:
+    """
+    Kill a child started by spawn. A shell child leads its own process
+    group, so the whole group goes, not just /bin/sh.
+    """
+    if getattr(process, "shell", False):
+        with suppress(ProcessLookupError):
+            os.killpg(process.pid, signal.SIGKILL)
+    elif process.returncode is None:
+        process.kill()
+
+
+@asynccontextmanager
+async def spawn(cmd, shell=False, heavy=None, owner=None, **kwargs):
+    """
+    Start a child process and register it in running_processes.
+
+    Heavy tools wait for one of heavy_limit() slots and run under nice and
+    ionice so they can't starve the bot. The child is killed if the caller
+    is cancelled or fails before it exits.
+    """
+    heavy = is_heavy(cmd) if heavy is None else heavy
+    async with _slots() if heavy else nullcontext():
+        if shell:
+            if heavy:
+                cmd = f"{shlex.join(_low_priority())} {cmd}"
+            process = await asyncio.create_subprocess_shell(
+                cmd, start_new_session=True, **kwargs
+            )
+        else:
+            args = shlex.split(cmd) if isinstance(cmd, str) else list(cmd)
+            if heavy:
+                args = _low_priority() + args
+            process = await asyncio.create_subprocess_exec(*args, **kwargs)
+        process.shell = shell
+        process.cmd = cmd if isinstance(cmd, str) else shlex.join(cmd)
+        process.owner = owner or current_command.get()
+        process.started = time.time()
+        running_processes[process.pid] = process
+        try:
+            yield process
+        except BaseException:
+            kill_child(process)
+            await process.wait()
+            raise
+        finally:
+            running_processes.pop(process.pid, None)
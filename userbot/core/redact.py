@@ -0,0 +1,108 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+import re
+
+from ..Config import Config
+
+# config vars whose values must never reach a public chat
+SECRET_VARS = (
+    "STRING_SESSION",
+    "API_HASH",
+    "TG_BOT_TOKEN",
+    "HEROKU_API_KEY",
+    "OPEN_WEATHER_MAP_APPID",
+    "IBM_WATSON_CRED_URL",
+    "IBM_WATSON_CRED_PASSWORD",
+    "OCR_SPACE_API_KEY",
+    "OPENAI_API_KEY",
+    "GENIUS_API_TOKEN",
+    "REM_BG_API_KEY",
+    "CURRENCY_API",
+    "G_DRIVE_CLIENT_ID",
+    "G_DRIVE_CLIENT_SECRET",
+    "G_DRIVE_DATA",
+    "LASTFM_API",
+    "LASTFM_SECRET",
+    "LASTFM_PASSWORD",
+    "SPAMWATCH_API",
+    "SPOTIFY_CLIENT_ID",
+    "SPOTIFY_CLIENT_SECRET",
+    "GITHUB_ACCESS_TOKEN",
+    "DEEP_AI",
+    "SCREEN_SHOT_LAYER_ACCESS_KEY",
+    "TG_2STEP_VERIFICATION_CODE",
+)
+MASK = "[REDACTED]"
+# files are scanned in chunks so big outputs never sit in memory at once
+SCAN_CHUNK = 1 << 20
+
+
+class SecretScanner:
+    """
+    Holds the configured secrets and the owner's phone number. The secret
+    list and the masking pattern are rebuilt only when a config value
+    changes.
+
+    Detection runs one C level substring search per secret, which is
+    several times faster than a single regex alternation over the same
+    text. The regex is only used to mask a text that matched.
+    """
+
+    def __init__(self):
+        self.phone = None
+        self.secrets = ()
+        self._snapshot = None
+        self._pattern = None
+
+    def refresh(self):
+        snapshot = tuple(getattr(Config, name, None) for name in SECRET_VARS)
+        snapshot += (self.phone,)
+        if snapshot != self._snapshot:
+            self._snapshot = snapshot
+            secrets = {str(value) for value in snapshot if value}
+            # longest first so a masked secret never leaves a partial tail
+            self.secrets = tuple(sorted(secrets, key=len, reverse=True))
+            self._pattern = (
+                re.compile("|".join(map(re.escape, self.secrets)))
+                if self.secrets
+                else None
+            )
+        return self.secrets
+
+    def set_phone(self, phone):
+        self.phone = str(phone)[-10:] if phone else None
+
+    def contains(self, text) -> bool:
+        return any(secret in text for secret in self.refresh())
+
+    def mask(self, text: str) -> str:
+        if not self.contains(text):
+            return text
+        return self._pattern.sub(MASK, text)
+
+    def contains_file(self, path) -> bool:
+        "scan a text file in one pass, binary files are skipped"
+        secrets = self.refresh()
+        if not secrets:
+            return False
+        overlap = max(map(len, secrets)) - 1
+        tail = ""
+        try:
+            with open(path, encoding="utf-8") as f:
+                while chunk := f.read(SCAN_CHUNK):
+                    window = tail + chunk
+                    if any(secret in window for secret in secrets):
+                        return True
+                    tail = window[-overlap:] if overlap else ""
+        except (OSError, TypeError, ValueError):
+            return False
+        return False
+
+
+scanner = SecretScanner()
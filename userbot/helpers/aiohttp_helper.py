@@ -7,30 +7,22 @@
 # Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
-import aiohttp
+from ..core import http
 
 
 class AioHttp:
     @staticmethod
-    async def get_json(link):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(link) as resp:
-                return await resp.json()
+    async def get_json(link, cache=None):
+        return (await http.get(link, cache=cache)).json()
 
     @staticmethod
-    async def get_text(link):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(link) as resp:
-                return await resp.text()
+    async def get_text(link, cache=None):
+        return (await http.get(link, cache=cache)).text
 
     @staticmethod
-    async def get_raw(link):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(link) as resp:
-                return await resp.read()
+    async def get_raw(link, cache=None):
+        return (await http.get(link, cache=cache)).content
 
     @staticmethod
-    async def get_status(link):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(link) as resp:
-                return resp.status
+    async def get_status(link, cache=None):
+        return (await http.get(link, cache=cache)).status
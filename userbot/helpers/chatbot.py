@@ -11,10 +11,10 @@ import json
 import os
 
 import openai
-import requests
 from fake_useragent import UserAgent
 
 from userbot.Config import Config
+from userbot.core import http
 from userbot.core.managers import edit_delete, edit_or_reply
 from userbot.helpers.functions import format_image, wall_download
 from userbot.sql_helper.globals import gvarstatus
@@ -127,22 +127,21 @@ async def generate_dalle_image(text, reply, event, flag=None):
 
 class ThabAi:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers = {
+        self.headers = {
             "authority": "chatbot.theb.ai",
             "content-type": "application/json",
             "origin": "https://chatbot.theb.ai",
             "user-agent": UserAgent().random,
         }
 
-    def get_response(self, prompt: str) -> str:
-        response = self.session.post(
+    async def get_response(self, prompt: str) -> str:
+        response = await http.post(
             "https://chatbot.theb.ai/api/chat-process",
             json={"prompt": prompt, "options": {}},
-            stream=True,
+            headers=self.headers,
         )
         response.raise_for_status()
-        response_lines = response.iter_lines()
+        response_lines = response.content.splitlines()
         response_data = ""
         for line in response_lines:
             if line:
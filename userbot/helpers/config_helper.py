@@ -14,6 +14,7 @@ from validators.url import url
 from userbot import BOTLOG_CHATID
 
 from ..Config import Config
+from ..core.helpmenu import HELP_VARS, clear_help_cache
 from ..sql_helper.globals import addgvar, delgvar, gvarstatus
 
 plugin_category = "tools"
@@ -129,6 +130,8 @@ async def set_var(event, vname, vinfo):
         if vname == "DEFAULT_BIO" and len(vinfo) > 70:
             return f"No of characters in your bio must not exceed 70 so compress it and set again\n`{vinfo}`"
         addgvar(vname, vinfo)
+    if vname in HELP_VARS:
+        clear_help_cache()
     await event.client.send_message(
         BOTLOG_CHATID, f"#DATABASE_VAR  #UPDATED\n\n`{vname}` = `{vinfo}`", silent=True
     )
@@ -151,6 +154,8 @@ async def del_var(event, vname):
         if gvarstatus("DEFAULT_PIC"):
             delgvar("DEFAULT_PIC")
     delgvar(vname)
+    if vname in HELP_VARS:
+        clear_help_cache()
     await event.client.send_message(
         BOTLOG_CHATID, f"#DATABASE_VAR  #DELETED\n\n`{vname}`", silent=True
     )
@@ -7,6 +7,8 @@
 # Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
+from functools import lru_cache
+
 normaltext = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz1234567890\"'#$%&()*+,-./:;<=>?@[\\]^_`{|}~"
 
 smallcapsfont = "ᴀʙᴄᴅᴇꜰɢʜɪᴊᴋʟᴍɴᴏᴘǫʀsᴛᴜᴠᴡxʏᴢᴀʙᴄᴅᴇꜰɢʜɪᴊᴋʟᴍɴᴏᴘǫʀsᴛᴜᴠᴡxʏᴢ1234567890\"'#$%&()*+,-./:;<=>?@[\\]^_`{|}~"
@@ -738,3 +740,46 @@ itachiemoji = [
     "⁭\n        {cj}{cj}{cj}{cj}\n   {cj}{cj}{cj}{cj}{cj}{cj}\n{cj}{cj}               {cj}{cj}\n{cj}{cj}               {cj}{cj}\n   {cj}{cj}{cj}{cj}{cj}{cj}\n   {cj}{cj}{cj}{cj}{cj}{cj}\n{cj}{cj}               {cj}{cj}\n{cj}{cj}               {cj}{cj}\n   {cj}{cj}{cj}{cj}{cj}{cj}\n        {cj}{cj}{cj}{cj}\n",
     "⁭\n        {cj}{cj}{cj}{cj}\n   {cj}{cj}{cj}{cj}{cj}{cj}\n{cj}{cj}               {cj}{cj}\n{cj}{cj}               {cj}{cj}\n {cj}{cj}{cj}{cj}{cj}{cj}{cj}\n      {cj}{cj}{cj}{cj}{cj}{cj}\n                         {cj}{cj}\n                        {cj}{cj}\n  {cj}{cj}{cj}{cj}{cj}{cj}\n       {cj}{cj}{cj}{cj}\n",
 ]
+
+# style name -> (plain characters, styled glyphs), glyphs may be several codepoints
+FONT_STYLES = {
+    "smallcaps": (normaltext, smallcapsfont),
+    "superscript": (normaltext, superscriptfont),
+    "subscript": (normaltext, subscriptfont),
+    "bubbles": (normaltext, bubblesfont),
+    "bubblesblack": (normaltext, bubblesblackfont),
+    "smoth": (normaltext, smothtextfont),
+    "egypt": (normaltext, egyptfontfont),
+    "hwsl": (normaltext, hwslfont),
+    "nightmare": (normaltext, nightmarefont),
+    "ghost": (normaltext, ghostfontfont),
+    "hwcapital": (normaltext, hwcapitalfont),
+    "tantext": (normaltext, tantextfont),
+    "littlebox": (normaltext, littleboxtextfont),
+    "double": (normaltext, doubletextfont),
+    "upside": (upsidefont, downsidefont),
+    "ancient": (normalfont, ancientfont),
+    "musical": (normalfont, musicalfont),
+    "weeby": (normiefont, weebyfont),
+}
+
+
+def _compile(source, glyphs):
+    table = {}
+    for char, glyph in zip(source, glyphs):
+        # first mapping wins, same as looking it up with source.index(char)
+        table.setdefault(ord(char), glyph)
+    return table
+
+
+FONT_TABLES = {name: _compile(*pair) for name, pair in FONT_STYLES.items()}
+
+
+@lru_cache(maxsize=512)
+def stylize(text, font):
+    "Convert text into one of the FONT_STYLES, unknown characters are kept"
+    try:
+        return text.translate(FONT_TABLES[font])
+    except KeyError:
+        raise ValueError(f"Unknown font style: {font}") from None
+
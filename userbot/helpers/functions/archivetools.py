@@ -0,0 +1,222 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+import asyncio
+import concurrent.futures
+import contextlib
+import os
+import shutil
+import tarfile
+import threading
+import zipfile
+from typing import Iterator, Optional, Tuple
+
+from ...core.logger import logging
+from ...core.pool import run_in_thread
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+LOGS = logging.getLogger(__name__)
+
+ARCHIVE_EXTS = {"zip": ".zip", "gz": ".tar.gz", "xz": ".tar.xz", "zst": ".tar.zst"}
+ARCHIVE_LEVELS = {"zip": (6, 9), "gz": (6, 9), "xz": (6, 9), "zst": (3, 22)}
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+CHUNK_SIZE = 1 << 20
+
+
+class ArchiveStopped(Exception):
+    """
+    Raised in the worker thread when the command was cancelled
+    """
+
+
+class ArchiveProgress:
+    "counters the worker thread updates, read from the loop for status edits"
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.stop = threading.Event()
+
+    def add(self, size: int) -> None:
+        if self.stop.is_set():
+            raise ArchiveStopped
+        self.files += 1
+        self.bytes += size
+
+
+def walk_files(path: str) -> Iterator[Tuple[str, str]]:
+    "(file path, name inside the archive), lazily so huge trees cost nothing upfront"
+    base = os.path.dirname(os.path.abspath(path))
+    if os.path.isfile(path):
+        yield path, os.path.basename(path)
+        return
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            yield full, os.path.relpath(os.path.abspath(full), base)
+
+
+def archive_level(fmt: str, level: Optional[int]) -> int:
+    default, highest = ARCHIVE_LEVELS[fmt]
+    return default if level is None else max(1, min(level, highest))
+
+
+@contextlib.contextmanager
+def _open_tar(path: str, mode: str, fmt: str = None, level: int = None):
+    if mode == "w" and fmt != "zst":
+        option = "compresslevel" if fmt == "gz" else "preset"
+        with tarfile.open(path, f"w:{fmt}", **{option: level}) as tar:
+            yield tar
+        return
+    with open(path, "rb" if mode == "r" else "wb") as raw:
+        if mode == "r":
+            magic = raw.read(4)
+            raw.seek(0)
+            if magic != ZSTD_MAGIC:
+                # gz, xz and bz2 are detected by tarfile itself, read as a stream
+                with tarfile.open(fileobj=raw, mode="r|*") as tar:
+                    yield tar
+                return
+        if zstandard is None:
+            raise RuntimeError("zstd archives need the zstandard package")
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw)
+        else:
+            # threads=-1 compresses on every core
+            stream = zstandard.ZstdCompressor(level=level, threads=-1).stream_writer(
+                raw
+            )
+        with stream, tarfile.open(fileobj=stream, mode=f"{mode}|") as tar:
+            yield tar
+
+
+def write_archive(
+    src: str, dest: str, fmt: str = "zip", level=None, progress=None
+) -> str:
+    """
+    Pack src into dest one file at a time, so memory stays flat whatever
+    the size of the tree. Runs in a worker thread.
+    """
+    progress = progress or ArchiveProgress()
+    level = archive_level(fmt, level)
+    try:
+        if fmt == "zip":
+            with zipfile.ZipFile(
+                dest, "w", zipfile.ZIP_DEFLATED, compresslevel=level
+            ) as archive:
+                for full, arcname in walk_files(src):
+                    archive.write(full, arcname)
+                    progress.add(os.path.getsize(full))
+        else:
+            with _open_tar(dest, "w", fmt, level) as archive:
+                for full, arcname in walk_files(src):
+                    archive.add(full, arcname, recursive=False)
+                    progress.add(os.path.getsize(full))
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(dest)
+        raise
+    return dest
+
+
+def _safe_path(destination: str, name: str) -> Optional[str]:
+    target = os.path.realpath(os.path.join(destination, name))
+    root = os.path.realpath(destination)
+    return target if target.startswith(root + os.sep) else None
+
+
+def _copy_member(source, target: str) -> None:
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with source, open(target, "wb") as out:
+        shutil.copyfileobj(source, out, CHUNK_SIZE)
+
+
+def iter_extract(archive: str, destination: str, progress=None):
+    """
+    Extract regular files one by one and yield (path, name) as soon as
+    each one is on disk. Links and paths leaving destination are skipped.
+    """
+    progress = progress or ArchiveProgress()
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zipped:
+            for info in zipped.infolist():
+                target = _safe_path(destination, info.filename)
+                if info.is_dir() or target is None:
+                    continue
+                _copy_member(zipped.open(info), target)
+                progress.add(info.file_size)
+                yield target, info.filename
+        return
+    with _open_tar(archive, "r") as tar:
+        for member in tar:
+            target = _safe_path(destination, member.name)
+            if not member.isfile() or target is None:
+                continue
+            _copy_member(tar.extractfile(member), target)
+            progress.add(member.size)
+            yield target, member.name
+
+
+async def make_archive(src: str, dest: str, fmt="zip", level=None, progress=None):
+    progress = progress or ArchiveProgress()
+    try:
+        return await run_in_thread(write_archive)(src, dest, fmt, level, progress)
+    except asyncio.CancelledError:
+        # the thread notices it before the next file and removes dest
+        progress.stop.set()
+        raise
+
+
+_DONE = object()
+
+
+async def extract_stream(archive: str, destination: str, progress=None, buffer=4):
+    """
+    Async iterator over iter_extract running in a worker thread. At most
+    buffer files wait for the consumer, so uploading them as they come
+    never lets the extraction run far ahead.
+    """
+    progress = progress or ArchiveProgress()
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(buffer)
+
+    def hand_over(item):
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                return future.result(timeout=1)
+            except concurrent.futures.TimeoutError:
+                if progress.stop.is_set():
+                    future.cancel()
+                    raise ArchiveStopped from None
+
+    def worker():
+        try:
+            for item in iter_extract(archive, destination, progress):
+                hand_over(item)
+            hand_over(_DONE)
+        except ArchiveStopped:
+            pass
+        except Exception as e:
+            with contextlib.suppress(ArchiveStopped):
+                hand_over(e)
+
+    task = asyncio.ensure_future(run_in_thread(worker)())
+    try:
+        while (item := await queue.get()) is not _DONE:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        progress.stop.set()
+        await asyncio.shield(task)
@@ -11,6 +11,7 @@ import os
 
 from PIL import Image
 
+from userbot.core.convcache import convcache
 from userbot.core.logger import logging
 from userbot.core.managers import edit_or_reply
 from userbot.helpers.functions.vidtools import take_screen_shot
@@ -21,6 +22,14 @@ LOGS = logging.getLogger(__name__)
 
 
 class CatConverter:
+    async def _cached(self, key, dirct, file):
+        "serve a repeat conversion from convcache without downloading it"
+        if key is None:
+            return False
+        if not os.path.isdir(dirct):
+            os.mkdir(dirct)
+        return await convcache.get(key, os.path.join(dirct, file))
+
     async def _media_check(self, reply, dirct, file, memetype):
         if not os.path.isdir(dirct):
             os.mkdir(dirct)
@@ -51,6 +60,9 @@ class CatConverter:
                 event, "`Transfiguration Time! Converting to ....`"
             )
         )
+        key = convcache.key(reply, "image", rgb=rgb)
+        if await self._cached(key, dirct, file):
+            return catevent, os.path.join(dirct, file), mediatype
         catfile, catmedia = await self._media_check(reply, dirct, file, memetype)
         if memetype == "Photo":
             im = Image.open(catmedia)
@@ -78,6 +90,7 @@ class CatConverter:
                 if img.mode != "RGB":
                     img = img.convert("RGB")
                 img.save(catfile)
+            await convcache.put(key, catfile)
             return catevent, catfile, mediatype
         return catevent, None
 
@@ -85,11 +98,22 @@ class CatConverter:
         self, event, reply, dirct="./temp", file="meme.webp", noedits=False, rgb=False
     ):
         filename = os.path.join(dirct, file)
+        key = convcache.key(reply, "sticker", rgb=rgb)
+        if await self._cached(key, dirct, file):
+            catevent = (
+                event
+                if noedits
+                else await edit_or_reply(
+                    event, "`Transfiguration Time! Converting to ....`"
+                )
+            )
+            return catevent, filename, await media_type(reply)
         response = await self.to_image(event, reply, noedits=noedits, rgb=rgb)
         if response[1]:
             image = Image.open(response[1])
             image.save(filename, "webp")
             os.remove(response[1])
+            await convcache.put(key, filename)
             return response[0], filename, response[2]
         return response[0], None
 
@@ -110,6 +134,9 @@ class CatConverter:
             if noedits
             else await edit_or_reply(event, "__🎞Converting into Animated sticker..__")
         )
+        key = convcache.key(reply, "webm")
+        if await self._cached(key, dirct, file):
+            return catevent, os.path.join(dirct, file)
         catfile, catmedia = await self._media_check(reply, dirct, file, memetype)
         media = await fileinfo(catmedia)
         h = media["height"]
@@ -120,6 +147,7 @@ class CatConverter:
         )  # pain
         if os.path.exists(catmedia):
             os.remove(catmedia)
+        await convcache.put(key, catfile)
         return (catevent, catfile) if os.path.exists(catfile) else (catevent, None)
 
     async def to_gif(
@@ -142,6 +170,9 @@ class CatConverter:
                 event, "`Transfiguration Time! Converting to ....`"
             )
         )
+        key = convcache.key(reply, "gif", maxsize=maxsize)
+        if await self._cached(key, dirct, file):
+            return catevent, os.path.join(dirct, file)
         catfile, catmedia = await self._media_check(reply, dirct, file, memetype)
         if mediatype == "Sticker":
             if memetype == "Video Sticker":
@@ -156,6 +187,7 @@ class CatConverter:
             )
         if catmedia and os.path.exists(catmedia):
             os.remove(catmedia)
+        await convcache.put(key, catfile)
         return (catevent, catfile) if os.path.exists(catfile) else (catevent, None)
 
 
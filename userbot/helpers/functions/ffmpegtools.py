@@ -0,0 +1,297 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from ...Config import Config
+from ...core.logger import logging
+from ...core.procs import heavy_limit, spawn
+
+LOGS = logging.getLogger(__name__)
+
+# speed vs size trade off for re-encoding, the first available encoder wins
+FFMPEG_PROFILES: Dict[str, Dict[str, str]] = {
+    "fast": {"libx264": "veryfast", "libx265": "ultrafast"},
+    "balanced": {"libx264": "medium", "libx265": "fast"},
+    "small": {"libx265": "medium", "libx264": "slow"},
+}
+# codecs that can be stream copied into an mp4
+MP4_VIDEO = {"h264", "hevc", "mpeg4", "av1"}
+MP4_AUDIO = {"aac", "mp3", "alac", "ac3", "opus"}
+KEYFRAME_TOLERANCE = 0.1
+
+_PROBES: "OrderedDict[tuple, dict]" = OrderedDict()
+_ENCODERS: Optional[set] = None
+
+
+def parse_time(value) -> float:
+    "seconds from 90, 01:30 or 00:01:30.5"
+    seconds = 0.0
+    for part in str(value).split(":"):
+        seconds = seconds * 60 + float(part or 0)
+    return seconds
+
+
+async def _capture(cmd: List[str]):
+    "stdout and stderr of a command run from an argument list, no shell quoting"
+    async with spawn(
+        cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    ) as process:
+        stdout, stderr = await process.communicate()
+    return stdout.decode("utf-8", "replace"), stderr.decode("utf-8", "replace")
+
+
+async def ffprobe(path: str) -> dict:
+    """
+    Streams and format of a media file, probed once per file version so
+    the callers can ask again for free.
+    """
+    stat = os.stat(path)
+    key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    if key in _PROBES:
+        _PROBES.move_to_end(key)
+        return _PROBES[key]
+    stdout, stderr = await _capture(
+        ["ffprobe", "-v", "error", "-print_format", "json"]
+        + ["-show_format", "-show_streams", path]
+    )
+    try:
+        info = json.loads(stdout)
+    except ValueError:
+        LOGS.error(f"ffprobe failed for {path}: {stderr}")
+        info = {}
+    info.setdefault("streams", [])
+    info.setdefault("format", {})
+    _PROBES[key] = info
+    while len(_PROBES) > 32:
+        _PROBES.popitem(last=False)
+    return info
+
+
+def probe_stream(info: dict, kind: str) -> Optional[dict]:
+    return next((s for s in info["streams"] if s.get("codec_type") == kind), None)
+
+
+def audio_args(info: dict) -> List[str]:
+    "copy the audio into an mp4 when it fits, aac otherwise"
+    audio = probe_stream(info, "audio")
+    if audio is None or audio.get("codec_name") in MP4_AUDIO:
+        return ["-c:a", "copy"]
+    return ["-c:a", "aac"]
+
+
+def probe_duration(info: dict) -> float:
+    try:
+        return float(info["format"]["duration"])
+    except (KeyError, ValueError):
+        return 0.0
+
+
+async def available_encoders() -> set:
+    global _ENCODERS
+    if _ENCODERS is None:
+        stdout = (await _capture(["ffmpeg", "-hide_banner", "-encoders"]))[0]
+        _ENCODERS = {
+            line.split()[1]
+            for line in stdout.splitlines()
+            if len(line.split()) > 1 and line.split()[0].startswith("V")
+        }
+    return _ENCODERS
+
+
+async def pick_encoder(profile: Optional[str] = None):
+    "(codec, preset) of the configured profile that this ffmpeg build has"
+    profile = profile or Config.FFMPEG_PROFILE
+    choices = FFMPEG_PROFILES.get(profile) or FFMPEG_PROFILES["balanced"]
+    encoders = await available_encoders()
+    for codec, preset in choices.items():
+        if codec in encoders:
+            return codec, preset
+    # unknown build, let ffmpeg fail loudly with the most common encoder
+    return "libx264", choices.get("libx264", "medium")
+
+
+def _progress_value(block: dict, *names, default=0.0) -> float:
+    for name in names:
+        value = block.get(name, "").rstrip("x")
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return default
+
+
+async def run_ffmpeg(
+    args: List[str],
+    on_progress: Optional[Callable] = None,
+    interval: float = 3,
+) -> int:
+    """
+    Run ffmpeg and parse its -progress output from the pipe. on_progress
+    is awaited with (seconds done, speed) at most every interval seconds.
+    """
+    cmd = ["ffmpeg", "-hide_banner", "-nostdin", "-loglevel", "error", "-y"]
+    cmd += ["-progress", "pipe:1", "-nostats"] + args
+    async with spawn(
+        cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    ) as process:
+        errors = asyncio.create_task(process.stderr.read())
+        block = {}
+        last_update = 0.0
+        async for line in process.stdout:
+            key, _, value = line.decode("utf-8", "replace").strip().partition("=")
+            block[key] = value
+            if key != "progress":
+                continue
+            if on_progress is not None and time.monotonic() - last_update >= interval:
+                last_update = time.monotonic()
+                done = _progress_value(block, "out_time_us", "out_time_ms") / 1e6
+                speed = _progress_value(block, "speed", default=1.0) or 1.0
+                try:
+                    await on_progress(done, speed)
+                except Exception as e:
+                    LOGS.debug(f"ffmpeg progress update failed: {e}")
+            block = {}
+        await process.wait()
+        stderr = (await errors).decode("utf-8", "replace").strip()
+    if process.returncode:
+        LOGS.error(f"ffmpeg exited with {process.returncode}: {stderr[-1000:]}")
+    return process.returncode
+
+
+async def encode_video(
+    src: str,
+    dest: str,
+    crf="23",
+    profile: Optional[str] = None,
+    on_progress: Optional[Callable] = None,
+) -> Optional[str]:
+    """
+    Re-encode the video stream of src and copy its audio. Videos longer
+    than FFMPEG_PARALLEL_MIN seconds are cut in segments that are encoded
+    side by side and joined at the end.
+    """
+    info = await ffprobe(src)
+    duration = probe_duration(info)
+    codec, preset = await pick_encoder(profile)
+    segments = min(heavy_limit(), os.cpu_count() or 1)
+    if (
+        Config.FFMPEG_PARALLEL_MIN
+        and duration >= Config.FFMPEG_PARALLEL_MIN
+        and segments > 1
+    ):
+        return await _encode_segments(
+            src, dest, info, crf, codec, preset, segments, on_progress
+        )
+    args = ["-i", src, "-map", "0:v:0", "-map", "0:a?"] + audio_args(info)
+    args += ["-c:v", codec, "-preset", preset, "-crf", str(crf), dest]
+    await run_ffmpeg(args, on_progress)
+    return dest if os.path.exists(dest) else None
+
+
+async def _encode_segments(src, dest, info, crf, codec, preset, segments, on_progress):
+    workdir = tempfile.mkdtemp(prefix="catffmpeg_", dir=os.path.dirname(dest) or ".")
+    length = probe_duration(info) / segments
+    threads = str(max(1, (os.cpu_count() or 1) // segments))
+    done = [0.0] * segments
+    speeds = [1.0] * segments
+
+    def track(index):
+        async def update(seconds, speed):
+            done[index], speeds[index] = seconds, speed
+            if on_progress is not None:
+                await on_progress(sum(done), sum(speeds))
+
+        return update
+
+    async def encode(index):
+        part = os.path.join(workdir, f"part{index:03d}.mp4")
+        args = ["-ss", f"{index * length:.3f}", "-i", src]
+        if index < segments - 1:
+            args += ["-t", f"{length:.3f}"]
+        args += ["-map", "0:v:0", "-an", "-c:v", codec, "-preset", preset]
+        args += ["-crf", str(crf), "-threads", threads, part]
+        if await run_ffmpeg(args, track(index)):
+            raise RuntimeError(f"segment {index} failed")
+        return part
+
+    tasks = [asyncio.create_task(encode(i)) for i in range(segments)]
+    try:
+        parts = await asyncio.gather(*tasks)
+        playlist = os.path.join(workdir, "parts.txt")
+        with open(playlist, "w") as f:
+            f.writelines(f"file '{os.path.abspath(part)}'\n" for part in parts)
+        args = ["-f", "concat", "-safe", "0", "-i", playlist, "-i", src]
+        args += ["-map", "0:v", "-map", "1:a?", "-c:v", "copy"] + audio_args(info)
+        await run_ffmpeg(args + [dest])
+    except RuntimeError as e:
+        LOGS.error(f"parallel encode of {src} failed: {e}")
+        return None
+    finally:
+        # one failed segment stops the others before their files go away
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return dest if os.path.exists(dest) else None
+
+
+async def on_keyframe(src: str, seconds: float) -> bool:
+    "True when a cut at seconds can start without re-encoding"
+    if seconds <= KEYFRAME_TOLERANCE:
+        return True
+    window = f"{max(seconds - 10, 0):.3f}%{seconds + 1:.3f}"
+    stdout = (
+        await _capture(
+            ["ffprobe", "-v", "error", "-select_streams", "v:0", "-skip_frame", "nokey"]
+            + ["-show_entries", "frame=pts_time", "-of", "csv=p=0"]
+            + ["-read_intervals", window, src]
+        )
+    )[0]
+    for line in stdout.split():
+        try:
+            if abs(float(line.strip(",")) - seconds) <= KEYFRAME_TOLERANCE:
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+async def cut_media(src: str, dest: str, start, end) -> Optional[str]:
+    """
+    Cut start to end out of src. Streams are copied when the codecs fit
+    the output and the cut starts on a keyframe, otherwise re-encoded.
+    """
+    info = await ffprobe(src)
+    start, end = parse_time(start), parse_time(end)
+    video, audio = probe_stream(info, "video"), probe_stream(info, "audio")
+    audio_codec = audio and audio.get("codec_name")
+    args = ["-ss", f"{start:.3f}", "-to", f"{end:.3f}", "-i", src]
+    if dest.endswith(".mp3"):
+        args += ["-vn", "-c:a", "copy" if audio_codec == "mp3" else "libmp3lame"]
+    elif (
+        video is not None
+        and video.get("codec_name") in MP4_VIDEO
+        and (audio is None or audio_codec in MP4_AUDIO)
+        and await on_keyframe(src, start)
+    ):
+        args += ["-map", "0:v:0", "-map", "0:a?", "-c", "copy"]
+        args += ["-avoid_negative_ts", "make_zero"]
+    else:
+        codec, preset = await pick_encoder()
+        args += ["-map", "0:v:0?", "-map", "0:a?", "-c:v", codec, "-preset", preset]
+        args += ["-c:a", "aac"]
+    await run_ffmpeg(args + [dest])
+    return dest if os.path.exists(dest) else None
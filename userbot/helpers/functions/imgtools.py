@@ -8,53 +8,67 @@
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
 import io
+import math
+import os
+from datetime import datetime
 
-from PIL import Image, ImageDraw, ImageOps
+from glitch_this import ImageGlitcher
+from PIL import Image, ImageDraw, ImageFont, ImageOps
 
+from ...core.pool import run_in_process
 
-async def invert_colors(imagefile, endname):
+
+@run_in_process
+def invert_colors(imagefile, endname):
     image = Image.open(imagefile)
     inverted_image = ImageOps.invert(image)
     inverted_image.save(endname)
 
 
-async def flip_image(imagefile, endname):
+@run_in_process
+def flip_image(imagefile, endname):
     image = Image.open(imagefile)
     inverted_image = ImageOps.flip(image)
     inverted_image.save(endname)
 
 
-async def grayscale(imagefile, endname):
+@run_in_process
+def grayscale(imagefile, endname):
     image = Image.open(imagefile)
     inverted_image = ImageOps.grayscale(image)
     inverted_image.save(endname)
 
 
-async def mirror_file(imagefile, endname):
+@run_in_process
+def mirror_file(imagefile, endname):
     image = Image.open(imagefile)
     inverted_image = ImageOps.mirror(image)
     inverted_image.save(endname)
 
 
-async def solarize(imagefile, endname):
+@run_in_process
+def solarize(imagefile, endname):
     image = Image.open(imagefile)
     inverted_image = ImageOps.solarize(image, threshold=128)
     inverted_image.save(endname)
 
 
-async def add_frame(imagefile, endname, x, color):
+@run_in_process
+def add_frame(imagefile, endname, x, color):
     image = Image.open(imagefile)
     inverted_image = ImageOps.expand(image, border=x, fill=color)
     inverted_image.save(endname)
 
 
-async def crop(imagefile, endname, x):
+@run_in_process
+def crop(imagefile, endname, x):
     image = Image.open(imagefile)
     inverted_image = ImageOps.crop(image, border=x)
     inverted_image.save(endname)
 
 
-async def crop_and_divide(img):
+@run_in_process
+def crop_and_divide(img):
     (width, height) = img.size
     rows = 5
     columns = 5
@@ -93,9 +107,10 @@ def cirsle(im, x, y, r, fill):
     return im
 
 
-async def dotify(image, pix, mode):
+@run_in_process
+def _dotify(image, mode):
     count = 24
-    im_ = Image.open(image)
+    im_ = Image.open(io.BytesIO(image) if isinstance(image, bytes) else image)
     if im_.mode == "RGBA":
         temp = Image.new("RGB", im_.size, "#000")
         temp.paste(im_, (0, 0), im_)
@@ -115,7 +130,155 @@ async def dotify(image, pix, mode):
         _x += count
         _y = count // 2
     out = io.BytesIO()
+    img.save(out, "PNG")
+    return out.getvalue()
+
+
+async def dotify(image, pix, mode):
+    if not isinstance(image, str):
+        image = image.getvalue()
+    out = io.BytesIO(await _dotify(image, mode))
     out.name = "out.png"
-    img.save(out)
-    out.seek(0)
     return out
+
+
+def resize_sticker(image):
+    if (image.width and image.height) < 512:
+        size1 = image.width
+        size2 = image.height
+        if image.width > image.height:
+            scale = 512 / size1
+            size1new = 512
+            size2new = size2 * scale
+        else:
+            scale = 512 / size2
+            size1new = size1 * scale
+            size2new = 512
+        size1new = math.floor(size1new)
+        size2new = math.floor(size2new)
+        sizenew = (size1new, size2new)
+        image = image.resize(sizenew)
+    else:
+        maxsize = (512, 512)
+        image.thumbnail(maxsize)
+    return image
+
+
+@run_in_process
+def sticker_png(data):
+    "resize raw sticker image to 512px and return it as png bytes"
+    output = io.BytesIO()
+    resize_sticker(Image.open(io.BytesIO(data))).save(output, "PNG")
+    return output.getvalue()
+
+
+@run_in_process
+def render_logo(
+    text,
+    template,
+    fontdata,
+    fontsize,
+    color,
+    width,
+    height,
+    stroke_width,
+    stroke_color,
+    file_name,
+):
+    "draw the logo text on the template"
+    temp_img = Image.open(io.BytesIO(template))
+    raw_width, raw_height = temp_img.size
+    resized_width, resized_height = (
+        (1024, int(1024 * raw_height / raw_width))
+        if raw_width > raw_height
+        else (int(1024 * raw_width / raw_height), 1024)
+    )
+    img = temp_img.convert("RGBA").resize((resized_width, resized_height))
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.truetype(io.BytesIO(fontdata), fontsize)
+    while font.getsize(max(text.splitlines(), key=len))[0] > 0.70 * resized_width:
+        fontsize -= 1
+        font = ImageFont.truetype(io.BytesIO(fontdata), fontsize)
+    image_widthz, image_heightz = img.size
+    w, h = draw.textsize(text, font=font)
+    h += int(h * 0.21)
+    position = ((image_widthz - w) / width, (image_heightz - h) / height)
+    try:
+        draw.text(
+            position,
+            text,
+            font=font,
+            fill=color,
+            stroke_width=stroke_width,
+            stroke_fill=stroke_color,
+        )
+    except OSError:
+        draw.text(
+            position, text, font=font, fill=color, stroke_width=0, stroke_fill=None
+        )
+    img.save(file_name, "png")
+    return file_name
+
+
+@run_in_process
+def glitch_image(path, level, gif):
+    glitcher = ImageGlitcher()
+    img = Image.open(path)
+    if not gif:
+        glitched = os.path.join("./temp", "glitched.webp")
+        glitcher.glitch_image(img, level, color_offset=True).save(glitched)
+        return glitched
+    glitched = os.path.join("./temp", "glitched.gif")
+    glitch_img = glitcher.glitch_image(img, level, color_offset=True, gif=True)
+    DURATION = 200
+    LOOP = 0
+    glitch_img[0].save(
+        glitched,
+        format="GIF",
+        append_images=glitch_img[1:],
+        save_all=True,
+        duration=DURATION,
+        loop=LOOP,
+    )
+    return glitched
+
+
+@run_in_process
+def clock_pfp(path, angle, font_file):
+    "rotate the profile pic and stamp the current date and time on it"
+    im = Image.open(path)
+    im.rotate(angle, expand=False).save(path, "PNG")
+    current_time = datetime.now().strftime("  Time: %H:%M \n  Date: %d.%m.%y ")
+    img = Image.open(path)
+    drawn_text = ImageDraw.Draw(img)
+    fnt = ImageFont.truetype(font_file, 30)
+    drawn_text.text((150, 250), current_time, font=fnt, fill=(124, 252, 0))
+    img.save(path)
+
+
+@run_in_process
+def digital_pfp(path, font_file):
+    "stamp a digital clock on the profile pic"
+    current_time = datetime.now().strftime("%H:%M")
+    img = Image.open(path)
+    drawn_text = ImageDraw.Draw(img)
+    fnt = ImageFont.truetype(font_file, 200)
+    drawn_text.text((350, 100), current_time, font=fnt, fill=(124, 252, 0))
+    img.save(path)
+
+
+@run_in_process
+def bloom_pfp(path, color, font_file):
+    "fill the profile pic with color and write the time in its inverse"
+    image = Image.open(path)
+    image.paste(color, [0, 0, image.size[0], image.size[1]])
+    image.save(path)
+    inverse = tuple(256 - value for value in color)
+    current_time = datetime.now().strftime("\n Time: %H:%M:%S \n \n Date: %d/%m/%y")
+    img = Image.open(path)
+    drawn_text = ImageDraw.Draw(img)
+    fnt = ImageFont.truetype(font_file, 60)
+    ofnt = ImageFont.truetype(font_file, 250)
+    drawn_text.text((95, 250), current_time, font=fnt, fill=inverse)
+    drawn_text.text((95, 250), "      😈", font=ofnt, fill=inverse)
+    img.save(path)
@@ -16,12 +16,16 @@ import requests
 from bs4 import BeautifulSoup
 
 from ...Config import Config
+from ...core.httpcache import response_cache
 from ...core.managers import edit_or_reply
+from ...core.pool import run_in_thread
 from ...helpers.google_tools import chromeDriver
 from ..utils.utils import runcmd
 from .utube import name_dl, song_dl, video_dl
 
 GENIUS = Config.GENIUS_API_TOKEN
+# cache key and ttl of lyrics lookups, see ENDPOINT_TTLS
+GENIUS_URL = "https://api.genius.com/search"
 
 
 class LyricGenius:
@@ -87,6 +91,24 @@ class LyricGenius:
                 lyrics = data["message"]["body"]["lyrics"]["lyrics_body"]
         return link, lyrics
 
+    # lyricsgenius, the scraper and the musixmatch fallback all block, so
+    # commands go through these instead of calling the methods above directly
+    async def search(self, title):
+        return await run_in_thread(self.songs)(title)
+
+    async def get_lyrics(self, title, artist=None):
+        key = response_cache.make_key(
+            "GET", GENIUS_URL, {"params": {"title": title, "artist": artist}}
+        )
+        entry = await response_cache.lookup(key)
+        if entry is not None and entry.fresh:
+            return entry.value
+        result = await run_in_thread(self.lyrics)(title, artist)
+        # misses are not remembered, the song may be indexed later
+        if result[1]:
+            await response_cache.store(key, result, response_cache.ttl_for(GENIUS_URL))
+        return result
+
 
 LyricsGen = LyricGenius()
 
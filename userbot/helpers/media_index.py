@@ -0,0 +1,121 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+
+import asyncio
+from collections import defaultdict
+
+from telethon.utils import get_peer_id
+
+from ..core.logger import logging
+from ..core.pool import run_in_thread
+from ..sql_helper.media_index_sql import get_media_index, set_media_index
+from .tools import media_type
+
+LOGS = logging.getLogger(__name__)
+
+# progress is written back every this many messages so an interrupted scan resumes
+CHECKPOINT = 2000
+
+_LOCKS = defaultdict(asyncio.Lock)
+_REBUILDS = {}
+
+
+def _empty_bucket():
+    return {"count": 0, "file_size": 0, "max_size": 0, "max_msg_id": 0}
+
+
+def _add(stats, media, size, msg_id):
+    bucket = stats.setdefault(media, _empty_bucket())
+    bucket["count"] += 1
+    bucket["file_size"] += size
+    if size > bucket["max_size"]:
+        bucket["max_size"] = size
+        bucket["max_msg_id"] = msg_id
+
+
+async def _fold(data, message):
+    "add one message to the chat aggregates and to its sender's aggregates"
+    sender = data["senders"].setdefault(
+        str(message.sender_id), {"msg_count": 0, "media": {}}
+    )
+    sender["msg_count"] += 1
+    media = await media_type(message)
+    if media is None:
+        return
+    size = message.file.size or 0
+    _add(data["media"], media, size, message.id)
+    _add(sender["media"], media, size, message.id)
+
+
+async def update_media_index(client, entity, rebuild=False):
+    """
+    Brings the stored index of the chat up to date and returns
+    (msg_count, data). Only messages newer than the stored high-water
+    mark are fetched unless rebuild is set.
+    """
+    chat_id = get_peer_id(await client.get_input_entity(entity))
+    async with _LOCKS[chat_id]:
+        # the index is one json blob, (de)serialising it stays off the loop
+        index = None if rebuild else await run_in_thread(get_media_index)(chat_id)
+        last_msg_id, msg_count, data = index or (0, 0, {"media": {}, "senders": {}})
+        scanned = 0
+        async for message in client.iter_messages(
+            chat_id, limit=None, min_id=last_msg_id, reverse=True
+        ):
+            msg_count += 1
+            await _fold(data, message)
+            last_msg_id = message.id
+            scanned += 1
+            if scanned % CHECKPOINT == 0:
+                await run_in_thread(set_media_index)(
+                    chat_id, last_msg_id, msg_count, data
+                )
+        if scanned or index is None:
+            await run_in_thread(set_media_index)(chat_id, last_msg_id, msg_count, data)
+        return msg_count, data
+
+
+async def rebuild_media_index(client, entity):
+    "Starts a full rebuild in background, returns False if one is already running"
+    chat_id = get_peer_id(await client.get_input_entity(entity))
+    if chat_id in _REBUILDS and not _REBUILDS[chat_id].done():
+        return False
+
+    async def _rebuild():
+        try:
+            await update_media_index(client, chat_id, rebuild=True)
+        except Exception as e:
+            LOGS.error(f"Media index rebuild of {chat_id} failed: {e}")
+        finally:
+            _REBUILDS.pop(chat_id, None)
+
+    _REBUILDS[chat_id] = asyncio.create_task(_rebuild())
+    return True
+
+
+async def sender_media_stats(client, entity, user_id):
+    """
+    (msg_count, media aggregates) of one sender. Served from the chat index
+    when it exists, otherwise only that sender's messages are scanned, a
+    single user lookup shouldn't index the whole chat.
+    """
+    chat_id = get_peer_id(await client.get_input_entity(entity))
+    if await run_in_thread(get_media_index)(chat_id) is not None:
+        _, data = await update_media_index(client, chat_id)
+        return sender_stats(data, user_id)
+    data = {"media": {}, "senders": {}}
+    async for message in client.iter_messages(chat_id, limit=None, from_user=user_id):
+        await _fold(data, message)
+    return sender_stats(data, user_id)
+
+
+def sender_stats(data, user_id):
+    "returns (msg_count, media aggregates) of a single sender"
+    sender = data["senders"].get(str(user_id), {"msg_count": 0, "media": {}})
+    return sender["msg_count"], sender["media"]
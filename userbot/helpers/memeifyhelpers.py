@@ -19,11 +19,13 @@ from wand.color import Color
 from wand.drawing import Drawing
 from wand.image import Image as catimage
 
+from ..core.pool import load_font, run_in_process
 from .utils import _catutils
 
 MARGINS = [50, 150, 250, 350, 450]
 
 
+@run_in_process
 def asciiart(in_f, SC, GCF, out_f, color1, color2, bgcolor="black"):
     chars = np.asarray(list(" .,:irs?@9B&#"))
     font = ImageFont.load_default()
@@ -60,17 +62,18 @@ def get_warp_length(width):
     return int((20.0 / 1024.0) * (width + 0.0))
 
 
-async def cat_meme(CNG_FONTS, topString, bottomString, filename, endname):
+@run_in_process
+def cat_meme(CNG_FONTS, topString, bottomString, filename, endname):
     img = Image.open(filename)
     imageSize = img.size
     # find biggest font size that works
     fontSize = int(imageSize[1] / 5)
-    font = ImageFont.truetype(CNG_FONTS, fontSize)
+    font = load_font(CNG_FONTS, fontSize)
     topTextSize = font.getsize(topString)
     bottomTextSize = font.getsize(bottomString)
     while topTextSize[0] > imageSize[0] - 20 or bottomTextSize[0] > imageSize[0] - 20:
         fontSize -= 1
-        font = ImageFont.truetype(CNG_FONTS, fontSize)
+        font = load_font(CNG_FONTS, fontSize)
         topTextSize = font.getsize(topString)
         bottomTextSize = font.getsize(bottomString)
 
@@ -107,7 +110,8 @@ async def cat_meme(CNG_FONTS, topString, bottomString, filename, endname):
     img.save(endname)
 
 
-async def cat_meeme(upper_text, lower_text, CNG_FONTS, picture_name, endname):
+@run_in_process
+def cat_meeme(upper_text, lower_text, CNG_FONTS, picture_name, endname):
     main_image = catimage(filename=picture_name)
     main_image.resize(
         1024, int(((main_image.height * 1.0) / (main_image.width * 1.0)) * 1024.0)
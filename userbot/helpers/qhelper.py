@@ -10,18 +10,23 @@
 #    You should have received a copy of the GNU General Public License
 #    along with NiceGrill.  If not, see <https://www.gnu.org/licenses/>.
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
 import random
 import textwrap
 import urllib
+from functools import lru_cache
 
 import emoji
 from fontTools.ttLib import TTFont
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import Image, ImageDraw, ImageOps
 from telethon.tl import types
 
+from ..core import http
+from ..core.pool import load_font
 from .utils import _catutils
 
 # //Random colors for name
@@ -40,6 +45,13 @@ COLORS = [
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+SPECIAL_FONT = "./temp/ArialUnicodeMS.ttf"
+EMOJI_DIR = "./temp/emojis/"
+EMOJI_MAP_URL = "https://github.com/erenmetesar/modules-repo/raw/master/emojis.txt"
+
+_EMOJI_MAP = None
+_EMOJI_DOWNLOADS = {}
+
 
 def file_check(re=True, me=True, mo=True, it=True, fa=True, sp=True, go=False):
     regular = "./temp/Roboto-Regular.ttf"
@@ -91,13 +103,13 @@ def file_check(re=True, me=True, mo=True, it=True, fa=True, sp=True, go=False):
 async def process(msg, user, client, reply, event, replied=None):  # sourcery no-metrics
     file_check()
     # Importıng fonts and gettings the size of text
-    font = ImageFont.truetype("./temp/Roboto-Medium.ttf", 41, encoding="utf-16")
-    font2 = ImageFont.truetype("./temp/Roboto-Regular.ttf", 33, encoding="utf-16")
-    mono = ImageFont.truetype("./temp/DroidSansMono.ttf", 30, encoding="utf-16")
-    italic = ImageFont.truetype("./temp/Roboto-Italic.ttf", 33, encoding="utf-16")
-    fallback = ImageFont.truetype("./temp/Quivira.otf", 41, encoding="utf-16")
-    sepcialn = ImageFont.truetype("./temp/ArialUnicodeMS.ttf", 41, encoding="utf-16")
-    sepcialt = ImageFont.truetype("./temp/ArialUnicodeMS.ttf", 35, encoding="utf-16")
+    font = load_font("./temp/Roboto-Medium.ttf", 41, "utf-16")
+    font2 = load_font("./temp/Roboto-Regular.ttf", 33, "utf-16")
+    mono = load_font("./temp/DroidSansMono.ttf", 30, "utf-16")
+    italic = load_font("./temp/Roboto-Italic.ttf", 33, "utf-16")
+    fallback = load_font("./temp/Quivira.otf", 41, "utf-16")
+    sepcialn = load_font("./temp/ArialUnicodeMS.ttf", 41, "utf-16")
+    sepcialt = load_font("./temp/ArialUnicodeMS.ttf", 35, "utf-16")
 
     # Splitting text
     maxlength = 0
@@ -141,6 +153,7 @@ async def process(msg, user, client, reply, event, replied=None):  # sourcery no
     tot = f"{user.first_name} {lname}"
 
     namewidth = fallback.getsize(tot)[0] + 10
+    await prefetch_emojis(tot + msg)
 
     if namewidth > width:
         width = namewidth
@@ -276,13 +289,13 @@ async def process(msg, user, client, reply, event, replied=None):  # sourcery no
         y = 85
     # Writing User's Name
     space = pfpbg.width + 30
-    namefallback = ImageFont.truetype("./temp/Quivira.otf", 43, encoding="utf-16")
+    namefallback = load_font("./temp/Quivira.otf", 43, "utf-16")
     for letter in tot:
         if letter in emoji.UNICODE_EMOJI["en"]:
             newemoji, mask = await emoji_fetch(letter)
             canvas.paste(newemoji, (space, 24), mask)
             space += 40
-        elif await fontTest(letter):
+        elif has_glyph(letter):
             draw.text((space, 20), letter, font=sepcialn, fill=color)
             space += sepcialn.getsize(letter)[0]
 
@@ -299,7 +312,7 @@ async def process(msg, user, client, reply, event, replied=None):  # sourcery no
     bold, mono, italic, link = await get_entity(reply)
     index = 0
     emojicount = 0
-    textfallback = ImageFont.truetype("./temp/Quivira.otf", 38, encoding="utf-16")
+    textfallback = load_font("./temp/Quivira.otf", 38, "utf-16")
     for line in text:
         textcolor = "white"
         for letter in line:
@@ -308,34 +321,26 @@ async def process(msg, user, client, reply, event, replied=None):  # sourcery no
             )
             for offset, length in bold.items():
                 if index in range(offset, length):
-                    font2 = ImageFont.truetype(
-                        "./temp/Roboto-Medium.ttf", 38, encoding="utf-16"
-                    )
+                    font2 = load_font("./temp/Roboto-Medium.ttf", 38, "utf-16")
                     textcolor = "white"
             for offset, length in italic.items():
                 if index in range(offset, length):
-                    font2 = ImageFont.truetype(
-                        "./temp/Roboto-Italic.ttf", 38, encoding="utf-16"
-                    )
+                    font2 = load_font("./temp/Roboto-Italic.ttf", 38, "utf-16")
                     textcolor = "white"
             for offset, length in mono.items():
                 if index in range(offset, length):
-                    font2 = ImageFont.truetype(
-                        "./temp/DroidSansMono.ttf", 35, encoding="utf-16"
-                    )
+                    font2 = load_font("./temp/DroidSansMono.ttf", 35, "utf-16")
                     textcolor = "teal"
             for offset, length in link.items():
                 if index in range(offset, length):
-                    font2 = ImageFont.truetype(
-                        "./temp/Roboto-Regular.ttf", 35, encoding="utf-16"
-                    )
+                    font2 = load_font("./temp/Roboto-Regular.ttf", 35, "utf-16")
                     textcolor = "#59a7f6"
             if letter in emoji.UNICODE_EMOJI["en"]:
                 newemoji, mask = await emoji_fetch(letter)
                 canvas.paste(newemoji, (x, y - 2), mask)
                 x += 45
                 emojicount += 1
-            elif await fontTest(letter):
+            elif has_glyph(letter):
                 draw.text((x, y), letter, font=sepcialt, fill=textcolor)
                 x += sepcialt.getsize(letter)[0]
             else:
@@ -365,11 +370,24 @@ async def drawer(width, height):
     return top, middle, bottom
 
 
+@lru_cache(maxsize=None)
+def font_coverage(path):
+    "set of codepoints the font has glyphs for, read from its cmap only once"
+    font = TTFont(path, lazy=True)
+    try:
+        return frozenset(
+            code for table in font["cmap"].tables for code in table.cmap.keys()
+        )
+    finally:
+        font.close()
+
+
+def has_glyph(letter, path=SPECIAL_FONT):
+    return ord(letter) in font_coverage(path)
+
+
 async def fontTest(letter):
-    test = TTFont("./temp/ArialUnicodeMS.ttf")
-    for table in test["cmap"].tables:
-        if ord(letter) in table.cmap.keys():
-            return True
+    return has_glyph(letter)
 
 
 async def get_entity(msg):
@@ -397,7 +415,7 @@ async def get_entity(msg):
 
 
 async def catdoctype(name, size, htype, canvas):
-    font = ImageFont.truetype("./temp/Roboto-Medium.ttf", 38)
+    font = load_font("./temp/Roboto-Medium.ttf", 38)
     doc = Image.new("RGBA", (130, 130), (29, 29, 29, 255))
     draw = ImageDraw.Draw(doc)
     draw.ellipse((0, 0, 130, 130), fill="#434343")
@@ -417,28 +435,71 @@ async def no_photo(tot):
     color = random.choice(COLORS)
     pen.ellipse((0, 0, 90, 90), fill=color)
     letter = tot[0] if tot else ""
-    font = ImageFont.truetype("./temp/Roboto-Regular.ttf", 60)
+    font = load_font("./temp/Roboto-Regular.ttf", 60)
     pen.text((32, 17), letter, font=font, fill="white")
     return pfp, color
 
 
+async def emoji_map():
+    "emoji to sprite url map, fetched once and kept on disk across restarts"
+    global _EMOJI_MAP
+    if _EMOJI_MAP is None:
+        mapfile = os.path.join(EMOJI_DIR, "emojis.json")
+        if os.path.exists(mapfile):
+            with open(mapfile) as f:
+                _EMOJI_MAP = json.load(f)
+        else:
+            response = await http.get(EMOJI_MAP_URL, cache=86400)
+            response.raise_for_status()
+            _EMOJI_MAP = json.loads(response.text)
+            os.makedirs(EMOJI_DIR, exist_ok=True)
+            with open(f"{mapfile}.part", "w") as f:
+                json.dump(_EMOJI_MAP, f)
+            os.replace(f"{mapfile}.part", mapfile)
+    return _EMOJI_MAP
+
+
+async def emoji_sprite(emoji):
+    "path of the cached sprite for the emoji, downloading it on first use"
+    emojis = await emoji_map()
+    url = emojis.get(emoji) or emojis["⛔"]
+    path = os.path.join(EMOJI_DIR, f"{hashlib.md5(url.encode()).hexdigest()}.png")
+    if os.path.exists(path):
+        return path
+    task = _EMOJI_DOWNLOADS.get(path)
+    if task is None:
+        task = _EMOJI_DOWNLOADS[path] = asyncio.create_task(_download_sprite(url, path))
+    return await asyncio.shield(task)
+
+
+async def _download_sprite(url, path):
+    try:
+        response = await http.get(url)
+        response.raise_for_status()
+        os.makedirs(EMOJI_DIR, exist_ok=True)
+        # unique temp name, so concurrent quotes never read a half written file
+        with open(f"{path}.{id(response)}", "wb") as f:
+            f.write(response.content)
+        os.replace(f"{path}.{id(response)}", path)
+        return path
+    finally:
+        _EMOJI_DOWNLOADS.pop(path, None)
+
+
+async def prefetch_emojis(text):
+    "download all sprites used in text at once instead of one per letter"
+    found = {letter for letter in text if letter in emoji.UNICODE_EMOJI["en"]}
+    await asyncio.gather(*(emoji_sprite(letter) for letter in found))
+
+
 async def emoji_fetch(emoji):
-    emojis = json.loads(
-        urllib.request.urlopen(
-            "https://github.com/erenmetesar/modules-repo/raw/master/emojis.txt"
-        )
-        .read()
-        .decode()
-    )
-    if emoji in emojis:
-        img = emojis[emoji]
-        return await transparent(urllib.request.urlretrieve(img, "./temp/emoji.png")[0])
-    img = emojis["⛔"]
-    return await transparent(urllib.request.urlretrieve(img, "./temp/emoji.png")[0])
+    return await transparent(await emoji_sprite(emoji))
 
 
-async def transparent(emoji):
-    emoji = Image.open(emoji).convert("RGBA")
+@lru_cache(maxsize=256)
+def masked_sprite(path):
+    "40x40 rgba sprite with its round mask, shared between renders"
+    emoji = Image.open(path).convert("RGBA")
     emoji.thumbnail((40, 40))
 
     # Mask
@@ -448,17 +509,21 @@ async def transparent(emoji):
     return emoji, mask
 
 
+async def transparent(emoji):
+    return masked_sprite(emoji)
+
+
 async def replied_user(draw, tot, text, maxlength, title):
-    namefont = ImageFont.truetype("./temp/ArialUnicodeMS.ttf", 38)
-    namefallback = ImageFont.truetype("./temp/Quivira.otf", 38)
-    textfont = ImageFont.truetype("./temp/Roboto-Regular.ttf", 32)
-    textfallback = ImageFont.truetype("./temp/Roboto-Medium.ttf", 38)
+    namefont = load_font("./temp/ArialUnicodeMS.ttf", 38)
+    namefallback = load_font("./temp/Quivira.otf", 38)
+    textfont = load_font("./temp/Roboto-Regular.ttf", 32)
+    textfallback = load_font("./temp/Roboto-Medium.ttf", 38)
     maxlength = maxlength + 7 if maxlength < 10 else maxlength
     text = f"{text[:maxlength - 2]}.." if len(text) > maxlength else text
     draw.line((165, 90, 165, 170), width=5, fill="white")
     space = 0
     for letter in tot:
-        if not await fontTest(letter):
+        if not has_glyph(letter):
             draw.text((180 + space, 86), letter, font=namefallback, fill="#888888")
             space += namefallback.getsize(letter)[0]
         else:
@@ -466,7 +531,7 @@ async def replied_user(draw, tot, text, maxlength, title):
             space += namefont.getsize(letter)[0]
     space = 0
     for letter in text:
-        if not await fontTest(letter):
+        if not has_glyph(letter):
             draw.text((180 + space, 132), letter, font=textfallback, fill="#888888")
             space += textfallback.getsize(letter)[0]
         else:
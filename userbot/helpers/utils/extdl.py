@@ -7,12 +7,119 @@
 # Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
+import ast
+import importlib.util
+import sys
 from subprocess import PIPE, Popen
 
+# import name -> pip package, for the ones that differ
+PIP_NAMES = {
+    "PIL": "Pillow",
+    "bs4": "beautifulsoup4",
+    "cv2": "opencv-python-headless",
+    "google": "google-auth",
+    "googleapiclient": "google-api-python-client",
+    "google_auth_oauthlib": "google-auth-oauthlib",
+    "fitz": "PyMuPDF",
+    "github": "PyGithub",
+    "speedtest": "speedtest-cli",
+    "barcode": "python-barcode",
+    "dateutil": "python-dateutil",
+    "magic": "python-magic",
+    "git": "GitPython",
+    "Crypto": "pycryptodome",
+    # forks pinned in requirements.txt
+    "telethon": "git+https://github.com/Jisan09/Telethon@test",
+    "googletrans": "git+https://github.com/sandy1709/py-googletrans",
+    "search_engine_parser": "git+https://github.com/Jisan09/search-engine-parser",
+    "wikipedia": "git+https://github.com/goldsmith/Wikipedia",
+    "youtubesearchpython": "git+https://github.com/alexmercerind/youtube-search-python",
+    "yt_dlp": "git+https://github.com/yt-dlp/yt-dlp",
+}
+
 
 def install_pip(pipfile):
-    print(f"installing {pipfile}")
-    pip_cmd = ["pip", "install", f"{pipfile}"]
+    "pip install one package, or several at once when given a list"
+    pipfiles = [pipfile] if isinstance(pipfile, str) else list(pipfile)
+    print(f"installing {' '.join(pipfiles)}")
+    pip_cmd = ["pip", "install", *pipfiles]
     process = Popen(pip_cmd, stdout=PIPE, stderr=PIPE)
     stdout, stderr = process.communicate()
     return stdout
+
+
+def _guarded_imports(tree):
+    "imports inside try blocks that handle ImportError, they are optional"
+    guarded = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Try):
+            continue
+        for handler in node.handlers:
+            names = [handler.type]
+            if isinstance(handler.type, ast.Tuple):
+                names = handler.type.elts
+            if any(
+                name is None
+                or isinstance(name, ast.Name)
+                and name.id in ("ImportError", "ModuleNotFoundError", "Exception")
+                for name in names
+            ):
+                guarded.update(
+                    id(child) for stmt in node.body for child in ast.walk(stmt)
+                )
+                break
+    return guarded
+
+
+def missing_modules(files):
+    "absolute imports of the given sources that aren't installed, without importing"
+    missing = set()
+    for path in files:
+        try:
+            with open(path) as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError):
+            continue
+        guarded = _guarded_imports(tree)
+        for node in ast.walk(tree):
+            if id(node) in guarded:
+                continue
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                top = name.split(".")[0]
+                if top in missing or top in sys.modules or top == "userbot":
+                    continue
+                try:
+                    if importlib.util.find_spec(top) is None:
+                        missing.add(top)
+                except (ImportError, ValueError):
+                    missing.add(top)
+    return missing
+
+
+def _installed(name):
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def install_missing(files):
+    """
+    install everything the given plugins import but is missing in one pip call.
+    pip gives up on the whole batch when one name isn't a real package, so
+    whatever is still missing after it is retried one by one.
+    """
+    if not (missing := missing_modules(files)):
+        return missing
+    install_pip(sorted({PIP_NAMES.get(name, name) for name in missing}))
+    importlib.invalidate_caches()
+    for name in sorted(name for name in missing if not _installed(name)):
+        install_pip(PIP_NAMES.get(name, name))
+        importlib.invalidate_caches()
+    return {name for name in missing if _installed(name)}
@@ -12,6 +12,7 @@ import json
 import requests
 
 from ...Config import Config
+from ...core import http
 from ...core.logger import logging
 
 LOGS = logging.getLogger("CatUserbot")
@@ -29,7 +30,7 @@ async def p_paste(message, extension=None):
     siteurl = "https://pasty.lus.pm/api/v1/pastes"
     data = {"content": message}
     try:
-        response = requests.post(url=siteurl, data=json.dumps(data), headers=headers)
+        response = await http.post(siteurl, data=json.dumps(data), headers=headers)
     except Exception as e:
         return {"error": str(e)}
     if response.ok:
@@ -62,7 +63,7 @@ async def s_paste(message, extension="txt"):
     """
     siteurl = "https://spaceb.in/api/v1/documents/"
     try:
-        response = requests.post(
+        response = await http.post(
             siteurl, data={"content": message, "extension": extension}
         )
     except Exception as e:
@@ -109,7 +110,7 @@ async def n_paste(message, extension=None):
     siteurl = "https://nekobin.com/api/documents"
     data = {"content": message}
     try:
-        response = requests.post(url=siteurl, data=json.dumps(data), headers=headers)
+        response = await http.post(siteurl, data=json.dumps(data), headers=headers)
     except Exception as e:
         return {"error": str(e)}
     if response.ok:
@@ -134,7 +135,7 @@ async def d_paste(message, extension=None):
     siteurl = "http://catbin.up.railway.app/documents"
     data = {"content": message}
     try:
-        response = requests.post(url=siteurl, data=json.dumps(data), headers=headers)
+        response = await http.post(siteurl, data=json.dumps(data), headers=headers)
     except Exception as e:
         return {"error": str(e)}
     if response.ok:
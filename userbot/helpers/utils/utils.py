@@ -9,21 +9,24 @@
 
 import asyncio
 import functools
-import shlex
+import os
+import tempfile
+import time
+from collections import deque
 from typing import Tuple
 
 from ...core.logger import logging
+from ...core.procs import spawn
 
 LOGS = logging.getLogger(__name__)
 
 
 # executing of terminal commands
 async def runcmd(cmd: str) -> Tuple[str, str, int, int]:
-    args = shlex.split(cmd)
-    process = await asyncio.create_subprocess_exec(
-        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
+    async with spawn(
+        cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    ) as process:
+        stdout, stderr = await process.communicate()
     return (
         stdout.decode("utf-8", "replace").strip(),
         stderr.decode("utf-8", "replace").strip(),
@@ -32,6 +35,93 @@ async def runcmd(cmd: str) -> Tuple[str, str, int, int]:
     )
 
 
+class StreamResult:
+    """
+    Output of stream_cmd. text holds the whole output when it stayed under
+    the spill size, otherwise file is the path of a temp file with all of it.
+    tail is always the last part of the output.
+    """
+
+    def __init__(self, text, file, tail, returncode, pid):
+        self.text = text
+        self.file = file
+        self.tail = tail
+        self.returncode = returncode
+        self.pid = pid
+
+
+async def stream_cmd(
+    cmd: str,
+    on_update=None,
+    interval: float = 3,
+    tail_size: int = 3000,
+    spill_size: int = 1 << 20,
+    shell: bool = True,
+) -> StreamResult:
+    """
+    Run a command and read its merged stdout and stderr as it comes.
+    on_update(tail) is awaited at most every interval seconds with the last
+    tail_size characters. Past spill_size bytes the output goes to a temp
+    file, so memory stays flat however much the command prints.
+    """
+    head = bytearray()
+    tail = deque()
+    tail_len = 0
+    spill = None
+    last_update = time.monotonic()
+    async with spawn(
+        cmd,
+        shell=shell,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    ) as process:
+        try:
+            while chunk := await process.stdout.read(65536):
+                if spill is None and len(head) + len(chunk) > spill_size:
+                    spill = tempfile.NamedTemporaryFile(
+                        "wb", prefix="catcmd_", suffix=".txt", delete=False
+                    )
+                    spill.write(head)
+                    head = None
+                if spill is None:
+                    head += chunk
+                else:
+                    spill.write(chunk)
+                tail.append(chunk)
+                tail_len += len(chunk)
+                while tail_len - len(tail[0]) >= tail_size:
+                    tail_len -= len(tail.popleft())
+                if (
+                    on_update is not None
+                    and time.monotonic() - last_update >= interval
+                ):
+                    last_update = time.monotonic()
+                    try:
+                        await on_update(_tail_text(tail, tail_size))
+                    except Exception as e:
+                        LOGS.debug(f"live output update failed: {e}")
+            await process.wait()
+        except BaseException:
+            # spawn kills the process, only the spill file is ours to clean
+            if spill is not None:
+                spill.close()
+                os.remove(spill.name)
+            raise
+    if spill is not None:
+        spill.close()
+    return StreamResult(
+        None if spill else head.decode("utf-8", "replace").strip(),
+        spill.name if spill else None,
+        _tail_text(tail, tail_size),
+        process.returncode,
+        process.pid,
+    )
+
+
+def _tail_text(chunks, size):
+    return b"".join(chunks)[-size:].decode("utf-8", "replace").strip()
+
+
 def run_sync(func, *args, **kwargs):
     return asyncio.get_event_loop().run_in_executor(
         None, functools.partial(func, *args, **kwargs)
@@ -16,6 +16,7 @@ from userbot import catub
 
 from ..Config import Config
 from ..core.logger import logging
+from ..core.logship import logshipper
 from ..core.managers import edit_delete, edit_or_reply
 from ..helpers.tools import media_type
 from ..helpers.utils import _format
@@ -154,7 +155,7 @@ async def on_afk(event):  # sourcery no-metrics
             return
         full = None
         try:
-            full = await event.client.get_entity(event.message.from_id)
+            full = await event.get_sender()
         except Exception as e:
             LOGS.info(str(e))
         messaget = await media_type(event)
@@ -167,12 +168,7 @@ async def on_afk(event):  # sourcery no-metrics
             resalt += f"\n<b>Message : </b>{event.message.message}"
         resalt += f"\n<b>Message link: </b><a href = 'https://t.me/c/{hmm.id}/{event.message.id}'> link</a>"
         if not event.is_private:
-            await event.client.send_message(
-                Config.PM_LOGGER_GROUP_ID,
-                resalt,
-                parse_mode="html",
-                link_preview=False,
-            )
+            logshipper.notice(event.client, Config.PM_LOGGER_GROUP_ID, resalt)
 
 
 @catub.cat_cmd(
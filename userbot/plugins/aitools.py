@@ -103,7 +103,7 @@ async def gen_txt(event):
         return await edit_delete(event, "`What should I do ??`")
 
     catevent = await edit_or_reply(event, "`Generating ai response ...`")
-    if generated_text := catai.get_response(query):
+    if generated_text := await catai.get_response(query):
         await edit_or_reply(catevent, generated_text)
     else:
         await edit_delete(catevent, "`Sorry, unable to generate response`")
@@ -7,13 +7,11 @@
 # Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
-import json
-
 from bs4 import BeautifulSoup
-from requests import get
 
 from userbot import catub
 
+from ..core import http
 from ..core.managers import edit_delete, edit_or_reply
 
 plugin_category = "extra"
@@ -38,7 +36,7 @@ async def kakashi(event):
 
     releases = "**Latest Magisk Releases**\n\n"
     for name, release_url in magisk_dict.items():
-        data = get(release_url).json()
+        data = (await http.get(release_url, cache=True)).json()
         releases += (
             f'{name}: [APK v{data["magisk"]["version"]}]({data["magisk"]["link"]}) | '
             f'[Changelog]({data["magisk"]["note"]})\n'
@@ -64,12 +62,13 @@ async def device_info(event):
             codename = textx.text
         else:
             return await edit_delete(event, "`Usage: .device <codename> / <model>`")
-    data = json.loads(
-        get(
+    data = (
+        await http.get(
             "https://raw.githubusercontent.com/androidtrackers/"
-            "certified-android-devices/master/by_device.json"
-        ).text
-    )
+            "certified-android-devices/master/by_device.json",
+            cache=True,
+        )
+    ).json()
     if results := data.get(codename.lower()):
         reply = f"**Search results for `{codename.lower()}` :**\n\n"
         for item in results:
@@ -105,12 +104,13 @@ async def codename_info(event):
     else:
         return await edit_delete(event, "`Usage: .codename <brand> <device>`")
 
-    data = json.loads(
-        get(
+    data = (
+        await http.get(
             "https://raw.githubusercontent.com/androidtrackers/"
-            "certified-android-devices/master/by_brand.json"
-        ).text
-    )
+            "certified-android-devices/master/by_brand.json",
+            cache=True,
+        )
+    ).json()
     devices_lower = {k.lower(): v for k, v in data.items()}
     devices = devices_lower.get(brand)
     if not devices:
@@ -153,7 +153,7 @@ async def twrp(event):
         device = textx.text.split(" ")[0]
     else:
         return await edit_delete(event, "`Usage: .twrp <codename>`")
-    url = get(f"https://dl.twrp.me/{device}/")
+    url = await http.get(f"https://dl.twrp.me/{device}/", cache=True)
     if url.status_code == 404:
         reply = f"`Couldn't find twrp downloads for {device}!`\n"
         return await edit_delete(event, reply)
@@ -17,7 +17,6 @@ from urllib.parse import quote_plus
 
 import aiohttp
 import bs4
-import requests
 from jikanpy import Jikan
 from jikanpy.exceptions import APIException
 from pySmartDL import SmartDL
@@ -25,6 +24,7 @@ from telegraph import exceptions, upload_file
 
 from userbot import Convert, catub
 
+from ..core import http
 from ..core.managers import edit_delete, edit_or_reply
 from ..helpers import media_type, readable_time, reply_id, time_formatter
 from ..helpers.functions import (
@@ -69,7 +69,7 @@ plugin_category = "extra"
     },
 )
 async def anime_quote(event):
-    data = requests.get("https://animechan.vercel.app/api/random").json()
+    data = (await http.get("https://animechan.vercel.app/api/random")).json()
     anime = data["anime"]
     character = data["character"]
     quote = data["quote"]
@@ -200,8 +200,11 @@ async def anilist(event):
     if not search:
         return await edit_delete(event, "__which anime results should i fetch__")
     variables = {"search": search}
-    response = requests.post(
-        anilistapiurl, json={"query": airing_query, "variables": variables}
+    # not cached, the time until airing changes every second
+    response = (
+        await http.post(
+            anilistapiurl, json={"query": airing_query, "variables": variables}
+        )
     ).json()["data"]["Media"]
     if response is None:
         return await edit_delete(event, "__Unable to find the anime.__")
@@ -321,7 +324,7 @@ async def anilist(event):  # sourcery no-metrics
         await catevent.delete()
         os.remove(anime_path)
     except BaseException:
-        image = getBannerLink(first_mal_id, True)
+        image = await getBannerLink(first_mal_id, True)
         await event.client.send_file(
             event.chat_id,
             file=image,
@@ -437,7 +440,7 @@ async def anilist(event):  # sourcery no-metrics
         await catevent.delete()
         os.remove(anime_path)
     except BaseException:
-        image = getBannerLink(first_mal_id, True)
+        image = await getBannerLink(first_mal_id, True)
         await event.client.send_file(
             event.chat_id,
             file=image,
@@ -680,7 +683,7 @@ async def anime_download(event):  # sourcery no-metrics
     search_query = search_query.replace(" ", "+")
     if input_str == "kaizoku":
         search_url = f"https://animekaizoku.com/?s={search_query}"
-        html_text = requests.get(search_url, headers=headers).text
+        html_text = (await http.get(search_url, headers=headers, cache=True)).text
         soup = bs4.BeautifulSoup(html_text, "html.parser")
         if search_result := soup.find_all("h2", {"class": "post-title"}):
             result = f"<a href={search_url}>Click Here For More Results</a> <b>of</b> <code>{html.escape(search_query)}</code> <b>on</b> <code>AnimeKaizoku</code>: \n\n"
@@ -692,7 +695,7 @@ async def anime_download(event):  # sourcery no-metrics
             result = f"<b>No result found for</b> <code>{html.escape(search_query)}</code> <b>on</b> <code>AnimeKaizoku</code>"
     elif input_str == "kayo":
         search_url = f"https://animekayo.com/?s={search_query}"
-        html_text = requests.get(search_url, headers=headers).text
+        html_text = (await http.get(search_url, headers=headers, cache=True)).text
         soup = bs4.BeautifulSoup(html_text, "html.parser")
         search_result = soup.find_all("h2", {"class": "title"})
         result = f"<a href={search_url}>Click Here For More Results</a> <b>of</b> <code>{html.escape(search_query)}</code> <b>on</b> <code>AnimeKayo</code>: \n\n"
@@ -708,7 +711,7 @@ async def anime_download(event):  # sourcery no-metrics
             result = f"<b>No result found for</b> <code>{html.escape(search_query)}</code> <b>on</b> <code>AnimeKayo</code>"
     elif input_str == "indi":
         search_url = f"https://indianime.com/?s={search_query}"
-        html_text = requests.get(search_url, headers=headers).text
+        html_text = (await http.get(search_url, headers=headers, cache=True)).text
         soup = bs4.BeautifulSoup(html_text, "html.parser")
         search_result = soup.find_all("h1", {"class": "elementor-post__title"})
         result = f"<a href={search_url}>Click Here For More Results</a> <b>of</b> <code>{html.escape(search_query)}</code> <b>on</b> <code>indianime</code>: \n\n"
@@ -8,112 +8,200 @@
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
 import asyncio
+import contextlib
 import io
 import os
+import re
 import time
 import zipfile
 from datetime import datetime
 from pathlib import Path
 from tarfile import is_tarfile
-from tarfile import open as tar_open
 
 from telethon import types
 from telethon.utils import get_extension
 
 from ..Config import Config
+from ..helpers import humanbytes
+from ..helpers.functions.archivetools import (
+    ARCHIVE_EXTS,
+    ArchiveProgress,
+    extract_stream,
+    make_archive,
+)
 from . import catub, edit_delete, edit_or_reply, progress
 
 thumb_image_path = os.path.join(Config.TMP_DOWNLOAD_DIRECTORY, "thumb_image.jpg")
 plugin_category = "misc"
 
+ARCHIVE_FLAGS = re.compile(r"^((?:-(?:gz|xz|zst|u|\d{1,2})\s+)*)([\s\S]*)$")
+
+
+def parse_flags(text):
+    "(format, level, upload, path) out of '-zst -19 -u path'"
+    flags, path = ARCHIVE_FLAGS.match(text.strip()).groups()
+    fmt, level, upload = None, None, False
+    for flag in flags.split():
+        flag = flag[1:]
+        if flag.isdigit():
+            level = int(flag)
+        elif flag == "u":
+            upload = True
+        else:
+            fmt = flag
+    return fmt, level, upload, path.strip()
+
+
+async def show_status(mone, archive_progress, action):
+    "edit the status message every few seconds while the worker thread runs"
+    while True:
+        await asyncio.sleep(5)
+        with contextlib.suppress(Exception):
+            await mone.edit(
+                f"`{action}....`\n\n**Files :** `{archive_progress.files}`\
+                \n**Size :** `{humanbytes(archive_progress.bytes)}`"
+            )
+
+
+async def pack(event, input_str, fmt, level, action):
+    input_str = input_str.strip()
+    if not input_str:
+        return await edit_delete(event, "`Provide file path to compress`")
+    if not os.path.exists(Path(input_str)):
+        return await edit_or_reply(
+            event,
+            f"There is no such directory or file with the name `{input_str}` check again",
+        )
+    mone = await edit_or_reply(event, f"`{action} in progress....`")
+    start = datetime.now()
+    filepath = os.path.join(
+        Config.TMP_DOWNLOAD_DIRECTORY, os.path.basename(Path(input_str).resolve())
+    )
+    destination = f"{filepath}{ARCHIVE_EXTS[fmt]}"
+    archive_progress = ArchiveProgress()
+    status = asyncio.create_task(show_status(mone, archive_progress, action))
+    try:
+        await make_archive(input_str, destination, fmt, level, archive_progress)
+    except Exception as e:
+        return await edit_delete(mone, f"**Error:**\n__{e}__")
+    finally:
+        status.cancel()
+    end = datetime.now()
+    ms = (end - start).seconds
+    return mone, destination, ms
+
+
+async def download_archive(event, reply, mone):
+    filename = None
+    for attr in getattr(reply.document, "attributes", []):
+        if isinstance(attr, types.DocumentAttributeFilename):
+            filename = attr.file_name
+    filename = os.path.join(Config.TMP_DOWNLOAD_DIRECTORY, filename or "archive")
+    c_time = time.time()
+    try:
+        with io.FileIO(filename, "w") as dl:
+            await event.client.fast_download_file(
+                location=reply.document,
+                out=dl,
+                progress_callback=lambda d, t: asyncio.get_event_loop().create_task(
+                    progress(d, t, mone, c_time, "trying to download")
+                ),
+            )
+    except Exception as e:
+        await edit_delete(mone, f"**Error:**\n__{e}__")
+        return None
+    return filename
+
 
-def zipdir(dirName):
-    filePaths = []
-    for root, directories, files in os.walk(dirName):
-        for filename in files:
-            filePath = os.path.join(root, filename)
-            filePaths.append(filePath)
-    return filePaths
+async def unpack(event, mone, archive, destination, upload):
+    """
+    Extract in a worker thread. With upload every file is sent and removed
+    as soon as it is out, instead of waiting for the whole archive.
+    """
+    archive_progress = ArchiveProgress()
+    action = "Unpacking and uploading" if upload else "Unpacking"
+    status = asyncio.create_task(show_status(mone, archive_progress, action))
+    try:
+        async for path, name in extract_stream(archive, destination, archive_progress):
+            if not upload:
+                continue
+            await event.client.send_file(
+                event.chat_id,
+                path,
+                caption=f"`{name}`",
+                force_document=True,
+                thumb=thumb_image_path if os.path.exists(thumb_image_path) else None,
+                reply_to=event.reply_to_msg_id,
+            )
+            os.remove(path)
+    except Exception as e:
+        await edit_delete(mone, f"**Error:**\n__{e}__")
+        return False
+    finally:
+        status.cancel()
+    return True
 
 
 @catub.cat_cmd(
     pattern="zip(?:\s|$)([\s\S]*)",
     command=("zip", plugin_category),
+    job="archive",
     info={
         "header": "To compress the file/folders",
         "description": "Will create a zip file for the given file path or folder path",
+        "flags": {
+            "-1 to -9": "compression level, 6 by default",
+        },
         "usage": [
             "{tr}zip <file/folder path>",
+            "{tr}zip -9 <file/folder path>",
         ],
         "examples": ["{tr}zip downloads", "{tr}zip sample_config.py"],
     },
 )
 async def zip_file(event):
     "To create zip file"
-    input_str = event.pattern_match.group(1)
-    if not input_str:
-        return await edit_delete(event, "`Provide file path to zip`")
-    start = datetime.now()
-    if not os.path.exists(Path(input_str)):
-        return await edit_or_reply(
-            event,
-            f"There is no such directory or file with the name `{input_str}` check again",
-        )
-    if os.path.isfile(Path(input_str)):
-        return await edit_delete(event, "`File compressing is not implemented yet`")
-    mone = await edit_or_reply(event, "`Zipping in progress....`")
-    filePaths = zipdir(input_str)
-    filepath = os.path.join(
-        Config.TMP_DOWNLOAD_DIRECTORY, os.path.basename(Path(input_str))
-    )
-    zip_file = zipfile.ZipFile(f"{filepath}.zip", "w")
-    with zip_file:
-        for file in filePaths:
-            zip_file.write(file)
-    end = datetime.now()
-    ms = (end - start).seconds
+    _, level, _, input_str = parse_flags(event.pattern_match.group(1))
+    result = await pack(event, input_str, "zip", level, "Zipping")
+    if not isinstance(result, tuple):
+        return
+    mone, destination, ms = result
     await mone.edit(
-        f"Zipped the path `{input_str}` into `{filepath}.zip` in __{ms}__ Seconds"
+        f"Zipped the path `{input_str}` into `{destination}` in __{ms}__ Seconds"
     )
 
 
 @catub.cat_cmd(
     pattern="tar(?:\s|$)([\s\S]*)",
     command=("tar", plugin_category),
+    job="archive",
     info={
         "header": "To compress the file/folders to tar file",
         "description": "Will create a tar file for the given file path or folder path",
+        "flags": {
+            "-gz": "gzip compressed tar, the default",
+            "-xz": "xz compressed tar, smaller but slower",
+            "-zst": "zstd compressed tar, uses all cores",
+            "-<level>": "compression level, 1-9 for gz/xz and 1-22 for zst",
+        },
         "usage": [
             "{tr}tar <file/folder path>",
+            "{tr}tar -zst -19 <file/folder path>",
+        ],
+        "examples": [
+            "{tr}tar downloads",
+            "{tr}tar sample_config.py",
+            "{tr}tar -xz -9 downloads",
         ],
-        "examples": ["{tr}tar downloads", "{tr}tar sample_config.py"],
     },
 )
 async def tar_file(event):
     "To create tar file"
-    input_str = event.pattern_match.group(1)
-    if not input_str:
-        return await edit_delete(event, "`Provide file path to compress`")
-    if not os.path.exists(Path(input_str)):
-        return await edit_or_reply(
-            event,
-            f"There is no such directory or file with the name `{input_str}` check again",
-        )
-    if os.path.isfile(Path(input_str)):
-        return await edit_delete(event, "`File compressing is not implemented yet`")
-    mone = await edit_or_reply(event, "`Tar creation in progress....`")
-    start = datetime.now()
-    filePaths = zipdir(input_str)
-    filepath = os.path.join(
-        Config.TMP_DOWNLOAD_DIRECTORY, os.path.basename(Path(input_str))
-    )
-    destination = f"{filepath}.tar.gz"
-    zip_file = tar_open(destination, "w:gz")
-    with zip_file:
-        for file in filePaths:
-            zip_file.add(file)
-    end = datetime.now()
-    ms = (end - start).seconds
+    fmt, level, _, input_str = parse_flags(event.pattern_match.group(1))
+    result = await pack(event, input_str, fmt or "gz", level, "Tar creation")
+    if not isinstance(result, tuple):
+        return
+    mone, destination, ms = result
     await mone.edit(
         f"Created a tar file for the given path {input_str} as `{destination}` in __{ms}__ Seconds"
     )
@@ -122,173 +210,133 @@ async def tar_file(event):
 @catub.cat_cmd(
     pattern="unzip(?:\s|$)([\s\S]*)",
     command=("unzip", plugin_category),
+    job="archive",
     info={
         "header": "To unpack the given zip file",
         "description": "Reply to a zip file or provide zip file path with command to unzip the given file",
+        "flags": {
+            "-u": "upload every file while unpacking and delete it after",
+        },
         "usage": [
             "{tr}unzip <reply/file path>",
+            "{tr}unzip -u <reply/file path>",
         ],
     },
 )
 async def zip_file(event):  # sourcery no-metrics
     # sourcery skip: low-code-quality
     "To unpack the zip file"
-    if input_str := event.pattern_match.group(1):
+    _, _, upload, input_str = parse_flags(event.pattern_match.group(1))
+    if input_str:
         path = Path(input_str)
-        if os.path.exists(path):
-            start = datetime.now()
-            if not zipfile.is_zipfile(path):
-                return await edit_delete(
-                    event, f"`The Given path {path} is not zip file to unpack`"
-                )
-
-            mone = await edit_or_reply(event, "`Unpacking....`")
-            destination = os.path.join(
-                Config.TMP_DOWNLOAD_DIRECTORY,
-                os.path.splitext(os.path.basename(path))[0],
-            )
-            with zipfile.ZipFile(path, "r") as zip_ref:
-                zip_ref.extractall(destination)
-            end = datetime.now()
-            ms = (end - start).seconds
-            await mone.edit(
-                f"unzipped and stored to `{destination}` \n**Time Taken :** `{ms} seconds`"
+        if not os.path.exists(path):
+            return await edit_delete(event, f"I can't find that path `{input_str}`", 10)
+        start = datetime.now()
+        if not zipfile.is_zipfile(path):
+            return await edit_delete(
+                event, f"`The Given path {path} is not zip file to unpack`"
             )
-        else:
-            await edit_delete(event, f"I can't find that path `{input_str}`", 10)
+        mone = await edit_or_reply(event, "`Unpacking....`")
+        filename = str(path)
     elif event.reply_to_msg_id:
         start = datetime.now()
         reply = await event.get_reply_message()
-        ext = get_extension(reply.document)
-        if ext != ".zip":
+        if not reply.document or get_extension(reply.document) != ".zip":
             return await edit_delete(
                 event,
                 "`The replied file is not a zip file recheck the replied message`",
             )
         mone = await edit_or_reply(event, "`Unpacking....`")
-        for attr in getattr(reply.document, "attributes", []):
-            if isinstance(attr, types.DocumentAttributeFilename):
-                filename = attr.file_name
-        filename = os.path.join(Config.TMP_DOWNLOAD_DIRECTORY, filename)
-        c_time = time.time()
-        try:
-            dl = io.FileIO(filename, "a")
-            await event.client.fast_download_file(
-                location=reply.document,
-                out=dl,
-                progress_callback=lambda d, t: asyncio.get_event_loop().create_task(
-                    progress(d, t, mone, c_time, "trying to download")
-                ),
-            )
-            dl.close()
-        except Exception as e:
-            return await edit_delete(mone, f"**Error:**\n__{e}__")
+        filename = await download_archive(event, reply, mone)
+        if filename is None:
+            return
         await mone.edit("`Download finished Unpacking now`")
-        destination = os.path.join(
-            Config.TMP_DOWNLOAD_DIRECTORY,
-            os.path.splitext(os.path.basename(filename))[0],
-        )
-        with zipfile.ZipFile(filename, "r") as zip_ref:
-            zip_ref.extractall(destination)
-        end = datetime.now()
-        ms = (end - start).seconds
-        await mone.edit(
-            f"unzipped and stored to `{destination}` \n**Time Taken :** `{ms} seconds`"
-        )
-        os.remove(filename)
     else:
-        await edit_delete(
-            mone,
+        return await edit_delete(
+            event,
             "`Either reply to the zipfile or provide path of zip file along with command`",
         )
+    destination = os.path.join(
+        Config.TMP_DOWNLOAD_DIRECTORY,
+        os.path.splitext(os.path.basename(filename))[0],
+    )
+    done = await unpack(event, mone, filename, destination, upload)
+    if not input_str:
+        os.remove(filename)
+    if not done:
+        return
+    end = datetime.now()
+    ms = (end - start).seconds
+    if upload:
+        return await edit_delete(mone, f"`Unpacked and uploaded in {ms} seconds`")
+    await mone.edit(
+        f"unzipped and stored to `{destination}` \n**Time Taken :** `{ms} seconds`"
+    )
 
 
 @catub.cat_cmd(
     pattern="untar(?:\s|$)([\s\S]*)",
     command=("untar", plugin_category),
+    job="archive",
     info={
         "header": "To unpack the given tar file",
-        "description": "Reply to a tar file or provide tar file path with command to unpack the given tar file",
+        "description": "Reply to a tar file or provide tar file path with command to unpack the given tar file. gz, xz, bz2 and zst tars are supported.",
+        "flags": {
+            "-u": "upload every file while unpacking and delete it after",
+        },
         "usage": [
             "{tr}untar <reply/file path>",
+            "{tr}untar -u <reply/file path>",
         ],
     },
 )
 async def untar_file(event):  # sourcery no-metrics
     # sourcery skip: low-code-quality
     "To unpack the tar file"
-    if input_str := event.pattern_match.group(1):
+    _, _, upload, input_str = parse_flags(event.pattern_match.group(1))
+    if input_str:
         path = Path(input_str)
-        if os.path.exists(path):
-            start = datetime.now()
-            if not is_tarfile(path):
-                return await edit_delete(
-                    event, f"`The Given path {path} is not tar file to unpack`"
-                )
-
-            mone = await edit_or_reply(event, "`Unpacking....`")
-            destination = os.path.join(
-                Config.TMP_DOWNLOAD_DIRECTORY, (os.path.basename(path).split("."))[0]
-            )
-            if not os.path.exists(destination):
-                os.mkdir(destination)
-            file = tar_open(path)
-            # extracting file
-            file.extractall(destination)
-            file.close()
-            end = datetime.now()
-            ms = (end - start).seconds
-            await mone.edit(
-                f"**Time Taken :** `{ms} seconds`\
-                \nUnpacked the input path `{input_str}` and stored to `{destination}`"
+        if not os.path.exists(path):
+            return await edit_delete(event, f"I can't find that path `{input_str}`", 10)
+        start = datetime.now()
+        if not is_tarfile(path) and not str(path).endswith(ARCHIVE_EXTS["zst"]):
+            return await edit_delete(
+                event, f"`The Given path {path} is not tar file to unpack`"
             )
-        else:
-            await edit_delete(event, f"I can't find that path `{input_str}`", 10)
+        mone = await edit_or_reply(event, "`Unpacking....`")
+        filename = str(path)
     elif event.reply_to_msg_id:
         start = datetime.now()
         reply = await event.get_reply_message()
         mone = await edit_or_reply(event, "`Unpacking....`")
-        for attr in getattr(reply.document, "attributes", []):
-            if isinstance(attr, types.DocumentAttributeFilename):
-                filename = attr.file_name
-        filename = os.path.join(Config.TMP_DOWNLOAD_DIRECTORY, filename)
-        c_time = time.time()
-        try:
-            dl = io.FileIO(filename, "a")
-            await event.client.fast_download_file(
-                location=reply.document,
-                out=dl,
-                progress_callback=lambda d, t: asyncio.get_event_loop().create_task(
-                    progress(d, t, mone, c_time, "trying to download")
-                ),
-            )
-            dl.close()
-        except Exception as e:
-            return await edit_delete(mone, f"**Error:**\n__{e}__")
-        if not is_tarfile(filename):
+        filename = await download_archive(event, reply, mone)
+        if filename is None:
+            return
+        if not is_tarfile(filename) and not filename.endswith(ARCHIVE_EXTS["zst"]):
+            os.remove(filename)
             return await edit_delete(
                 mone, "`The replied file is not tar file to unpack it recheck it`"
             )
         await mone.edit("`Download finished Unpacking now`")
-        destination = os.path.join(
-            Config.TMP_DOWNLOAD_DIRECTORY, (os.path.basename(filename).split("."))[0]
-        )
-
-        if not os.path.exists(destination):
-            os.mkdir(destination)
-        file = tar_open(filename)
-        # extracting file
-        file.extractall(destination)
-        file.close()
-        end = datetime.now()
-        ms = (end - start).seconds
-        await mone.edit(
-            f"**Time Taken :** `{ms} seconds`\
-                \nUnpacked the replied file and stored to `{destination}`"
-        )
-        os.remove(filename)
     else:
-        await edit_delete(
-            mone,
+        return await edit_delete(
+            event,
             "`Either reply to the tarfile or provide path of tarfile along with command`",
         )
+    destination = os.path.join(
+        Config.TMP_DOWNLOAD_DIRECTORY, (os.path.basename(filename).split("."))[0]
+    )
+    done = await unpack(event, mone, filename, destination, upload)
+    if not input_str:
+        os.remove(filename)
+    if not done:
+        return
+    end = datetime.now()
+    ms = (end - start).seconds
+    if upload:
+        return await edit_delete(mone, f"`Unpacked and uploaded in {ms} seconds`")
+    source = f"input path `{input_str}`" if input_str else "replied file"
+    await mone.edit(
+        f"**Time Taken :** `{ms} seconds`\
+        \nUnpacked the {source} and stored to `{destination}`"
+    )
@@ -16,16 +16,15 @@ import re
 import shutil
 import time
 import urllib
-from datetime import datetime
 
 import requests
-from PIL import Image, ImageDraw, ImageFont
 from pySmartDL import SmartDL
 from telethon.errors import FloodWaitError
 from telethon.tl import functions
 from urlextract import URLExtract
 
 from ..Config import Config
+from ..helpers.functions import bloom_pfp, clock_pfp, digital_pfp
 from ..helpers.utils import _format
 from ..sql_helper.global_list import (
     add_to_list,
@@ -95,14 +94,7 @@ async def autopicloop():
             while not downloader.isFinished():
                 pass
         shutil.copy(autopic_path, autophoto_path)
-        im = Image.open(autophoto_path)
-        file_test = im.rotate(counter, expand=False).save(autophoto_path, "PNG")
-        current_time = datetime.now().strftime("  Time: %H:%M \n  Date: %d.%m.%y ")
-        img = Image.open(autophoto_path)
-        drawn_text = ImageDraw.Draw(img)
-        fnt = ImageFont.truetype(FONT_FILE_TO_USE, 30)
-        drawn_text.text((150, 250), current_time, font=fnt, fill=(124, 252, 0))
-        img.save(autophoto_path)
+        await clock_pfp(autophoto_path, counter, FONT_FILE_TO_USE)
         file = await catub.upload_file(autophoto_path)
         try:
             await catub(functions.photos.UploadProfilePhotoRequest(file))
@@ -152,16 +144,10 @@ async def digitalpicloop():
             while not downloader.isFinished():
                 pass
         shutil.copy(digitalpic_path, autophoto_path)
-        Image.open(autophoto_path)
-        current_time = datetime.now().strftime("%H:%M")
-        img = Image.open(autophoto_path)
-        drawn_text = ImageDraw.Draw(img)
         cat = str(base64.b64decode("dXNlcmJvdC9oZWxwZXJzL3N0eWxlcy9kaWdpdGFsLnR0Zg=="))[
             2:36
         ]
-        fnt = ImageFont.truetype(cat, 200)
-        drawn_text.text((350, 100), current_time, font=fnt, fill=(124, 252, 0))
-        img.save(autophoto_path)
+        await digital_pfp(autophoto_path, cat)
         file = await catub.upload_file(autophoto_path)
         try:
             if i > 0:
@@ -199,21 +185,8 @@ async def bloom_pfploop():
         R = random.randint(0, 256)
         B = random.randint(0, 256)
         G = random.randint(0, 256)
-        FR = 256 - R
-        FB = 256 - B
-        FG = 256 - G
         shutil.copy(autopic_path, autophoto_path)
-        image = Image.open(autophoto_path)
-        image.paste((R, G, B), [0, 0, image.size[0], image.size[1]])
-        image.save(autophoto_path)
-        current_time = datetime.now().strftime("\n Time: %H:%M:%S \n \n Date: %d/%m/%y")
-        img = Image.open(autophoto_path)
-        drawn_text = ImageDraw.Draw(img)
-        fnt = ImageFont.truetype(FONT_FILE_TO_USE, 60)
-        ofnt = ImageFont.truetype(FONT_FILE_TO_USE, 250)
-        drawn_text.text((95, 250), current_time, font=fnt, fill=(FR, FG, FB))
-        drawn_text.text((95, 250), "      😈", font=ofnt, fill=(FR, FG, FB))
-        img.save(autophoto_path)
+        await bloom_pfp(autophoto_path, (R, G, B), FONT_FILE_TO_USE)
         file = await catub.upload_file(autophoto_path)
         try:
             await catub(functions.photos.UploadProfilePhotoRequest(file))
@@ -18,6 +18,7 @@ from ..core.data import blacklist_chats_list
 from ..core.managers import edit_delete, edit_or_reply
 from ..sql_helper import global_collectionjson as sql
 from ..sql_helper.globals import addgvar, delgvar, gvarstatus
+from ..utils import reload_plugins
 
 plugin_category = "tools"
 
@@ -46,13 +47,13 @@ async def chat_blacklist(event):
         text = "__From now on, your CatUserbot doesn't work in the chats stored in database.__"
         if len(blkchats) != 0:
             text += (
-                "**Bot is reloading to apply the changes. Please wait for a minute**"
+                "**Reloading plugins to apply the changes.**"
             )
             msg = await edit_or_reply(
                 event,
                 text,
             )
-            return await event.client.reload(msg)
+            return await reload_plugins(msg)
         text += "**You haven't added any chat to blacklist.**"
         return await edit_or_reply(
             event,
@@ -63,13 +64,13 @@ async def chat_blacklist(event):
         text = "__Your CatUserbot is as free as a bird.It works in Every Chat .__"
         if len(blkchats) != 0:
             text += (
-                "**Bot is reloading to apply the changes. Please wait for a minute**"
+                "**Reloading plugins to apply the changes.**"
             )
             msg = await edit_or_reply(
                 event,
                 text,
             )
-            return await event.client.reload(msg)
+            return await reload_plugins(msg)
         text += "**You haven't added any chat to blacklist.**"
         return await edit_or_reply(
             event,
@@ -152,9 +153,9 @@ async def add_blacklist_chat(event):
     if errors != "":
         output += f"**Error:**\n{errors}\n"
     if result != "":
-        output += "**Bot is reloading to apply the changes. Please wait for a minute**"
+        output += "**Reloading plugins to apply the changes.**"
     msg = await edit_or_reply(event, output)
-    await event.client.reload(msg)
+    await reload_plugins(msg)
 
 
 @catub.cat_cmd(
@@ -216,9 +217,9 @@ async def add_blacklist_chat(event):
     if errors != "":
         output += f"**Error:**\n{errors}\n"
     if result != "":
-        output += "**Bot is reloading to apply the changes. Please wait for a minute**"
+        output += "**Reloading plugins to apply the changes.**"
     msg = await edit_or_reply(event, output)
-    await event.client.reload(msg)
+    await reload_plugins(msg)
 
 
 @catub.cat_cmd(
@@ -193,6 +193,7 @@ async def catbroadcast_list(event):
 @catub.cat_cmd(
     pattern="sendto(?:\s|$)([\s\S]*)",
     command=("sendto", plugin_category),
+    job="broadcast",
     info={
         "header": "will send the replied message to all chats in the given category",
         "usage": "{tr}sendto <category name>",
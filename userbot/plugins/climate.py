@@ -12,13 +12,12 @@ import io
 import json
 from datetime import datetime
 
-import aiohttp
-import requests
 from pytz import country_names as c_n
 from pytz import country_timezones as c_tz
 from pytz import timezone as tz
 
 from ..Config import Config
+from ..core import http
 from ..helpers.utils import _format
 from ..sql_helper.globals import addgvar, gvarstatus
 from . import catub, edit_or_reply, logging, reply_id
@@ -93,12 +92,9 @@ async def get_weather(event):  # sourcery no-metrics
                 return await edit_or_reply(event, "`Invalid Country.`")
             CITY = f"{newcity[0].strip()},{countrycode.strip()}"
     url = f"https://api.openweathermap.org/data/2.5/weather?q={CITY}&appid={Config.OPEN_WEATHER_MAP_APPID}"
-    async with aiohttp.ClientSession() as _session:
-        async with _session.get(url) as request:
-            requeststatus = request.status
-            requesttext = await request.text()
-    result = json.loads(requesttext)
-    if requeststatus != 200:
+    request = await http.get(url, cache=True)
+    result = json.loads(request.text)
+    if request.status != 200:
         return await edit_or_reply(event, "`Invalid Country.`")
     cityname = result["name"]
     curtemp = result["main"]["temp"]
@@ -180,7 +176,7 @@ async def set_default_city(event):
                 return await edit_or_reply(event, "`Invalid country.`")
             CITY = f"{newcity[0].strip()},{countrycode.strip()}"
     url = f"https://api.openweathermap.org/data/2.5/weather?q={CITY}&appid={Config.OPEN_WEATHER_MAP_APPID}"
-    request = requests.get(url)
+    request = await http.get(url, cache=True)
     result = json.loads(request.text)
     if request.status_code != 200:
         return await edit_or_reply(event, "`Invalid country.`")
@@ -208,7 +204,9 @@ async def _(event):
     input_str = event.pattern_match.group(1)
     if not input_str:
         input_str = gvarstatus("DEFCITY") or "Delhi"
-    output = requests.get(f"https://wttr.in/{input_str}?mnTC0&lang=en").text
+    output = (
+        await http.get(f"https://wttr.in/{input_str}?mnTC0&lang=en", cache=True)
+    ).text
     await edit_or_reply(event, output, parse_mode=_format.parse_pre)
 
 
@@ -230,14 +228,14 @@ async def _(event):
     input_str = event.pattern_match.group(1)
     if not input_str:
         input_str = gvarstatus("DEFCITY") or "Delhi"
-    async with aiohttp.ClientSession() as session:
-        sample_url = "https://wttr.in/{}.png"
-        response_api_zero = await session.get(sample_url.format(input_str))
-        response_api = await response_api_zero.read()
-        with io.BytesIO(response_api) as out_file:
-            await event.reply(
-                f"**City : **`{input_str}`", file=out_file, reply_to=reply_to_id
-            )
+    sample_url = "https://wttr.in/{}.png"
+    response_api = (
+        await http.get(sample_url.format(input_str), cache=True)
+    ).content
+    with io.BytesIO(response_api) as out_file:
+        await event.reply(
+            f"**City : **`{input_str}`", file=out_file, reply_to=reply_to_id
+        )
     try:
         await event.delete()
     except Exception as e:
@@ -7,14 +7,13 @@
 # Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
-import contextlib
 import os
 from pathlib import Path
 
 from ..Config import Config
 from ..core import CMD_INFO, PLG_INFO
 from ..helpers.google_tools import chromeDriver
-from ..utils import load_module, remove_plugin
+from ..utils import load_module, reload_plugin, remove_plugin
 from . import CMD_HELP, CMD_LIST, SUDO_LIST, catub, edit_delete, edit_or_reply, reply_id
 
 plugin_category = "tools"
@@ -85,9 +84,7 @@ async def load(event):
     "To load a plugin again. if you have unloaded it"
     shortname = event.pattern_match.group(1)
     try:
-        with contextlib.suppress(BaseException):
-            remove_plugin(shortname)
-        load_module(shortname)
+        reload_plugin(shortname)
         await edit_delete(event, f"`Successfully loaded {shortname}`", 10)
     except Exception as e:
         await edit_or_reply(
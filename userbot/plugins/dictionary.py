@@ -32,6 +32,7 @@ async def _(event):
     try:
         response = await AioHttp().get_json(
             f"http://api.urbandictionary.com/v0/define?term={word}",
+            cache=True,
         )
         word = response["list"][0]["word"]
         definition = response["list"][0]["definition"]
@@ -64,6 +65,7 @@ async def _(event):
         ft = f"<b>Search Query: </b><code>{word.title()}</code>\n\n"
         response = await AioHttp().get_json(
             f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}",
+            cache=True,
         )
         if "message" not in response:
             result = response[0]
@@ -10,17 +10,17 @@
 import json
 import re
 import urllib.parse
-from os import popen
 from random import choice
 
-import requests
 from bs4 import BeautifulSoup
 from humanize import naturalsize
 
 from userbot import catub
 
+from ..core import http
 from ..core.logger import logging
 from ..core.managers import edit_delete, edit_or_reply
+from ..helpers.utils import _catutils
 
 LOGS = logging.getLogger(__name__)
 plugin_category = "misc"
@@ -63,31 +63,31 @@ async def direct_link_generator(event):
         await catevent.edit(reply)
     for link in links:
         if "drive.google.com" in link:
-            reply += gdrive(link)
+            reply += await gdrive(link)
         elif "zippyshare.com" in link:
-            reply += zippy_share(link)
+            reply += await zippy_share(link)
         elif "mega." in link:
-            reply += mega_dl(link)
+            reply += await mega_dl(link)
         elif "yadi.sk" in link:
-            reply += yandex_disk(link)
+            reply += await yandex_disk(link)
         elif "cloud.mail.ru" in link:
-            reply += cm_ru(link)
+            reply += await cm_ru(link)
         elif "mediafire.com" in link:
-            reply += mediafire(link)
+            reply += await mediafire(link)
         elif "sourceforge.net" in link:
-            reply += sourceforge(link)
+            reply += await sourceforge(link)
         elif "osdn.net" in link:
-            reply += osdn(link)
+            reply += await osdn(link)
         elif "github.com" in link:
-            reply += github(link)
+            reply += await github(link)
         elif "androidfilehost.com" in link:
-            reply += androidfilehost(link)
+            reply += await androidfilehost(link)
         else:
             reply += re.findall(r"\bhttps?://(.*?[^/]+)", link)[0] + "is not supported"
     await catevent.edit(reply)
 
 
-def gdrive(url: str) -> str:
+async def gdrive(url: str) -> str:
     """GDrive direct links generator"""
     drive = "https://drive.google.com"
     try:
@@ -103,7 +103,7 @@ def gdrive(url: str) -> str:
     elif link.find("uc?id=") != -1:
         file_id = link.split("uc?id=")[1].strip()
     url = f"{drive}/uc?export=download&id={file_id}"
-    download = requests.get(url, stream=True, allow_redirects=False)
+    download = await http.get(url, allow_redirects=False)
     cookies = download.cookies
     try:
         # In case of small file size, Google downloads directly
@@ -117,9 +117,7 @@ def gdrive(url: str) -> str:
         page = BeautifulSoup(download.content, "lxml")
         export = drive + page.find("a", {"id": "uc-download-link"}).get("href")
         name = page.find("span", {"class": "uc-name-size"}).text
-        response = requests.get(
-            export, stream=True, allow_redirects=False, cookies=cookies
-        )
+        response = await http.get(export, allow_redirects=False, cookies=cookies)
         dl_url = response.headers["location"]
         if "accounts.google.com" in dl_url:
             reply += "Link is not public!"
@@ -128,7 +126,7 @@ def gdrive(url: str) -> str:
     return reply
 
 
-def zippy_share(url: str) -> str:
+async def zippy_share(url: str) -> str:
     """ZippyShare direct links generator
     Based on https://github.com/LameLemon/ziggy"""
     reply = ""
@@ -137,9 +135,8 @@ def zippy_share(url: str) -> str:
         link = re.findall(r"\bhttps?://.*zippyshare\.com\S+", url)[0]
     except IndexError:
         return "`No ZippyShare links found`\n"
-    session = requests.Session()
     base_url = re.search("http.+.com", link).group()
-    response = session.get(link)
+    response = await http.get(link)
     page_soup = BeautifulSoup(response.content, "lxml")
     scripts = page_soup.find_all("script", {"type": "text/javascript"})
     for script in scripts:
@@ -160,7 +157,7 @@ def zippy_share(url: str) -> str:
     return reply
 
 
-def yandex_disk(url: str) -> str:
+async def yandex_disk(url: str) -> str:
     """Yandex.Disk direct links generator
     Based on https://github.com/wldhx/yadisk-direct"""
     reply = ""
@@ -170,7 +167,7 @@ def yandex_disk(url: str) -> str:
         return "`No Yandex.Disk links found`\n"
     api = "https://cloud-api.yandex.net/v1/disk/public/resources/download?public_key={}"
     try:
-        dl_url = requests.get(api.format(link)).json()["href"]
+        dl_url = (await http.get(api.format(link))).json()["href"]
         name = dl_url.split("filename=")[1].split("&disposition")[0]
         reply += f"[{name}]({dl_url})\n"
     except KeyError:
@@ -179,7 +176,7 @@ def yandex_disk(url: str) -> str:
     return reply
 
 
-def mega_dl(url: str) -> str:
+async def mega_dl(url: str) -> str:
     """MEGA.nz direct links generator
     Using https://github.com/tonikelope/megadown"""
     reply = ""
@@ -188,7 +185,7 @@ def mega_dl(url: str) -> str:
     except IndexError:
         return "`No MEGA.nz links found`\n"
     command = f"bin/megadown -q -m {link}"
-    result = popen(command).read()
+    result = (await _catutils.runcmd(command))[0]
     try:
         data = json.loads(result)
         LOGS.info(data)
@@ -202,7 +199,7 @@ def mega_dl(url: str) -> str:
     return reply
 
 
-def cm_ru(url: str) -> str:
+async def cm_ru(url: str) -> str:
     """cloud.mail.ru direct links generator
     Using https://github.com/JrMasterModelBuilder/cmrudl.py"""
     reply = ""
@@ -211,7 +208,7 @@ def cm_ru(url: str) -> str:
     except IndexError:
         return "`No cloud.mail.ru links found`\n"
     command = f"bin/cmrudl -s {link}"
-    result = popen(command).read()
+    result = (await _catutils.runcmd(command))[0]
     result = result.splitlines()[-1]
     try:
         data = json.loads(result)
@@ -225,14 +222,14 @@ def cm_ru(url: str) -> str:
     return reply
 
 
-def mediafire(url: str) -> str:
+async def mediafire(url: str) -> str:
     """MediaFire direct links generator"""
     try:
         link = re.findall(r"\bhttps?://.*mediafire\.com\S+", url)[0]
     except IndexError:
         return "`No MediaFire links found`\n"
     reply = ""
-    page = BeautifulSoup(requests.get(link).content, "lxml")
+    page = BeautifulSoup((await http.get(link)).content, "lxml")
     info = page.find("a", {"aria-label": "Download file"})
     dl_url = info.get("href")
     size = re.findall(r"\(.*\)", info.text)[0]
@@ -241,7 +238,7 @@ def mediafire(url: str) -> str:
     return reply
 
 
-def sourceforge(url: str) -> str:
+async def sourceforge(url: str) -> str:
     """SourceForge direct links generator"""
     try:
         link = re.findall(r"\bhttps?://.*sourceforge\.net\S+", url)[0]
@@ -254,7 +251,7 @@ def sourceforge(url: str) -> str:
         f"https://sourceforge.net/settings/mirror_choices?"
         f"projectname={project}&filename={file_path}"
     )
-    page = BeautifulSoup(requests.get(mirrors).content, "html.parser")
+    page = BeautifulSoup((await http.get(mirrors)).content, "html.parser")
     info = page.find("ul", {"id": "mirrorList"}).findAll("li")
     for mirror in info[1:]:
         name = re.findall(r"\(([\s\S]*)\)", mirror.text.strip())[0]
@@ -265,14 +262,14 @@ def sourceforge(url: str) -> str:
     return reply
 
 
-def osdn(url: str) -> str:
+async def osdn(url: str) -> str:
     """OSDN direct links generator"""
     osdn_link = "https://osdn.net"
     try:
         link = re.findall(r"\bhttps?://.*osdn\.net\S+", url)[0]
     except IndexError:
         return "`No OSDN links found`\n"
-    page = BeautifulSoup(requests.get(link, allow_redirects=True).content, "lxml")
+    page = BeautifulSoup((await http.get(link)).content, "lxml")
     info = page.find("a", {"class": "mirror_link"})
     link = urllib.parse.unquote(osdn_link + info["href"])
     reply = f"Mirrors for __{link.split('/')[-1]}__\n"
@@ -285,7 +282,7 @@ def osdn(url: str) -> str:
     return reply
 
 
-def github(url: str) -> str:
+async def github(url: str) -> str:
     """GitHub direct links generator"""
     try:
         link = re.findall(r"\bhttps?://.*github\.com.*releases\S+", url)[0]
@@ -293,7 +290,7 @@ def github(url: str) -> str:
         return "`No GitHub Releases links found`\n"
     reply = ""
     dl_url = ""
-    download = requests.get(url, stream=True, allow_redirects=False)
+    download = await http.get(url, allow_redirects=False)
     try:
         dl_url = download.headers["location"]
     except KeyError:
@@ -303,17 +300,16 @@ def github(url: str) -> str:
     return reply
 
 
-def androidfilehost(url: str) -> str:
+async def androidfilehost(url: str) -> str:
     """AFH direct links generator"""
     try:
         link = re.findall(r"\bhttps?://.*androidfilehost.*fid.*\S+", url)[0]
     except IndexError:
         return "`No AFH links found`\n"
     fid = re.findall(r"\?fid=([\s\S]*)", link)[0]
-    session = requests.Session()
-    user_agent = useragent()
+    user_agent = await useragent()
     headers = {"user-agent": user_agent}
-    res = session.get(link, headers=headers, allow_redirects=True)
+    res = await http.get(link, headers=headers)
     headers = {
         "origin": "https://androidfilehost.com",
         "accept-encoding": "gzip, deflate, br",
@@ -331,7 +327,7 @@ def androidfilehost(url: str) -> str:
     reply = ""
     error = "`Error: Can't find Mirrors for the link`\n"
     try:
-        req = session.post(
+        req = await http.post(
             "https://androidfilehost.com/libs/otf/mirrors.otf.php",
             headers=headers,
             data=data,
@@ -350,14 +346,16 @@ def androidfilehost(url: str) -> str:
     return reply
 
 
-def useragent():
+async def useragent():
     """
     useragent random setter
     """
     useragents = BeautifulSoup(
-        requests.get(
-            "https://developers.whatismybrowser.com/"
-            "useragents/explore/operating_system_name/android/"
+        (
+            await http.get(
+                "https://developers.whatismybrowser.com/"
+                "useragents/explore/operating_system_name/android/"
+            )
         ).content,
         "lxml",
     ).findAll("td", {"class": "useragent"})
@@ -365,9 +363,9 @@ def useragent():
     return user_agent.text
 
 
-def anonfiles(url: str) -> str:
+async def anonfiles(url: str) -> str:
     reply = ""
-    html_s = requests.get(url).content
+    html_s = (await http.get(url)).content
     soup = BeautifulSoup(html_s, "html.parser")
     _url = soup.find("a", attrs={"class": "btn-primary"})["href"]
     name = _url.rsplit("/", 1)[1]
@@ -40,6 +40,7 @@ async def _get_file_name(path: pathlib.Path, full: bool = True) -> str:
 @catub.cat_cmd(
     pattern="d(own)?l(oad)?(?:\s|$)([\s\S]*)",
     command=("download", plugin_category),
+    job="transfer",
     info={
         "header": "To download the replied telegram file",
         "description": "Will download the replied telegram file to server .",
@@ -184,6 +185,7 @@ async def _(event):  # sourcery no-metrics  # sourcery skip: low-code-quality
 @catub.cat_cmd(
     pattern="d(own)?l(oad)?to(?:\s|$)([\s\S]*)",
     command=("dlto", plugin_category),
+    job="transfer",
     info={
         "header": "To download the replied telegram file to specific directory",
         "description": "Will download the replied telegram file to server that is your custom folder.",
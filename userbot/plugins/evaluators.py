@@ -9,7 +9,6 @@
 # Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
-import asyncio
 import importlib
 import inspect
 import io
@@ -17,7 +16,7 @@ import os
 import sys
 import traceback
 
-from ..helpers.utils import _format
+from ..helpers.utils import _format, stream_cmd
 from . import *
 
 plugin_category = "tools"
@@ -38,24 +37,35 @@ async def _(event):
     if not cmd:
         return await edit_delete(event, "`What should i execute?..`")
     catevent = await edit_or_reply(event, "`Executing.....`")
-    process = await asyncio.create_subprocess_shell(
-        cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
-    result = str(stdout.decode().strip()) + str(stderr.decode().strip())
     catuser = await event.client.get_me()
     curruser = catuser.username or "catuserbot"
     uid = os.geteuid()
-    if uid == 0:
-        cresult = f"```{curruser}:~#``` ```{cmd}```\n```{result}```"
+    prompt = f"{curruser}:~#" if uid == 0 else f"{curruser}:~$"
+
+    async def live_tail(tail):
+        await catevent.edit(f"```{prompt}``` ```{cmd}```\n```{tail}```")
+
+    result = await stream_cmd(cmd, on_update=live_tail)
+    if result.file:
+        # too big to keep around, send what the command wrote as a file
+        try:
+            await event.client.send_file(
+                event.chat_id,
+                result.file,
+                caption=f"**•  Exec : **\n```{cmd}```",
+                reply_to=await reply_id(event),
+            )
+        finally:
+            os.remove(result.file)
+        await catevent.delete()
     else:
-        cresult = f"```{curruser}:~$``` ```{cmd}```\n```{result}```"
-    await edit_or_reply(
-        catevent,
-        text=cresult,
-        aslink=True,
-        linktext=f"**•  Exec : **\n```{cmd}``` \n\n**•  Result : **\n",
-    )
+        cresult = f"```{prompt}``` ```{cmd}```\n```{result.text}```"
+        await edit_or_reply(
+            catevent,
+            text=cresult,
+            aslink=True,
+            linktext=f"**•  Exec : **\n```{cmd}``` \n\n**•  Result : **\n",
+        )
     if BOTLOG:
         await event.client.send_message(
             BOTLOG_CHATID, f"**Terminal command executed successfully:**\n\n```{cmd}```"
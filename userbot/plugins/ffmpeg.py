@@ -13,7 +13,6 @@ import contextlib
 import io
 import math
 import os
-import re
 import time
 from datetime import datetime
 
@@ -24,6 +23,8 @@ from ..Config import Config
 from ..core.managers import edit_delete, edit_or_reply
 from ..helpers import (
     _catutils,
+    cut_media,
+    encode_video,
     fileinfo,
     humanbytes,
     media_type,
@@ -47,85 +48,47 @@ LOGGER = logging.getLogger(__name__)
 
 
 async def convert_video(video_file, output_directory, crf, total_time, bot, message):
-    # https://stackoverflow.com/a/13891070/4723940
     out_put_file_name = f"{output_directory}/{str(round(time.time()))}.mp4"
-    progress = f"{output_directory}/progress.txt"
-    with open(progress, "w") as f:
-        pass
-    COMPRESSION_START_TIME = time.time()
-    process = await asyncio.create_subprocess_shell(
-        f'ffmpeg -hide_banner -loglevel quiet -progress {progress} -i """{video_file}""" -preset ultrafast -vcodec libx265 -crf {crf} -c:a copy """{out_put_file_name}"""',
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    LOGGER.info(f"ffmpeg_process: {str(process.pid)}")
-    while process.returncode != 0:
-        await asyncio.sleep(3)
-        with open("./temp/progress.txt", "r+") as file:
-            text = file.read()
-            frame = re.findall("frame=(\d+)", text)
-            time_in_us = re.findall("out_time_ms=(\d+)", text)
-            progress = re.findall("progress=(\w+)", text)
-            speed = re.findall("speed=(\d+\.?\d*)", text)
-            frame = int(frame[-1]) if len(frame) else 1
-            speed = speed[-1] if len(speed) else 1
-            time_in_us = time_in_us[-1] if len(time_in_us) else 1
-            if len(progress) and progress[-1] == "end":
-                LOGGER.info(progress[-1])
-                break
-            time_formatter((time.time() - COMPRESSION_START_TIME))
-            elapsed_time = int(time_in_us) / 1000000
-            difference = math.floor((total_time - elapsed_time) / float(speed))
-            ETA = "-"
-            if difference > 0:
-                ETA = time_formatter(difference)
-            percentage = math.floor(elapsed_time * 100 / total_time)
-            progress_str = "📊 **Progress :** {0}%\n[{1}{2}]".format(
-                round(percentage, 2),
-                "".join(
-                    [FINISHED_PROGRESS_STR for _ in range(math.floor(percentage / 10))]
-                ),
-                "".join(
-                    [
-                        UN_FINISHED_PROGRESS_STR
-                        for _ in range(10 - math.floor(percentage / 10))
-                    ]
-                ),
-            )
 
-            stats = (
-                f"📦️ **Compressing CRF-{crf}**\n\n"
-                f"⏰️ **ETA :** {ETA}\n\n"
-                f"{progress_str}\n"
-            )
-            with contextlib.suppress(Exception):
-                await message.edit(text=stats)
-    # Wait for the subprocess to finish
-    stdout, stderr = await process.communicate()
-    return out_put_file_name if os.path.lexists(out_put_file_name) else None
+    async def show_progress(elapsed_time, speed):
+        difference = math.floor((total_time - elapsed_time) / speed)
+        ETA = time_formatter(difference) if difference > 0 else "-"
+        percentage = min(math.floor(elapsed_time * 100 / (total_time or 1)), 100)
+        progress_str = "📊 **Progress :** {0}%\n[{1}{2}]".format(
+            percentage,
+            FINISHED_PROGRESS_STR * math.floor(percentage / 10),
+            UN_FINISHED_PROGRESS_STR * (10 - math.floor(percentage / 10)),
+        )
+        stats = (
+            f"📦️ **Compressing CRF-{crf}**\n\n"
+            f"⏰️ **ETA :** {ETA}\n\n"
+            f"{progress_str}\n"
+        )
+        with contextlib.suppress(Exception):
+            await message.edit(text=stats)
+
+    return await encode_video(
+        video_file, out_put_file_name, crf, on_progress=show_progress
+    )
 
 
 async def cult_small_video(
     video_file, output_directory, start_time, end_time, out_put_file_name=None
 ):
-    # https://stackoverflow.com/a/13891070/4723940
     out_put_file_name = out_put_file_name or os.path.join(
         output_directory, f"{round(time.time())}.mp4"
     )
-    process = await asyncio.create_subprocess_shell(
-        # stdout must a pipe to be accessible as process.stdout
-        f'ffmpeg -i """{video_file}""" -ss {start_time} -to {end_time} -async 1 -strict -2 """{out_put_file_name}"""',
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    # Wait for the subprocess to finish
-    await process.communicate()
-    return out_put_file_name if os.path.lexists(out_put_file_name) else None
+    try:
+        return await cut_media(video_file, out_put_file_name, start_time, end_time)
+    except ValueError:
+        # not a time like 00:10 or 10
+        return None
 
 
 @catub.cat_cmd(
     pattern="(|f)compress(?:\s|$)([\s\S]*)",
     command=("compress", plugin_category),
+    job="ffmpeg",
     info={
         "header": "Compress the video file.",
         "description": "Will compress the replied video, if not replied to video it will check any video saved by .ffmpegsave or not.",
@@ -319,6 +282,7 @@ async def ff_mpeg_trim_cmd(event):
 @catub.cat_cmd(
     pattern="vtrim(?:\s|$)([\s\S]*)",
     command=("vtrim", plugin_category),
+    job="ffmpeg",
     info={
         "header": "Trims the saved media with specific given time internval and outputs as video if it is video",
         "description": "Will trim the saved media with given time interval.",
@@ -405,6 +369,7 @@ async def ff_mpeg_trim_cmd(event):
 @catub.cat_cmd(
     pattern="atrim(?:\s|$)([\s\S]*)",
     command=("atrim", plugin_category),
+    job="ffmpeg",
     info={
         "header": "Trims the saved media with specific given time internval and outputs as audio",
         "description": "Will trim the saved media with given time interval. and output only audio part, if no interval given it will trim whole audio",
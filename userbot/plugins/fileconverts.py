@@ -27,7 +27,9 @@ from telethon.utils import get_attributes
 from userbot import Convert, catub
 
 from ..Config import Config
+from ..core.convcache import convcache
 from ..core.managers import edit_delete, edit_or_reply
+from ..core.procs import spawn
 from ..helpers import media_type, meme_type, progress, thumb_from_audio
 from ..helpers.functions import (
     invert_frames,
@@ -328,7 +330,9 @@ async def _(event):
         return await edit_delete(
             output[0], "__Unable to extract image from the replied message.__"
         )
-    await event.client.send_file(event.chat_id, output[1], reply_to=reply_to_id)
+    await convcache.send_file(
+        event.client, event.chat_id, output[1], reply_to=reply_to_id
+    )
     os.remove(output[1])
     await output[0].delete()
 
@@ -350,21 +354,22 @@ async def _(event):
         return await edit_delete(
             event, "Reply to any image/media to convert it to sticker.__"
         )
-    output = await Convert.to_image(
+    output = await Convert.to_sticker(
         event,
         reply,
         dirct="./temp",
-        file="itos.png",
+        file="sticker.webp",
     )
     if output[1] is None:
         return await edit_delete(
             output[0], "__Unable to extract image from the replied message.__"
         )
-    meme_file = (
-        await Convert.to_sticker(event, output[1], file="sticker.webp", noedits=True)
-    )[1]
-    await event.client.send_file(
-        event.chat_id, meme_file, reply_to=reply_to_id, force_document=False
+    await convcache.send_file(
+        event.client,
+        event.chat_id,
+        output[1],
+        reply_to=reply_to_id,
+        force_document=False,
     )
     await output[0].delete()
 
@@ -616,12 +621,12 @@ async def _(event):
             await event.edit("not supported")
             os.remove(downloaded_file_name)
             return
-        process = await asyncio.create_subprocess_exec(
-            *command_to_run,
+        async with spawn(
+            command_to_run,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await process.communicate()
+        ) as process:
+            stdout, stderr = await process.communicate()
         stderr.decode().strip()
         stdout.decode().strip()
         os.remove(downloaded_file_name)
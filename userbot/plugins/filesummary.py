@@ -10,11 +10,16 @@
 import time
 
 from prettytable import PrettyTable
+from telethon.utils import get_peer_id
 
 from userbot import catub
 
 from ..core.managers import edit_delete, edit_or_reply
-from ..helpers.tools import media_type
+from ..helpers.media_index import (
+    rebuild_media_index,
+    sender_media_stats,
+    update_media_index,
+)
 from ..helpers.utils import _format
 from . import humanbytes
 
@@ -37,30 +42,56 @@ def weird_division(n, d):
     return n / d if d else 0
 
 
+def media_table(media_stats, chatdata):
+    "builds the summary table and largest file list from indexed aggregates"
+    x = PrettyTable()
+    x.title = "File Summary"
+    x.field_names = ["Media", "Count", "File size"]
+    largest = "   <b>Largest Size</b>\n"
+    totalcount = totalsize = 0
+    for mediax in TYPES:
+        stats = media_stats.get(mediax)
+        if not stats:
+            x.add_row([mediax, 0, humanbytes(0)])
+            continue
+        x.add_row([mediax, stats["count"], humanbytes(stats["file_size"])])
+        if type(chatdata).__name__ == "Channel":
+            max_file_link = f"https://t.me/c/{chatdata.id}/{stats['max_msg_id']}"
+        else:
+            max_file_link = f"tg://openmessage?user_id={chatdata.id}&message_id={stats['max_msg_id']}"
+        largest += f"  •  <b><a href='{max_file_link}'>{mediax}</a>  : </b><code>{humanbytes(stats['max_size'])}</code>\n"
+        totalcount += stats["count"]
+        totalsize += stats["file_size"]
+    return x, largest, totalcount, totalsize
+
+
 @catub.cat_cmd(
     pattern="chatfs(?:\s|$)([\s\S]*)",
     command=("chatfs", plugin_category),
+    job="scan",
     info={
         "header": "Shows you the complete media/file summary of the that group.",
-        "description": "As of now limited to last 10000 in the group u used",
-        "usage": "{tr}chatfs <Username/id>",
+        "description": "The first run indexes the whole chat, later runs only scan the new messages.",
+        "flags": {
+            "-r": "Rebuild the index of the chat in background (use it if many files were deleted)."
+        },
+        "usage": ["{tr}chatfs <Username/id>", "{tr}chatfs -r <Username/id>"],
         "examples": "{tr}chatfs @catuserbot_support",
     },
 )
 async def _(event):  # sourcery no-metrics  # sourcery skip: low-code-quality
     "Shows you the complete media/file summary of the that group"
     entity = event.chat_id
-    if input_str := event.pattern_match.group(1):
+    input_str = event.pattern_match.group(1)
+    rebuild = input_str.startswith("-r")
+    if rebuild:
+        input_str = input_str[2:].strip()
+    if input_str:
         try:
             entity = int(input_str)
         except ValueError:
             entity = input_str
     starttime = int(time.monotonic())
-    x = PrettyTable()
-    totalcount = totalsize = msg_count = 0
-    x.title = "File Summary"
-    x.field_names = ["Media", "Count", "File size"]
-    largest = "   <b>Largest Size</b>\n"
     try:
         chatdata = await event.client.get_entity(entity)
     except Exception as e:
@@ -78,43 +109,23 @@ async def _(event):  # sourcery no-metrics  # sourcery skip: low-code-quality
             link = chatdata.title
     else:
         link = f"<a href='tg://user?id={chatdata.id}'>{chatdata.first_name}</a>"
+    if rebuild:
+        if await rebuild_media_index(event.client, chatdata):
+            return await edit_delete(
+                event,
+                f"<code>Rebuilding file index of </code><b>{link}</b><code> in background.</code>",
+                parse_mode="HTML",
+            )
+        return await edit_delete(
+            event, "<code>Index rebuild is already running.</code>", parse_mode="HTML"
+        )
     catevent = await edit_or_reply(
         event,
         f"<code>Counting files and file size of </code><b>{link}</b>\n<code>This may take some time also depends on number of group messages</code>",
         parse_mode="HTML",
     )
-    media_dict = {
-        m: {"file_size": 0, "count": 0, "max_size": 0, "max_file_link": ""}
-        for m in TYPES
-    }
-    async for message in event.client.iter_messages(entity=entity, limit=None):
-        msg_count += 1
-        media = await media_type(message)
-        if media is not None:
-            media_dict[media]["file_size"] += message.file.size
-            media_dict[media]["count"] += 1
-            if message.file.size > media_dict[media]["max_size"]:
-                media_dict[media]["max_size"] = message.file.size
-                if type(chatdata).__name__ == "Channel":
-                    media_dict[media][
-                        "max_file_link"
-                    ] = f"https://t.me/c/{chatdata.id}/{message.id}"  # pylint: disable=line-too-long
-                else:
-                    media_dict[media][
-                        "max_file_link"
-                    ] = f"tg://openmessage?user_id={chatdata.id}&message_id={message.id}"  # pylint: disable=line-too-long
-            totalsize += message.file.size
-            totalcount += 1
-    for mediax in TYPES:
-        x.add_row(
-            [
-                mediax,
-                media_dict[mediax]["count"],
-                humanbytes(media_dict[mediax]["file_size"]),
-            ]
-        )
-        if media_dict[mediax]["count"] != 0:
-            largest += f"  •  <b><a href='{media_dict[mediax]['max_file_link']}'>{mediax}</a>  : </b><code>{humanbytes(media_dict[mediax]['max_size'])}</code>\n"
+    msg_count, data = await update_media_index(event.client, chatdata)
+    x, largest, totalcount, totalsize = media_table(data["media"], chatdata)
     endtime = int(time.monotonic())
     avghubytes = humanbytes(weird_division(totalsize, totalcount))
     avgruntime = (
@@ -143,9 +154,10 @@ async def _(event):  # sourcery no-metrics  # sourcery skip: low-code-quality
 @catub.cat_cmd(
     pattern="userfs(?:\s|$)([\s\S]*)",
     command=("userfs", plugin_category),
+    job="scan",
     info={
         "header": "Shows you the complete media/file summary of the that user in that group.",
-        "description": "As of now limited to last 10000 messages of that person in the group u used",
+        "description": "Uses the same incremental index as chatfs, so only new messages of the group are scanned.",
         "usage": "{tr}userfs <reply/username/id>",
         "examples": "{tr}userfs @MissRose_bot",
     },
@@ -173,11 +185,6 @@ async def _(event):  # sourcery no-metrics  # sourcery skip: low-code-quality
         entity = event.chat_id
         userentity = event.sender_id
     starttime = int(time.monotonic())
-    x = PrettyTable()
-    totalcount = totalsize = msg_count = 0
-    x.title = "File Summary"
-    x.field_names = ["Media", "Count", "File size"]
-    largest = "   <b>Largest Size</b>\n"
     try:
         chatdata = await event.client.get_entity(entity)
     except Exception as e:
@@ -208,40 +215,10 @@ async def _(event):  # sourcery no-metrics  # sourcery skip: low-code-quality
         parse_mode="HTML",
     )
 
-    media_dict = {
-        m: {"file_size": 0, "count": 0, "max_size": 0, "max_file_link": ""}
-        for m in TYPES
-    }
-    async for message in event.client.iter_messages(
-        entity=entity, limit=None, from_user=userentity
-    ):
-        msg_count += 1
-        media = await media_type(message)
-        if media is not None:
-            media_dict[media]["file_size"] += message.file.size
-            media_dict[media]["count"] += 1
-            if message.file.size > media_dict[media]["max_size"]:
-                media_dict[media]["max_size"] = message.file.size
-                if type(chatdata).__name__ == "Channel":
-                    media_dict[media][
-                        "max_file_link"
-                    ] = f"https://t.me/c/{chatdata.id}/{message.id}"
-                else:
-                    media_dict[media][
-                        "max_file_link"
-                    ] = f"tg://openmessage?user_id={chatdata.id}&message_id={message.id}"
-            totalsize += message.file.size
-            totalcount += 1
-    for mediax in TYPES:
-        x.add_row(
-            [
-                mediax,
-                media_dict[mediax]["count"],
-                humanbytes(media_dict[mediax]["file_size"]),
-            ]
-        )
-        if media_dict[mediax]["count"] != 0:
-            largest += f"  •  <b><a href='{media_dict[mediax]['max_file_link']}'>{mediax}</a>  : </b><code>{humanbytes(media_dict[mediax]['max_size'])}</code>\n"
+    msg_count, media_stats = await sender_media_stats(
+        event.client, chatdata, get_peer_id(userdata)
+    )
+    x, largest, totalcount, totalsize = media_table(media_stats, chatdata)
     endtime = int(time.monotonic())
     avghubytes = humanbytes(weird_division(totalsize, totalcount))
     avgruntime = (
@@ -6,6 +6,7 @@ from telethon.utils import get_display_name
 from userbot import catub
 
 from ..core.managers import edit_or_reply
+from ..core.mediacache import send_stored
 from ..sql_helper.filter_sql import (
     add_filter,
     get_filters,
@@ -23,14 +24,25 @@ async def filter_incoming_handler(event):  # sourcery no-metrics
         return
     name = event.raw_text
     filters = get_filters(event.chat_id)
+    if not filters:
+        return
+    filters = [
+        trigger
+        for trigger in filters
+        if re.search(
+            f"( |^|[^\\w]){re.escape(trigger.keyword)}( |$|[^\\w])",
+            name,
+            flags=re.IGNORECASE,
+        )
+    ]
     if not filters:
         return
     a_user = await event.get_sender()
     chat = await event.get_chat()
     me = await event.client.get_me()
-    title = get_display_name(await event.get_chat()) or "this chat"
-    participants = await event.client.get_participants(chat)
-    count = len(participants)
+    title = get_display_name(chat) or "this chat"
+    participants = await event.client.get_participants(chat, limit=0)
+    count = participants.total
     mention = f"[{a_user.first_name}](tg://user?id={a_user.id})"
     my_mention = f"[{me.first_name}](tg://user?id={me.id})"
     first = a_user.first_name
@@ -42,40 +54,38 @@ async def filter_incoming_handler(event):  # sourcery no-metrics
     my_last = me.last_name
     my_fullname = f"{my_first} {my_last}" if my_last else my_first
     my_username = f"@{me.username}" if me.username else my_mention
+
+    async def send_filter(text, file=None, link_preview=False):
+        return await event.reply(
+            text.format(
+                mention=mention,
+                title=title,
+                count=count,
+                first=first,
+                last=last,
+                fullname=fullname,
+                username=username,
+                userid=userid,
+                my_first=my_first,
+                my_last=my_last,
+                my_fullname=my_fullname,
+                my_username=my_username,
+                my_mention=my_mention,
+            ),
+            file=file,
+            link_preview=link_preview,
+        )
+
     for trigger in filters:
-        pattern = f"( |^|[^\\w]){re.escape(trigger.keyword)}( |$|[^\\w])"
-        if re.search(pattern, name, flags=re.IGNORECASE):
-            file_media = None
-            filter_msg = None
-            if trigger.f_mesg_id:
-                msg_o = await event.client.get_messages(
-                    entity=BOTLOG_CHATID, ids=int(trigger.f_mesg_id)
-                )
-                file_media = msg_o.media
-                filter_msg = msg_o.message
-                link_preview = True
-            elif trigger.reply:
-                filter_msg = trigger.reply
-                link_preview = False
-            await event.reply(
-                filter_msg.format(
-                    mention=mention,
-                    title=title,
-                    count=count,
-                    first=first,
-                    last=last,
-                    fullname=fullname,
-                    username=username,
-                    userid=userid,
-                    my_first=my_first,
-                    my_last=my_last,
-                    my_fullname=my_fullname,
-                    my_username=my_username,
-                    my_mention=my_mention,
-                ),
-                file=file_media,
-                link_preview=link_preview,
+        if trigger.f_mesg_id:
+            await send_stored(
+                event.client,
+                BOTLOG_CHATID,
+                trigger.f_mesg_id,
+                lambda msg_o: send_filter(msg_o.message, msg_o.media, True),
             )
+        elif trigger.reply:
+            await send_filter(trigger.reply)
 
 
 @catub.cat_cmd(
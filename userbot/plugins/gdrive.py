@@ -10,6 +10,7 @@
 import asyncio
 import base64
 import contextlib
+import hashlib
 import io
 import json
 import logging
@@ -22,9 +23,11 @@ from datetime import datetime
 from mimetypes import guess_type
 from urllib.parse import quote
 
+import httplib2
 import requests
 from bs4 import BeautifulSoup
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -37,6 +40,7 @@ from userbot.core.logger import logging
 
 from ..Config import Config
 from ..core.managers import edit_delete, edit_or_reply
+from ..core.pool import run_in_thread
 from ..helpers import CancelProcess, humanbytes, progress, time_formatter
 from ..helpers.functions.functions import post_to_telegraph
 from ..helpers.utils import _format
@@ -63,6 +67,8 @@ SCOPES = [
     "https://www.googleapis.com/auth/drive.metadata",
 ]
 REDIRECT_URI = "https://localhost"
+# drive wants chunks in multiples of 256 KiB, whole megabytes always are
+G_DRIVE_CHUNK_SIZE = max(Config.G_DRIVE_CHUNK_SIZE, 1) << 20
 # =========================================================== #
 #      STATIC CASE FOR G_DRIVE_FOLDER_ID IF VALUE IS URL      #
 # =========================================================== #
@@ -120,6 +126,26 @@ class GDRIVE:
 
 
 GDRIVE_ = GDRIVE()
+_TRANSFER_SLOTS = None
+
+
+def transfer_slots():
+    "files moved at once, shared by every upload and download"
+    global _TRANSFER_SLOTS
+    if _TRANSFER_SLOTS is None:
+        _TRANSFER_SLOTS = asyncio.Semaphore(max(Config.G_DRIVE_PARALLEL, 1))
+    return _TRANSFER_SLOTS
+
+
+def thread_http(service):
+    "httplib2 connections aren't thread safe, every transfer gets its own"
+    return AuthorizedHttp(service._http.credentials, http=httplib2.Http())
+
+
+def upload_key(file_path, dir_id):
+    stat = os.stat(file_path)
+    raw = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{dir_id}"
+    return hashlib.sha1(raw.encode()).hexdigest()
 
 
 async def create_app(gdrive):
@@ -357,9 +383,12 @@ async def create_server_dir(service, current_path, folder_name):
 
 
 async def gdrive_download(
-    event, gdrive, service, uri, path=os.path.join(os.getcwd(), "gdrive")
+    event, gdrive, service, uri, path=os.path.join(os.getcwd(), "gdrive"), quiet=False
 ):  # sourcery no-metrics  # sourcery skip: low-code-quality
     reply = ""
+    # only the outer call resets it, the files of a folder share one cancel
+    if not quiet:
+        GDRIVE_.is_cancelled = False
     if not os.path.exists(path):
         os.mkdir(path)
     try:
@@ -410,7 +439,6 @@ async def gdrive_download(
                 current_time = time.time()
                 display_message = None
                 first = True
-                GDRIVE_.is_cancelled = False
                 for chunk in download.iter_content(CHUNK_SIZE):
                     if GDRIVE_.is_cancelled:
                         raise CancelProcess from e
@@ -444,28 +472,55 @@ async def gdrive_download(
             file_name = file.get("name").replace(" ", "_")
             newpath = await create_server_dir(service, path, file_name)
             filespath_d = await list_drive_dir(service, file_Id)
-            newerrors = []
-            for nfileid in filespath_d:
-                nfile_path, error = await gdrive_download(
-                    event, gdrive, service, nfileid["id"], path=newpath
+            # files of the folder come down side by side, transfer_slots caps it
+            tasks = [
+                asyncio.create_task(
+                    gdrive_download(
+                        event, gdrive, service, nfileid["id"], path=newpath, quiet=True
+                    )
                 )
-                if error is not None:
-                    newerrors.append(error)
+                for nfileid in filespath_d
+            ]
+            try:
+                results = await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            newerrors = [error for _, error in results if error]
             errorstr = "".join(f"{i}\n" for i in newerrors)
+            if not quiet:
+                with contextlib.suppress(Exception):
+                    await gdrive.edit(
+                        f"**Downloaded {len(results) - len(newerrors)} of "
+                        f"{len(results)} files to** `{newpath}`"
+                    )
             return newpath, errorstr
         file_path = os.path.join(path, file_name)
         request = service.files().get_media(fileId=file_Id, supportsAllDrives=True)
-        with io.FileIO(file_path, "wb") as df:
-            downloader = MediaIoBaseDownload(df, request)
+        request.http = thread_http(service)
+        file_size = int(file.get("size") or 0)
+        # data goes to a .part file first, one left behind by an interrupted
+        # download is continued and only a verified file gets the real name
+        part_path = f"{file_path}.part"
+        resume = (
+            os.path.exists(part_path) and 0 < os.path.getsize(part_path) < file_size
+        )
+        with io.FileIO(part_path, "ab" if resume else "wb") as df:
+            downloader = MediaIoBaseDownload(df, request, chunksize=G_DRIVE_CHUNK_SIZE)
+            if resume:
+                downloader._progress = os.path.getsize(part_path)
+            next_chunk = run_in_thread(downloader.next_chunk)
             complete = False
-            GDRIVE_.is_cancelled = False
             current_time = time.time()
             display_message = None
-            while not complete:
-                if GDRIVE_.is_cancelled:
-                    raise CancelProcess
-                status, complete = downloader.next_chunk()
-                if status:
+            async with transfer_slots():
+                while not complete:
+                    if GDRIVE_.is_cancelled:
+                        raise CancelProcess
+                    status, complete = await next_chunk(num_retries=3)
+                    if quiet or not status:
+                        continue
                     file_size = status.total_size
                     diff = time.time() - current_time
                     downloaded = status.resumable_progress
@@ -496,6 +551,18 @@ async def gdrive_download(
                     if display_message != current_message:
                         await gdrive.edit(current_message)
                         display_message = current_message
+        checksum = file.get("md5Checksum")
+        # google docs exports have no checksum, there is nothing to compare
+        if checksum and await run_in_thread(file_md5)(part_path) != checksum:
+            os.remove(part_path)
+            reply += (
+                "**[FILE - ERROR]**\n\n**Status : **BAD - failed to download.\n"
+                f"**Reason : **`{file_name}` doesn't match its md5 checksum."
+            )
+            return reply, f"{file_name}: md5 checksum mismatch"
+        os.replace(part_path, file_path)
+    if quiet:
+        return file_path, None
     await gdrive.edit(
         "**[FILE - DOWNLOAD]**\n\n"
         f"**Name   :** `{file_name}`\n"
@@ -557,12 +624,20 @@ async def change_permission(service, Id):
     return
 
 
+def file_md5(path):
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
 async def get_information(service, Id):
     return (
         service.files()
         .get(
             fileId=Id,
-            fields="name, id, size, mimeType, "
+            fields="name, id, size, mimeType, md5Checksum, "
             "webViewLink, webContentLink,"
             "description",
             supportsAllDrives=True,
@@ -597,9 +672,17 @@ async def create_dir(service, folder_name, dir_id=None):
     return folder
 
 
-async def upload(gdrive, service, file_path, file_name, mimeType, dir_id=None):
-    with contextlib.suppress(Exception):
-        await gdrive.edit("`Processing upload...`")
+async def upload(
+    gdrive, service, file_path, file_name, mimeType, dir_id=None, quiet=False
+):
+    """
+    Resumable upload in G_DRIVE_CHUNK_SIZE chunks sent from a worker
+    thread. The session uri is saved, so the same file going to the same
+    folder continues where it stopped, even after a restart.
+    """
+    if not quiet:
+        with contextlib.suppress(Exception):
+            await gdrive.edit("`Processing upload...`")
     if dir_id is not None:
         dir_id = [dir_id]
     elif GDRIVE_.parent_Id is not None:
@@ -612,7 +695,9 @@ async def upload(gdrive, service, file_path, file_name, mimeType, dir_id=None):
         "mimeType": mimeType,
         "parents": dir_id,
     }
-    media_body = MediaFileUpload(file_path, mimetype=mimeType, resumable=True)
+    media_body = MediaFileUpload(
+        file_path, mimetype=mimeType, chunksize=G_DRIVE_CHUNK_SIZE, resumable=True
+    )
     # Start upload process
     file = service.files().create(
         body=body,
@@ -620,43 +705,66 @@ async def upload(gdrive, service, file_path, file_name, mimeType, dir_id=None):
         fields="id, size, webContentLink",
         supportsAllDrives=True,
     )
+    key = upload_key(file_path, dir_id)
+    if session := helper.get_upload_session(key):
+        # makes the first next_chunk ask drive how much it already has
+        file.resumable_uri = session
+        file._in_error_state = True
+    http = thread_http(service)
+    next_chunk = run_in_thread(file.next_chunk)
     current_time = time.time()
     response = None
     display_message = None
-    GDRIVE_.is_cancelled = False
-    while response is None:
-        if GDRIVE_.is_cancelled:
-            raise CancelProcess
-        status, response = file.next_chunk()
-        if status:
-            file_size = status.total_size
-            diff = time.time() - current_time
-            uploaded = status.resumable_progress
-            percentage = uploaded / file_size * 100
-            speed = round(uploaded / diff, 2)
-            eta = round((file_size - uploaded) / speed)
-            prog_str = "`Uploading :`\n`[{0}{1}] {2}`".format(
-                "".join(
-                    Config.FINISHED_PROGRESS_STR
-                    for _ in range(math.floor(percentage / 10))
-                ),
-                "".join(
-                    Config.UNFINISHED_PROGRESS_STR
-                    for _ in range(10 - math.floor(percentage / 10))
-                ),
-                round(percentage, 2),
-            )
-            current_message = (
-                "**Uploading **\n\n"
-                f"**Name : **`{file_name}`\n"
-                f"**Status : **\n{prog_str}\n"
-                f"`{humanbytes(uploaded)} of {humanbytes(file_size)} "
-                f"@ {humanbytes(speed)}`\n"
-                f"**ETA** -> `{time_formatter(eta)}`"
-            )
-            if display_message != current_message:
-                await gdrive.edit(current_message)
-                display_message = current_message
+    if not quiet:
+        GDRIVE_.is_cancelled = False
+    async with transfer_slots():
+        while response is None:
+            if GDRIVE_.is_cancelled:
+                raise CancelProcess
+            try:
+                status, response = await next_chunk(http=http, num_retries=3)
+            except HttpError as e:
+                if session is None or e.resp.status not in (404, 410):
+                    raise
+                # the saved session expired, start the file from scratch
+                helper.clear_upload_session(key)
+                session = file.resumable_uri = None
+                file.resumable_progress = 0
+                file._in_error_state = False
+                continue
+            if file.resumable_uri and file.resumable_uri != session:
+                session = file.resumable_uri
+                helper.save_upload_session(key, session)
+            if status and not quiet:
+                file_size = status.total_size
+                diff = time.time() - current_time
+                uploaded = status.resumable_progress
+                percentage = uploaded / file_size * 100
+                speed = round(uploaded / diff, 2)
+                eta = round((file_size - uploaded) / speed)
+                prog_str = "`Uploading :`\n`[{0}{1}] {2}`".format(
+                    "".join(
+                        Config.FINISHED_PROGRESS_STR
+                        for _ in range(math.floor(percentage / 10))
+                    ),
+                    "".join(
+                        Config.UNFINISHED_PROGRESS_STR
+                        for _ in range(10 - math.floor(percentage / 10))
+                    ),
+                    round(percentage, 2),
+                )
+                current_message = (
+                    "**Uploading **\n\n"
+                    f"**Name : **`{file_name}`\n"
+                    f"**Status : **\n{prog_str}\n"
+                    f"`{humanbytes(uploaded)} of {humanbytes(file_size)} "
+                    f"@ {humanbytes(speed)}`\n"
+                    f"**ETA** -> `{time_formatter(eta)}`"
+                )
+                if display_message != current_message:
+                    await gdrive.edit(current_message)
+                    display_message = current_message
+    helper.clear_upload_session(key)
     file_id = response.get("id")
     file_size = response.get("size")
     downloadURL = response.get("webContentLink")
@@ -665,26 +773,56 @@ async def upload(gdrive, service, file_path, file_name, mimeType, dir_id=None):
     return int(file_size), downloadURL
 
 
-async def task_directory(gdrive, service, folder_path, dir_id=None):
-    GDRIVE_.is_cancelled = False
-    lists = os.listdir(folder_path)
-    dir_id = dir_id or GDRIVE_.parent_Id or ""
-    if len(lists) == 0:
-        return dir_id
-    for f in lists:
+async def create_tree(service, folder_path, dir_id, files):
+    "mirror the folders of folder_path on drive, collecting (file, parent id)"
+    for f in sorted(os.listdir(folder_path)):
         if GDRIVE_.is_cancelled:
             raise CancelProcess
         current_f_name = os.path.join(folder_path, f)
         if os.path.isdir(current_f_name):
             folder = await create_dir(service, f, dir_id)
-            await task_directory(gdrive, service, current_f_name, folder.get("id"))
-            returnid = folder.get("id")
+            await create_tree(service, current_f_name, folder.get("id"), files)
         else:
-            file_name = await get_raw_name(current_f_name)
-            mimeType = await get_mimeType(current_f_name)
-            await upload(gdrive, service, current_f_name, file_name, mimeType, dir_id)
-            returnid = dir_id
-    return returnid
+            files.append((current_f_name, dir_id))
+    return files
+
+
+async def task_directory(gdrive, service, folder_path, dir_id=None):
+    """
+    Upload a folder, G_DRIVE_PARALLEL files at a time. Folders are created
+    first since the files need their ids.
+    """
+    GDRIVE_.is_cancelled = False
+    dir_id = dir_id or GDRIVE_.parent_Id or ""
+    files = await create_tree(service, folder_path, dir_id, [])
+    if not files:
+        return dir_id
+    done = 0
+    last_edit = 0
+
+    async def send(file_path, parent):
+        nonlocal done, last_edit
+        file_name = await get_raw_name(file_path)
+        mimeType = await get_mimeType(file_path)
+        await upload(gdrive, service, file_path, file_name, mimeType, parent, True)
+        done += 1
+        if time.time() - last_edit > 5 or done == len(files):
+            last_edit = time.time()
+            with contextlib.suppress(Exception):
+                await gdrive.edit(
+                    "**Uploading folder**\n\n"
+                    f"**Name : **`{await get_raw_name(folder_path)}`\n"
+                    f"**Status : **`{done} of {len(files)} files uploaded`"
+                )
+
+    tasks = [asyncio.create_task(send(*item)) for item in files]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return dir_id
 
 
 async def gshare(service, event, url):
@@ -1280,6 +1418,7 @@ async def cancel_process(gdrive):
 @catub.cat_cmd(
     pattern="ugd(?:\s|$)([\s\S]*)",
     command=("ugd", plugin_category),
+    job="transfer",
     info={
         "header": "upload files/folders to gdrive.",
         "description": "Upload file from local or uri/url/drivelink into google drive."
@@ -1525,6 +1664,7 @@ async def set_upload_folder(gdrive):
 @catub.cat_cmd(
     pattern="gdown ?(-u)? ([\s\S]*)",
     command=("gdown", plugin_category),
+    job="transfer",
     info={
         "header": "To download files form gdrive.",
         "description": "G-Drive File Downloader Plugin For Userbot. only gdrive files are supported now",
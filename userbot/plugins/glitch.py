@@ -10,13 +10,11 @@
 
 import os
 
-from glitch_this import ImageGlitcher
-from PIL import Image
-
 from userbot import Convert, catub
 
 from ..core.managers import edit_delete
 from ..helpers import reply_id, unsavegif
+from ..helpers.functions import glitch_image
 
 plugin_category = "fun"
 
@@ -56,26 +54,10 @@ async def glitch(event):
         return await edit_delete(
             glitch_file[0], "__Unable to extract image from the replied message.__"
         )
-    glitcher = ImageGlitcher()
-    img = Image.open(glitch_file[1])
+    glitched = await glitch_image(glitch_file[1], catinput, not cmd)
     if cmd:
-        glitched = os.path.join("./temp", "glitched.webp")
-        glitch_img = glitcher.glitch_image(img, catinput, color_offset=True)
-        glitch_img.save(glitched)
         await event.client.send_file(event.chat_id, glitched, reply_to=catid)
     else:
-        glitched = os.path.join("./temp", "glitched.gif")
-        glitch_img = glitcher.glitch_image(img, catinput, color_offset=True, gif=True)
-        DURATION = 200
-        LOOP = 0
-        glitch_img[0].save(
-            glitched,
-            format="GIF",
-            append_images=glitch_img[1:],
-            save_all=True,
-            duration=DURATION,
-            loop=LOOP,
-        )
         sandy = await event.client.send_file(event.chat_id, glitched, reply_to=catid)
         await unsavegif(event, sandy)
     await glitch_file[0].delete()
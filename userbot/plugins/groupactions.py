@@ -226,6 +226,7 @@ async def _(event):
 @catub.cat_cmd(
     pattern="zombies( -r| )? ?([\s\S]*)",
     command=("zombies", plugin_category),
+    job="admin",
     info={
         "header": "To check deleted accounts and clean",
         "description": "Searches for deleted accounts in a group. Use `.zombies clean` to remove deleted accounts from the group.",
@@ -471,6 +471,7 @@ async def info(event):
 @catub.cat_cmd(
     pattern="grpstat(s)?(?:\s|$)([\s\S]*)",
     command=("grpstats", plugin_category),
+    job="scan",
     info={
         "header": "To get stats of the group.",
         "description": "Will show you the list of users who are more active in last required number of messages.",
@@ -12,7 +12,8 @@ from telethon import functions
 from userbot import catub
 
 from ..Config import Config
-from ..core import CMD_INFO, PLG_INFO
+from ..core import PLG_INFO
+from ..core.cmdindex import search_commands
 from ..core.cmdinfo import cmdinfo, cmdlist, grpinfo, plugininfo
 from ..core.managers import edit_delete, edit_or_reply
 from ..helpers.utils import reply_id
@@ -108,7 +109,7 @@ async def _(event):
 async def _(event):
     "To search commands."
     cmd = event.pattern_match.group(1)
-    if found := [i for i in sorted(list(CMD_INFO)) if cmd in i]:
+    if found := search_commands(cmd):
         out_str = "".join(f"`{i}`    " for i in found)
         out = f"**I found {len(found)} command(s) for: **`{cmd}`\n\n{out_str}"
         out += f"\n\n__For more info check {cmdprefix}help -c <command>__"
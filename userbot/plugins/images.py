@@ -17,7 +17,7 @@ from userbot import catub
 
 from ..core.managers import edit_or_reply
 from ..helpers.google_image_download import googleimagesdownload
-from ..helpers.utils import reply_id
+from ..helpers.utils import _catutils, reply_id
 
 plugin_category = "misc"
 
@@ -66,7 +66,7 @@ async def img_sampler(event):
     }
     # passing the arguments to the function
     try:
-        paths = response.download(arguments)
+        paths = await _catutils.run_sync(response.download, arguments)
     except Exception as e:
         return await cat.edit(f"Error: \n`{e}`")
     lst = paths[0][query.replace(",", " ")]
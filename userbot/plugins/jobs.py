@@ -0,0 +1,87 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+
+import time
+
+from ..core.jobs import catjobs
+from ..core.managers import edit_delete, edit_or_reply
+from ..core.procs import heavy_limit, kill_child, running_processes
+from ..helpers.progress import time_formatter
+from . import catub
+
+plugin_category = "tools"
+
+
+@catub.cat_cmd(
+    pattern="jobs$",
+    command=("jobs", plugin_category),
+    info={
+        "header": "To list the long running commands which are running or waiting.",
+        "description": "Heavy commands like compress, chatfs, purge, gdrive and broadcasts run as jobs, only a few of each kind run at same time and the rest wait for their turn. Also lists the child processes like ffmpeg with the command that started them.",
+        "usage": "{tr}jobs",
+    },
+)
+async def list_jobs(event):
+    "To list running and queued jobs"
+    jobs = catjobs.list()
+    processes = sorted(running_processes.values(), key=lambda proc: proc.started)
+    if not jobs and not processes:
+        return await edit_delete(event, "`There are no running jobs.`")
+    text = ""
+    if jobs:
+        text += "**Jobs :**\n\n"
+        for job in jobs:
+            text += f"• `{job.id}` | `{job.name}` | __{job.category}__ | **{job.state}** for `{time_formatter(int(job.runtime)) or '0 seconds'}`\n"
+        text += "\n__Use__ `.cancel <id>` __to cancel a job.__\n\n"
+    if processes:
+        text += f"**Processes :** __(heavy limit {heavy_limit()})__\n\n"
+        for proc in processes:
+            runtime = time_formatter(int(time.time() - proc.started)) or "0 seconds"
+            text += f"• `{proc.pid}` | `{proc.owner or '-'}` | `{proc.cmd[:60]}` for `{runtime}`\n"
+        text += "\n__Use__ `.killproc <pid>` __to kill a process.__"
+    await edit_or_reply(event, text)
+
+
+@catub.cat_cmd(
+    pattern="cancel (\d+)$",
+    command=("cancel", plugin_category),
+    info={
+        "header": "To cancel a running or queued job.",
+        "usage": "{tr}cancel <job id>",
+        "examples": "{tr}cancel 3",
+    },
+)
+async def cancel_job(event):
+    "To cancel a job"
+    job_id = int(event.pattern_match.group(1))
+    if catjobs.cancel(job_id):
+        return await edit_delete(event, f"`Cancelled job {job_id}.`")
+    await edit_delete(event, f"`There is no job with id {job_id}.`")
+
+
+@catub.cat_cmd(
+    pattern="killproc (\d+)$",
+    command=("killproc", plugin_category),
+    info={
+        "header": "To kill a child process started by a command.",
+        "description": "Only processes listed in .jobs can be killed.",
+        "usage": "{tr}killproc <pid>",
+        "examples": "{tr}killproc 4321",
+    },
+)
+async def kill_process(event):
+    "To kill a child process"
+    pid = int(event.pattern_match.group(1))
+    process = running_processes.get(pid)
+    if process is None or process.returncode is not None:
+        return await edit_delete(
+            event, f"`There is no running process with pid {pid}.`"
+        )
+    kill_child(process)
+    await edit_delete(event, f"`Killed process {pid} ({process.owner or '-'}).`")
@@ -13,6 +13,7 @@ from userbot import catub
 from userbot.core.logger import logging
 
 from ..Config import Config
+from ..core.logship import logshipper
 from ..core.managers import edit_delete
 from ..helpers.tools import media_type
 from ..helpers.utils import _format
@@ -25,16 +26,6 @@ LOGS = logging.getLogger(__name__)
 plugin_category = "utils"
 
 
-class LOG_CHATS:
-    def __init__(self):
-        self.RECENT_USER = None
-        self.NEWPM = None
-        self.COUNT = 0
-
-
-LOG_CHATS_ = LOG_CHATS()
-
-
 @catub.cat_cmd(incoming=True, func=lambda e: e.is_private, edited=False, forword=None)
 async def monito_p_m_s(event):  # sourcery no-metrics
     if Config.PM_LOGGER_GROUP_ID == -100:
@@ -45,34 +36,13 @@ async def monito_p_m_s(event):  # sourcery no-metrics
     if not sender.bot:
         chat = await event.get_chat()
         if not no_log_pms_sql.is_approved(chat.id) and chat.id != 777000:
-            if LOG_CHATS_.RECENT_USER != chat.id:
-                LOG_CHATS_.RECENT_USER = chat.id
-                if LOG_CHATS_.NEWPM:
-                    if LOG_CHATS_.COUNT > 1:
-                        await LOG_CHATS_.NEWPM.edit(
-                            LOG_CHATS_.NEWPM.text.replace(
-                                "new message", f"{LOG_CHATS_.COUNT} messages"
-                            )
-                        )
-                    else:
-                        await LOG_CHATS_.NEWPM.edit(
-                            LOG_CHATS_.NEWPM.text.replace(
-                                "new message", f"{LOG_CHATS_.COUNT} message"
-                            )
-                        )
-                    LOG_CHATS_.COUNT = 0
-                LOG_CHATS_.NEWPM = await event.client.send_message(
+            if event.message:
+                logshipper.forward(
+                    event.client,
                     Config.PM_LOGGER_GROUP_ID,
-                    f"👤{_format.mentionuser(sender.first_name , sender.id)} has sent a new message \nId : `{chat.id}`",
+                    event.message,
+                    header=f"👤{_format.mentionuser(sender.first_name , sender.id)} has sent a new message \nId : `{chat.id}`",
                 )
-            try:
-                if event.message:
-                    await event.client.forward_messages(
-                        Config.PM_LOGGER_GROUP_ID, event.message, silent=True
-                    )
-                LOG_CHATS_.COUNT += 1
-            except Exception as e:
-                LOGS.warn(str(e))
 
 
 @catub.cat_cmd(incoming=True, func=lambda e: e.mentioned, edited=False, forword=None)
@@ -91,7 +61,7 @@ async def log_tagged_messages(event):
         return
     full = None
     try:
-        full = await event.client.get_entity(event.message.from_id)
+        full = await event.get_sender()
     except Exception as e:
         LOGS.info(str(e))
     messaget = await media_type(event)
@@ -106,12 +76,7 @@ async def log_tagged_messages(event):
         resalt += f"\n<b>Message : </b>{event.message.message}"
     resalt += f"\n<b>Message link: </b><a href = 'https://t.me/c/{hmm.id}/{event.message.id}'> link</a>"
     if not event.is_private:
-        await event.client.send_message(
-            Config.PM_LOGGER_GROUP_ID,
-            resalt,
-            parse_mode="html",
-            link_preview=False,
-        )
+        logshipper.notice(event.client, Config.PM_LOGGER_GROUP_ID, resalt)
 
 
 @catub.cat_cmd(
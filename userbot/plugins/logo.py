@@ -7,21 +7,21 @@
 # Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
+import asyncio
 import os
 import random
 import re
-from io import BytesIO
 
 import PIL
 import requests
 from bs4 import BeautifulSoup
-from PIL import Image, ImageDraw, ImageFont
 from telegraph import upload_file
 
 from userbot import Convert, catub
 
+from ..core import http
 from ..core.managers import edit_delete, edit_or_reply
-from ..helpers.functions import clippy
+from ..helpers.functions import clippy, render_logo
 from ..sql_helper.globals import addgvar, delgvar, gvarstatus
 from . import hmention, reply_id
 
@@ -126,72 +126,52 @@ async def very(event):  # sourcery no-metrics
     )
     rcheck = random_checker(LOGO_FONT, LOGO_FONT_COLOR, LOGO_BACKGROUND)
     if rcheck:
-        rjson = requests.get(
-            "https://raw.githubusercontent.com/TgCatUB/CatUserbot-Resources/master/Resources/Logo/resources.txt"
+        rjson = (
+            await http.get(
+                "https://raw.githubusercontent.com/TgCatUB/CatUserbot-Resources/master/Resources/Logo/resources.txt",
+                cache=3600,
+            )
         ).json()
     if count > 1 and not rcheck:
         count = 1
         catevent = await edit_or_reply(
             event, "Not using random value,Changing limit to 1.."
         )
-    output = []
-    captionlist = []
+    # render arguments, coroutines are only made once every url checked out
+    jobs = []
     for i in range(count):
         if rcheck:
             LOGO_FONT, LOGO_FONT_COLOR, LOGO_BACKGROUND = random_loader(
                 LOGO_FONT, LOGO_FONT_COLOR, LOGO_BACKGROUND, rjson
             )
         try:
-            template = requests.get(LOGO_BACKGROUND)
-            temp_img = Image.open(BytesIO(template.content))
+            template, logo = await asyncio.gather(
+                http.get(LOGO_BACKGROUND, cache=3600), http.get(LOGO_FONT, cache=3600)
+            )
         except Exception as e:
-            await edit_or_reply(catevent, f"**Bad Url:** {LOGO_BACKGROUND}\n\n{e}")
-        raw_width, raw_height = temp_img.size
-        resized_width, resized_height = (
-            (1024, int(1024 * raw_height / raw_width))
-            if raw_width > raw_height
-            else (int(1024 * raw_width / raw_height), 1024)
-        )
-        img = temp_img.convert("RGBA").resize((resized_width, resized_height))
-        draw = ImageDraw.Draw(img)
-        logo = requests.get(LOGO_FONT)
-        fontsize = int(LOGO_FONT_SIZE)
-        font = ImageFont.truetype(BytesIO(logo.content), fontsize)
-        while font.getsize(max(text.splitlines(), key=len))[0] > 0.70 * resized_width:
-            fontsize -= 1
-            font = ImageFont.truetype(BytesIO(logo.content), fontsize)
-        image_widthz, image_heightz = img.size
-        w, h = draw.textsize(text, font=font)
-        h += int(h * 0.21)
-        try:
-            draw.text(
-                (
-                    (image_widthz - w) / float(LOGO_FONT_WIDTH),
-                    (image_heightz - h) / float(LOGO_FONT_HEIGHT),
-                ),
-                text,
-                font=font,
-                fill=LOGO_FONT_COLOR,
-                stroke_width=int(LOGO_FONT_STROKE_WIDTH),
-                stroke_fill=LOGO_FONT_STROKE_COLOR,
+            return await edit_or_reply(
+                catevent, f"**Bad Url:** {LOGO_BACKGROUND}\n\n{e}"
             )
-        except OSError:
-            draw.text(
-                (
-                    (image_widthz - w) / float(LOGO_FONT_WIDTH),
-                    (image_heightz - h) / float(LOGO_FONT_HEIGHT),
-                ),
+        jobs.append(
+            (
                 text,
-                font=font,
-                fill=LOGO_FONT_COLOR,
-                stroke_width=0,
-                stroke_fill=None,
+                template.content,
+                logo.content,
+                int(LOGO_FONT_SIZE),
+                LOGO_FONT_COLOR,
+                float(LOGO_FONT_WIDTH),
+                float(LOGO_FONT_HEIGHT),
+                int(LOGO_FONT_STROKE_WIDTH),
+                LOGO_FONT_STROKE_COLOR,
+                f"badcat{i}.png",
             )
-        file_name = f"badcat{i}.png"
-        img.save(file_name, "png")
-        output.append(file_name)
-        captionlist.append("")
+        )
         LOGO_FONT_COLOR, LOGO_BACKGROUND, LOGO_FONT = loader1, loader2, loader3
+    try:
+        output = list(await asyncio.gather(*(render_logo(*job) for job in jobs)))
+    except Exception as e:
+        return await edit_or_reply(catevent, f"**Error:**\n`{e}`")
+    captionlist = [""] * len(output)
     captionlist[-1] = f"<b><i>➥ Logo generated by :- {hmention}</i></b>"
     if cmd == "":
         await event.client.send_file(
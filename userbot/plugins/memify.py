@@ -281,7 +281,7 @@ async def memes(event):
     color1 = c_list[0]
     color2 = c_list[1]
     bgcolor = catinput or "#080808"
-    asciiart(meme_file, 0.3, 1.9, outputfile, color1, color2, bgcolor)
+    await asciiart(meme_file, 0.3, 1.9, outputfile, color1, color2, bgcolor)
     await event.client.send_file(
         event.chat_id, outputfile, reply_to=catid, force_document=False
     )
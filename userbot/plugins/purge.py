@@ -211,6 +211,7 @@ async def purgeme(event):
 @catub.cat_cmd(
     pattern="purge(?:\s|$)([\s\S]*)",
     command=("purge", plugin_category),
+    job="admin",
     info={
         "header": "To purge messages from the replied message.",
         "description": "•  Deletes the x(count) amount of messages from the replied message\
@@ -13,10 +13,9 @@
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
 
-import requests
-
 from userbot import catub
 
+from ..core import http
 from ..core.logger import logging
 from ..core.managers import edit_delete
 from ..helpers.functions import age_verification, unsavegif
@@ -44,7 +43,7 @@ async def reddit_fetch(event):
     sub_r = event.pattern_match.group(1)
     subreddit_api = f"{API}/{sub_r}" if sub_r else API
     try:
-        cn = requests.get(subreddit_api)
+        cn = await http.get(subreddit_api)
         r = cn.json()
     except ValueError:
         return await edit_delete(event, "Value error!.")
@@ -16,6 +16,7 @@ import contextlib
 from userbot import catub
 
 from ..core.managers import edit_delete, edit_or_reply
+from ..core.mediacache import send_stored
 from ..helpers.utils import reply_id
 from ..sql_helper.snip_sql import add_note, get_note, get_notes, rm_note
 from . import BOTLOG, BOTLOG_CHATID, get_message_link
@@ -37,15 +38,17 @@ async def incom_note(event):
             message_id_to_reply = await reply_id(event)
             if note:
                 if note.f_mesg_id:
-                    msg_o = await event.client.get_messages(
-                        entity=BOTLOG_CHATID, ids=int(note.f_mesg_id)
-                    )
                     await event.delete()
-                    await event.client.send_message(
-                        event.chat_id,
-                        msg_o,
-                        reply_to=message_id_to_reply,
-                        link_preview=False,
+                    await send_stored(
+                        event.client,
+                        BOTLOG_CHATID,
+                        note.f_mesg_id,
+                        lambda msg_o: event.client.send_message(
+                            event.chat_id,
+                            msg_o,
+                            reply_to=message_id_to_reply,
+                            link_preview=False,
+                        ),
                     )
                 elif note.reply:
                     await event.delete()
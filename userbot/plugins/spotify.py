@@ -524,7 +524,7 @@ async def telegraph_lyrics(tittle, artist):
         result = "<h1>Set GENIUS_API_TOKEN in heroku vars for functioning of this command.<br>‌‌‎ <br>Check out this <a href = https://graph.org/How-to-get-Genius-API-Token-04-26>Tutorial</a></h1>"
     else:
         try:
-            album, content = LyricsGen.lyrics(tittle, artist)
+            album, content = await LyricsGen.get_lyrics(tittle, artist)
             content = (
                 content.replace("\n", "<br>")
                 .replace("<br><br>", "<br>‌‌‎ <br>")
@@ -11,12 +11,16 @@ import asyncio
 import base64
 import contextlib
 import io
-import math
+import itertools
 import os
 import random
 import re
+import shutil
 import string
+import tempfile
+import time
 import urllib.request
+from collections import deque
 
 import cloudscraper
 import emoji as catemoji
@@ -28,17 +32,15 @@ from telethon.tl import functions, types
 from telethon.tl.functions.contacts import UnblockRequest as unblock
 from telethon.tl.functions.messages import GetStickerSetRequest
 from telethon.tl.functions.messages import ImportChatInviteRequest as Get
-from telethon.tl.types import (
-    DocumentAttributeFilename,
-    DocumentAttributeSticker,
-    InputStickerSetID,
-)
+from telethon.tl.types import DocumentAttributeSticker, InputStickerSetID
 
 from userbot import Convert, catub
 
+from ..core import http
 from ..core.managers import edit_delete, edit_or_reply
-from ..helpers.functions import crop_and_divide
+from ..helpers.functions import crop_and_divide, resize_sticker, sticker_png
 from ..helpers.tools import media_type, meme_type
+from ..helpers.utils import _catutils
 from ..sql_helper.globals import gvarstatus
 
 plugin_category = "fun"
@@ -48,6 +50,10 @@ plugin_category = "fun"
 
 combot_stickers_url = "https://combot.org/telegram/stickers?q="
 
+# stickers pkang downloads/converts ahead of the one being added and seconds between status edits
+PKANG_WORKERS = 8
+PKANG_EDIT_DELAY = 5
+
 EMOJI_SEN = [
     "Можно отправить несколько смайлов в одном сообщении, однако мы рекомендуем использовать не больше одного или двух на каждый стикер.",
     "يمكنك إرسال قائمة بعدة رموز في رسالة واحدة، لكن أنصحك بعدم إرسال أكثر من رمزين للملصق الواحد.",
@@ -121,26 +127,23 @@ async def delpack(catevent, conv, args, packname):
 
 async def resize_photo(photo):
     """Resize the given photo to 512x512"""
-    image = Image.open(photo)
-    if (image.width and image.height) < 512:
-        size1 = image.width
-        size2 = image.height
-        if image.width > image.height:
-            scale = 512 / size1
-            size1new = 512
-            size2new = size2 * scale
+    return resize_sticker(Image.open(photo))
+
+
+async def send_sticker(conv, is_video, is_anim, stfile):
+    "send the sticker file, stfile holds it when it was prepared in memory"
+    prepared = getattr(stfile, "name", None)
+    if is_video:
+        await conv.send_file(stfile if prepared else "animate.webm")
+    elif is_anim:
+        if prepared:
+            await conv.send_file(stfile)
         else:
-            scale = 512 / size2
-            size1new = size1 * scale
-            size2new = 512
-        size1new = math.floor(size1new)
-        size2new = math.floor(size2new)
-        sizenew = (size1new, size2new)
-        image = image.resize(sizenew)
+            await conv.send_file("AnimatedSticker.tgs")
+            os.remove("AnimatedSticker.tgs")
     else:
-        maxsize = (512, 512)
-        image.thumbnail(maxsize)
-    return image
+        stfile.seek(0)
+        await conv.send_file(stfile, force_document=True)
 
 
 async def newpacksticker(
@@ -168,14 +171,7 @@ async def newpacksticker(
     await conv.send_message(packnick)
     await conv.get_response()
     await args.client.send_read_acknowledge(conv.chat_id)
-    if is_video:
-        await conv.send_file("animate.webm")
-    elif is_anim:
-        await conv.send_file("AnimatedSticker.tgs")
-        os.remove("AnimatedSticker.tgs")
-    else:
-        stfile.seek(0)
-        await conv.send_file(stfile, force_document=True)
+    await send_sticker(conv, is_video, is_anim, stfile)
     rsp = await conv.get_response()
     if not verify_cond(EMOJI_SEN, rsp.text):
         await catevent.edit(
@@ -252,15 +248,9 @@ async def add_to_pack(
                 otherpack=True,
                 pkang=pkang,
             )
-    if is_video:
-        await conv.send_file("animate.webm")
+    await send_sticker(conv, is_video, is_anim, stfile)
+    if is_video and not getattr(stfile, "name", None):
         os.remove("animate.webm")
-    elif is_anim:
-        await conv.send_file("AnimatedSticker.tgs")
-        os.remove("AnimatedSticker.tgs")
-    else:
-        stfile.seek(0)
-        await conv.send_file(stfile, force_document=True)
     rsp = await conv.get_response()
     if not verify_cond(EMOJI_SEN, rsp.message):
         await catevent.edit(
@@ -276,6 +266,45 @@ async def add_to_pack(
     return (pack, packname) if pkang else (None, packname, emoji)
 
 
+async def prepare_sticker(event, document, index, workdir):
+    "download and convert one sticker of a pack into an in-memory file"
+    emoji = None
+    for attribute in document.attributes:
+        if isinstance(attribute, DocumentAttributeSticker):
+            emoji = attribute.alt
+    if "image" in document.mime_type.split("/"):
+        data = await event.client.download_media(document, bytes)
+        stfile = io.BytesIO(await sticker_png(data))
+        stfile.name = "sticker.png"
+        return stfile, emoji or "😂", False, False
+    if "tgsticker" in document.mime_type:
+        stfile = io.BytesIO(await event.client.download_media(document, bytes))
+        stfile.name = "AnimatedSticker.tgs"
+        return stfile, emoji or "😂", True, False
+    if "video/webm" not in document.mime_type:
+        return None
+    if document.size <= 261120:
+        stfile = io.BytesIO(await event.client.download_media(document, bytes))
+    else:
+        # too big for a video sticker, re-encode it like Convert.to_webm
+        source = await event.client.download_media(
+            document, os.path.join(workdir, f"{index}_src.webm")
+        )
+        output = os.path.join(workdir, f"{index}.webm")
+        try:
+            await _catutils.runcmd(
+                f"ffmpeg -y -to 00:00:02.900 -i '{source}' -vf scale=512:512:force_original_aspect_ratio=decrease -c:v libvpx-vp9 -crf 30 -b:v 560k -maxrate 560k -bufsize 256k -an '{output}'"
+            )
+            with open(output, "rb") as f:
+                stfile = io.BytesIO(f.read())
+        finally:
+            for path in (source, output):
+                if os.path.exists(path):
+                    os.remove(path)
+    stfile.name = "animate.webm"
+    return stfile, emoji or "😂", False, True
+
+
 @catub.cat_cmd(
     pattern="kang(?:\s|$)([\s\S]*)",
     command=("kang", plugin_category),
@@ -487,11 +516,7 @@ async def pack_kang(event):  # sourcery no-metrics
             username = user.first_name
         except UnicodeDecodeError:
             username = f"cat_{user.id}"
-    photo = None
     userid = user.id
-    is_anim = False
-    is_video = False
-    emoji = None
     reply = await event.get_reply_message()
     cat = base64.b64decode("QUFBQUFGRV9vWjVYVE5fUnVaaEtOdw==")
     if (
@@ -526,7 +551,6 @@ async def pack_kang(event):  # sourcery no-metrics
             catevent,
             "`I guess this sticker is not part of any pack. So, i cant kang this sticker pack try kang for this sticker`",
         )
-    kangst = 1
     reqd_sticker_set = await event.client(
         functions.messages.GetStickerSetRequest(
             stickerset=types.InputStickerSetShortName(
@@ -536,89 +560,68 @@ async def pack_kang(event):  # sourcery no-metrics
         )
     )
     noofst = get_stickerset.set.count
+    splat = ("".join(event.text.split(maxsplit=1)[1:])).split()
+    if len(splat) > 1:
+        return await edit_delete(
+            catevent,
+            "`Sorry the given name cant be used for pack or there is no pack with that name`",
+        )
+    pack = splat[0] if splat else 1
+    with contextlib.suppress(BaseException):
+        await event.client(Get(cat))
     blablapacks = []
     blablapacknames = []
-    pack = None
-    for message in reqd_sticker_set.documents:
-        if "image" in message.mime_type.split("/"):
-            await edit_or_reply(
-                catevent,
-                f"`This sticker pack is kanging now . Status of kang process : {kangst}/{noofst}`",
-            )
-            photo = io.BytesIO()
-            await event.client.download_media(message, photo)
-            if (
-                DocumentAttributeFilename(file_name="sticker.webp")
-                in message.attributes
-            ):
-                emoji = message.attributes[1].alt
-        elif "tgsticker" in message.mime_type:
-            await edit_or_reply(
-                catevent,
-                f"`This sticker pack is kanging now . Status of kang process : {kangst}/{noofst}`",
-            )
-            await event.client.download_media(message, "AnimatedSticker.tgs")
-            attributes = message.attributes
-            for attribute in attributes:
-                if isinstance(attribute, DocumentAttributeSticker):
-                    emoji = attribute.alt
-            is_anim = True
-            photo = 1
-        elif "video/webm" in message.mime_type:
-            await edit_or_reply(
-                catevent,
-                f"`This sticker pack is kanging now . Status of kang process : {kangst}/{noofst}`",
+    existing = set()
+    last_edit = 0
+    if not os.path.isdir("./temp"):
+        os.mkdir("./temp")
+    # private per run, so two pkangs never share converted files
+    workdir = tempfile.mkdtemp(prefix="pkang_", dir="./temp")
+    documents = enumerate(reqd_sticker_set.documents)
+    prepared = deque()
+
+    def prepare_ahead():
+        # only a small window is fetched ahead, each sticker is added to the
+        # pack and dropped before more are prepared
+        for index, document in itertools.islice(
+            documents, PKANG_WORKERS - len(prepared)
+        ):
+            prepared.append(
+                asyncio.create_task(prepare_sticker(event, document, index, workdir))
             )
-            if message.size > 261120:
-                await Convert.to_webm(
-                    event, message, dirct="./", file="animate.webm", noedits=True
+
+    try:
+        prepare_ahead()
+        kangst = 0
+        while prepared:
+            sticker = await prepared.popleft()
+            prepare_ahead()
+            kangst += 1
+            if sticker is None:
+                return await edit_delete(catevent, "`Unsupported File!`")
+            stfile, emoji, is_anim, is_video = sticker
+            if time.time() - last_edit > PKANG_EDIT_DELAY or kangst == noofst:
+                last_edit = time.time()
+                await edit_or_reply(
+                    catevent,
+                    f"`This sticker pack is kanging now . Status of kang process : {kangst}/{noofst}`",
                 )
-            else:
-                await event.client.download_media(message, "animate.webm")
-            attributes = message.attributes
-            for attribute in attributes:
-                if isinstance(attribute, DocumentAttributeSticker):
-                    emoji = attribute.alt
-            is_video = True
-            photo = 1
-        else:
-            await edit_delete(catevent, "`Unsupported File!`")
-            return
-        if photo:
-            splat = ("".join(event.text.split(maxsplit=1)[1:])).split()
-            emoji = emoji or "😂"
-            if pack is None:
-                pack = 1
-                if len(splat) == 1:
-                    pack = splat[0]
-                elif len(splat) > 1:
-                    return await edit_delete(
-                        catevent,
-                        "`Sorry the given name cant be used for pack or there is no pack with that name`",
-                    )
-            with contextlib.suppress(BaseException):
-                cat = Get(cat)
-                await event.client(cat)
             packnick = pack_nick(username, pack, is_anim, is_video)
             packname = pack_name(userid, pack, is_anim, is_video)
             cmd = "/newpack"
-            stfile = io.BytesIO()
             if is_video:
                 cmd = "/newvideo"
             elif is_anim:
                 cmd = "/newanimated"
-            else:
-                image = await resize_photo(photo)
-                stfile.name = "sticker.png"
-                image.save(stfile, "PNG")
-            response = urllib.request.urlopen(
-                urllib.request.Request(f"http://t.me/addstickers/{packname}")
-            )
-            htmlstr = response.read().decode("utf8").split("\n")
-            if (
-                "  A <strong>Telegram</strong> user has created the <strong>Sticker&nbsp;Set</strong>."
-                in htmlstr
-            ):
+            newpack = False
+            if packname not in existing:
+                response = await http.get(f"http://t.me/addstickers/{packname}")
+                htmlstr = response.text.split("\n")
+                newpack = (
+                    "  A <strong>Telegram</strong> user has created the <strong>Sticker&nbsp;Set</strong>."
+                    in htmlstr
+                )
+            if newpack:
                 async with event.client.conversation("@Stickers") as conv:
                     pack, catpackname = await newpacksticker(
                         catevent,
@@ -653,11 +656,16 @@ async def pack_kang(event):  # sourcery no-metrics
                     )
             if catpackname is None:
                 return
+            existing.add(catpackname)
             if catpackname not in blablapacks:
                 blablapacks.append(catpackname)
                 blablapacknames.append(pack)
-        kangst += 1
-        await asyncio.sleep(2)
+            await asyncio.sleep(2)
+    finally:
+        for task in prepared:
+            task.cancel()
+        await asyncio.gather(*prepared, return_exceptions=True)
+        shutil.rmtree(workdir, ignore_errors=True)
     result = "`This sticker pack is kanged into the following your sticker pack(s):`\n"
     for i in enumerate(blablapacks):
         result += (
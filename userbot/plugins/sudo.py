@@ -23,6 +23,7 @@ from ..helpers.utils import get_user_from_event, mentionuser
 from ..sql_helper import global_collectionjson as sql
 from ..sql_helper import global_list as sqllist
 from ..sql_helper.globals import addgvar, delgvar, gvarstatus
+from ..utils import reload_plugins
 
 plugin_category = "tools"
 
@@ -65,13 +66,13 @@ async def chat_blacklist(event):
         text = "__Enabled sudo successfully.__\n"
         if len(sudousers) != 0:
             text += (
-                "**Bot is reloading to apply the changes. Please wait for a minute**"
+                "**Reloading plugins to apply the changes.**"
             )
             msg = await edit_or_reply(
                 event,
                 text,
             )
-            return await event.client.reload(msg)
+            return await reload_plugins(msg)
         text += "**You haven't added anyone to your sudo yet.**"
         return await edit_or_reply(
             event,
@@ -82,13 +83,13 @@ async def chat_blacklist(event):
         text = "__Disabled sudo successfully.__"
         if len(sudousers) != 0:
             text += (
-                "**Bot is reloading to apply the changes. Please wait for a minute**"
+                "**Reloading plugins to apply the changes.**"
             )
             msg = await edit_or_reply(
                 event,
                 text,
             )
-            return await event.client.reload(msg)
+            return await reload_plugins(msg)
         text += "**You haven't added any chat to blacklist yet.**"
         return await edit_or_reply(
             event,
@@ -132,9 +133,9 @@ async def add_sudo_user(event):
     sql.del_collection("sudousers_list")
     sql.add_collection("sudousers_list", sudousers, {})
     output = f"{mentionuser(userdata['chat_name'],userdata['chat_id'])} __is Added to your sudo users.__\n"
-    output += "**Bot is reloading to apply the changes. Please wait for a minute**"
+    output += "**Reloading plugins to apply the changes.**"
     msg = await edit_or_reply(event, output)
-    await event.client.reload(msg)
+    await reload_plugins(msg)
 
 
 @catub.cat_cmd(
@@ -163,9 +164,9 @@ async def _(event):
     sql.del_collection("sudousers_list")
     sql.add_collection("sudousers_list", sudousers, {})
     output = f"{mentionuser(get_display_name(replied_user),replied_user.id)} __is removed from your sudo users.__\n"
-    output += "**Bot is reloading to apply the changes. Please wait for a minute**"
+    output += "**Reloading plugins to apply the changes.**"
     msg = await edit_or_reply(event, output)
-    await event.client.reload(msg)
+    await reload_plugins(msg)
 
 
 @catub.cat_cmd(
@@ -284,12 +285,12 @@ async def _(event):  # sourcery no-metrics  # sourcery skip: low-code-quality
         sqllist.add_to_list("sudo_enabled_cmds", cmd)
     result = f"__Successfully enabled __ `{len(loadcmds)}` __ for CatUserbot sudo.__\n"
     output = (
-        result + "**Bot is reloading to apply the changes. Please wait for a minute**\n"
+        result + "**Reloading plugins to apply the changes.**\n"
     )
     if errors != "":
         output += "\n**Errors:**\n" + errors
     msg = await edit_or_reply(catevent, output)
-    await event.client.reload(msg)
+    await reload_plugins(msg)
 
 
 @catub.cat_cmd(
@@ -378,12 +379,12 @@ async def _(event):  # sourcery no-metrics  # sourcery skip: low-code-quality
             sqllist.rm_from_list("sudo_enabled_cmds", cmd)
     result = f"__Successfully disabled __ `{count}` __ for CatUserbot sudo.__\n"
     output = (
-        result + "**Bot is reloading to apply the changes. Please wait for a minute**\n"
+        result + "**Reloading plugins to apply the changes.**\n"
     )
     if errors != "":
         output += "\n**Errors:**\n" + errors
     msg = await edit_or_reply(catevent, output)
-    await event.client.reload(msg)
+    await reload_plugins(msg)
 
 
 @catub.cat_cmd(
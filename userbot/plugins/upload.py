@@ -140,6 +140,7 @@ async def upload(path, event, udir_event, catflag=None):  # sourcery no-metrics
 @catub.cat_cmd(
     pattern="upload( -f)? ([\s\S]*)",
     command=("upload", plugin_category),
+    job="transfer",
     info={
         "header": "To upload files from server to telegram",
         "description": "To upload files which are downloaded in your bot.",
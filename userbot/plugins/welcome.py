@@ -18,6 +18,7 @@ from userbot import catub
 from userbot.core.logger import logging
 
 from ..core.managers import edit_delete, edit_or_reply
+from ..core.mediacache import send_stored, stored_message
 from ..sql_helper.globals import addgvar, delgvar, gvarstatus
 from ..sql_helper.welcome_sql import (
     add_welcome_setting,
@@ -48,8 +49,8 @@ async def _(event):  # sourcery no-metrics  # sourcery skip: low-code-quality
         chat = await event.get_chat()
         me = await event.client.get_me()
         title = get_display_name(await event.get_chat()) or "this chat"
-        participants = await event.client.get_participants(chat)
-        count = len(participants)
+        participants = await event.client.get_participants(chat, limit=0)
+        count = participants.total
         mention = f"<a href='tg://user?id={a_user.id}'>{a_user.first_name}</a>"
         my_mention = f"<a href='tg://user?id={me.id}'>{me.first_name}</a>"
         first = a_user.first_name
@@ -61,40 +62,42 @@ async def _(event):  # sourcery no-metrics  # sourcery skip: low-code-quality
         my_last = me.last_name
         my_fullname = f"{my_first} {my_last}" if my_last else my_first
         my_username = f"@{me.username}" if me.username else my_mention
-        file_media = None
-        current_saved_welcome_message = None
-        if cws:
-            if cws.f_mesg_id:
-                msg_o = await event.client.get_messages(
-                    entity=BOTLOG_CHATID, ids=int(cws.f_mesg_id)
-                )
-                file_media = msg_o.media
-                current_saved_welcome_message = msg_o.message
-                link_preview = True
-            elif cws.reply:
-                current_saved_welcome_message = cws.reply
-                link_preview = False
-        current_message = await event.reply(
-            current_saved_welcome_message.format(
-                mention=mention,
-                title=title,
-                count=count,
-                first=first,
-                last=last,
-                fullname=fullname,
-                username=username,
-                userid=userid,
-                my_first=my_first,
-                my_last=my_last,
-                my_fullname=my_fullname,
-                my_username=my_username,
-                my_mention=my_mention,
-            ),
-            file=file_media,
-            parse_mode="html",
-            link_preview=link_preview,
-        )
-        update_previous_welcome(event.chat_id, current_message.id)
+
+        async def send_welcome(text, file=None, link_preview=False):
+            return await event.reply(
+                text.format(
+                    mention=mention,
+                    title=title,
+                    count=count,
+                    first=first,
+                    last=last,
+                    fullname=fullname,
+                    username=username,
+                    userid=userid,
+                    my_first=my_first,
+                    my_last=my_last,
+                    my_fullname=my_fullname,
+                    my_username=my_username,
+                    my_mention=my_mention,
+                ),
+                file=file,
+                parse_mode="html",
+                link_preview=link_preview,
+            )
+
+        if cws.f_mesg_id:
+            current_message = await send_stored(
+                event.client,
+                BOTLOG_CHATID,
+                cws.f_mesg_id,
+                lambda msg_o: send_welcome(msg_o.message, msg_o.media, True),
+            )
+        elif cws.reply:
+            current_message = await send_welcome(cws.reply)
+        else:
+            return
+        if current_message:
+            update_previous_welcome(event.chat_id, current_message.id)
 
 
 @catub.cat_cmd(
@@ -190,9 +193,7 @@ async def show_welcome(event):
     if not cws:
         return await edit_or_reply(event, "`No welcome message saved here.`")
     if cws.f_mesg_id:
-        msg_o = await event.client.get_messages(
-            entity=BOTLOG_CHATID, ids=int(cws.f_mesg_id)
-        )
+        msg_o = await stored_message(event.client, BOTLOG_CHATID, cws.f_mesg_id)
         await edit_or_reply(
             event, "`I am currently welcoming new users with this welcome note.`"
         )
@@ -49,3 +49,35 @@ def clear_credentials(user):
         SESSION.delete(saved_credentials)
         SESSION.commit()
         return True
+
+
+class GoogleDriveUpload(BASE):
+    __tablename__ = "gdrive_uploads"
+    key = Column(String(40), primary_key=True)
+    uri = Column(Text, nullable=False)
+
+    def __init__(self, key, uri):
+        self.key = key
+        self.uri = uri
+
+
+GoogleDriveUpload.__table__.create(checkfirst=True)
+
+
+def save_upload_session(key, uri):
+    SESSION.merge(GoogleDriveUpload(key, uri))
+    SESSION.commit()
+
+
+def get_upload_session(key):
+    try:
+        session = SESSION.query(GoogleDriveUpload).get(key)
+        return session.uri if session is not None else None
+    finally:
+        SESSION.close()
+
+
+def clear_upload_session(key):
+    if session := SESSION.query(GoogleDriveUpload).get(key):
+        SESSION.delete(session)
+        SESSION.commit()
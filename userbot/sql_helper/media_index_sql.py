@@ -0,0 +1,60 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+
+import json
+
+from sqlalchemy import Column, Integer, String, UnicodeText
+
+from . import BASE, SESSION
+
+
+class MediaIndex(BASE):
+    __tablename__ = "cat_mediaindex"
+    chat_id = Column(String(32), primary_key=True)
+    last_msg_id = Column(Integer, default=0)
+    msg_count = Column(Integer, default=0)
+    data = Column(UnicodeText)
+
+    def __init__(self, chat_id, last_msg_id, msg_count, data):
+        self.chat_id = str(chat_id)
+        self.last_msg_id = last_msg_id
+        self.msg_count = msg_count
+        self.data = data
+
+
+MediaIndex.__table__.create(checkfirst=True)
+
+
+def get_media_index(chat_id):
+    "returns (last_msg_id, msg_count, data) or None if the chat was never indexed"
+    try:
+        if index := SESSION.query(MediaIndex).get(str(chat_id)):
+            return index.last_msg_id, index.msg_count, json.loads(index.data)
+        return None
+    finally:
+        SESSION.close()
+
+
+def set_media_index(chat_id, last_msg_id, msg_count, data):
+    index = SESSION.query(MediaIndex).get(str(chat_id))
+    if index:
+        index.last_msg_id = last_msg_id
+        index.msg_count = msg_count
+        index.data = json.dumps(data)
+    else:
+        SESSION.add(MediaIndex(chat_id, last_msg_id, msg_count, json.dumps(data)))
+    SESSION.commit()
+
+
+def del_media_index(chat_id):
+    if index := SESSION.query(MediaIndex).get(str(chat_id)):
+        SESSION.delete(index)
+        SESSION.commit()
+        return True
+    return False
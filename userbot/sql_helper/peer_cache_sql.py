@@ -0,0 +1,53 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~# CatUserBot #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+# Copyright (C) 2020-2023 by TgCatUB@Github.
+
+# This file is part of: https://github.com/TgCatUB/catuserbot
+# and is released under the "GNU v3.0 License Agreement".
+
+# Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
+from sqlalchemy import Column, String, UnicodeText
+
+from . import BASE, SESSION
+
+
+class PeerCache(BASE):
+    __tablename__ = "cat_peercache"
+    peer_id = Column(String(32), primary_key=True)
+    access_hash = Column(String(32))
+    username = Column(String(64))
+    phone = Column(String(32))
+    name = Column(UnicodeText)
+
+    def __init__(self, peer_id, access_hash, username, phone, name):
+        self.peer_id = str(peer_id)
+        self.access_hash = str(access_hash)
+        self.username = username
+        self.phone = phone
+        self.name = name
+
+
+PeerCache.__table__.create(checkfirst=True)
+
+
+def get_peers():
+    "all saved peers as (id, access_hash, username, phone, name) rows"
+    try:
+        return [
+            (
+                int(peer.peer_id),
+                int(peer.access_hash),
+                peer.username,
+                peer.phone,
+                peer.name,
+            )
+            for peer in SESSION.query(PeerCache).all()
+        ]
+    finally:
+        SESSION.close()
+
+
+def save_peers(rows):
+    for peer_id, access_hash, username, phone, name in rows:
+        SESSION.merge(PeerCache(peer_id, access_hash, username, phone, name))
+    SESSION.commit()
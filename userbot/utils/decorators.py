@@ -9,7 +9,6 @@
 
 import contextlib
 import datetime
-import inspect
 import re
 import sys
 import traceback
@@ -30,9 +29,7 @@ LOGS = logging.getLogger(__name__)
 
 def admin_cmd(pattern=None, command=None, **args):  # sourcery no-metrics
     args["func"] = lambda e: e.via_bot_id is None
-    stack = inspect.stack()
-    previous_stack_frame = stack[1]
-    file_test = Path(previous_stack_frame.filename)
+    file_test = Path(sys._getframe(1).f_code.co_filename)
     file_test = file_test.stem.replace(".py", "")
     allow_sudo = args.get("allow_sudo", False)
     if pattern is not None:
@@ -81,9 +78,7 @@ def admin_cmd(pattern=None, command=None, **args):  # sourcery no-metrics
 def sudo_cmd(pattern=None, command=None, **args):  # sourcery no-metrics
     # sourcery skip: low-code-quality
     args["func"] = lambda e: e.via_bot_id is None
-    stack = inspect.stack()
-    previous_stack_frame = stack[1]
-    file_test = Path(previous_stack_frame.filename)
+    file_test = Path(sys._getframe(1).f_code.co_filename)
     file_test = file_test.stem.replace(".py", "")
     allow_sudo = args.get("allow_sudo", False)
     # get the pattern from the decorator
@@ -182,9 +177,7 @@ def errors_handler(func):
 
 def register(**args):
     args["func"] = lambda e: e.via_bot_id is None
-    stack = inspect.stack()
-    previous_stack_frame = stack[1]
-    file_test = Path(previous_stack_frame.filename)
+    file_test = Path(sys._getframe(1).f_code.co_filename)
     file_test = file_test.stem.replace(".py", "")
     pattern = args.get("pattern", None)
     disable_edited = args.get("disable_edited", True)
@@ -236,9 +229,7 @@ def register(**args):
 
 def command(**args):
     args["func"] = lambda e: e.via_bot_id is None
-    stack = inspect.stack()
-    previous_stack_frame = stack[1]
-    file_test = Path(previous_stack_frame.filename)
+    file_test = Path(sys._getframe(1).f_code.co_filename)
     file_test = file_test.stem.replace(".py", "")
     pattern = args.get("pattern", None)
     allow_sudo = args.get("allow_sudo", None)
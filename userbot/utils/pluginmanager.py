@@ -7,23 +7,40 @@
 # Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
+import asyncio
 import contextlib
+import copy
 import importlib
 import sys
+import time
+from collections import defaultdict
 from pathlib import Path
 
 from userbot import CMD_HELP, LOAD_PLUG
 
 from ..Config import Config
-from ..core import LOADED_CMDS, PLG_INFO
+from ..core import CMD_INFO, LOADED_CMDS, PLG_INFO
+from ..core.cmdindex import clear_search_index
+from ..core.helpmenu import clear_help_cache
 from ..core.logger import logging
+from ..core import client as _client
+from ..core.data import sudo_enabled_cmds
+from ..core.manifest import lazy_entry, lazy_safe
 from ..core.managers import edit_delete, edit_or_reply
+from ..core.pool import run_in_thread
 from ..core.session import catub
 from ..helpers.utils import _catutils, _format, install_pip, reply_id
 from .decorators import admin_cmd, sudo_cmd
 
 LOGS = logging.getLogger("CatUserbot")
 
+# plugins registered from the manifest but not imported yet -> plugin_path
+LAZY_PLUGINS = {}
+# plugin -> folder it was imported from, None for userbot/plugins
+PLUGIN_PATHS = {}
+# plugin -> (seconds spent importing it, third party packages it pulled in first)
+IMPORT_PROFILE = {}
+
 
 def load_module(shortname, plugin_path=None):
     if shortname.startswith("__"):
@@ -33,10 +50,9 @@ def load_module(shortname, plugin_path=None):
     else:
         if plugin_path is None:
             path = Path(f"userbot/plugins/{shortname}.py")
-            name = f"userbot.plugins.{shortname}"
         else:
             path = Path((f"{plugin_path}/{shortname}.py"))
-            name = f"{plugin_path}/{shortname}".replace("/", ".")
+        name = _module_name(shortname, plugin_path)
         checkplugins(path)
         spec = importlib.util.spec_from_file_location(name, path)
         mod = importlib.util.module_from_spec(spec)
@@ -56,12 +72,117 @@ def load_module(shortname, plugin_path=None):
         mod.tgbot = catub.tgbot
         mod.logger = logging.getLogger(shortname)
         mod.borg = catub
+        before = set(sys.modules)
+        start = time.perf_counter()
         spec.loader.exec_module(mod)
+        IMPORT_PROFILE[shortname] = (
+            time.perf_counter() - start,
+            sorted(
+                {
+                    module.split(".")[0]
+                    for module in sys.modules.keys() - before
+                    if not module.startswith("userbot")
+                }
+            ),
+        )
         # for imports
         sys.modules[f"userbot.plugins.{shortname}"] = mod
+        PLUGIN_PATHS[shortname] = plugin_path
+        clear_help_cache()
+        clear_search_index()
         LOGS.info(f"Successfully imported {shortname}")
 
 
+def load_lazy_module(shortname, entry, plugin_path=None):
+    "register stub handlers from the manifest, the plugin is imported on first use"
+    handlers = defaultdict(int)
+    for spec in entry["commands"]:
+        cmd = spec["command"][0]
+        stub = _lazy_stub(shortname, cmd, handlers[cmd])
+        stub.__doc__ = spec["doc"]
+        handlers[cmd] += 1
+        catub.cat_cmd(
+            pattern=spec["pattern"],
+            command=spec["command"],
+            # cat_cmd formats the help in place, keep the manifest entry intact
+            info=copy.deepcopy(spec["info"]),
+            allow_sudo=spec["allow_sudo"],
+            edited=spec["edited"],
+            forword=spec["forword"],
+            public=spec["public"],
+            plugin=shortname,
+            **spec["kwargs"],
+        )(stub)
+    LAZY_PLUGINS[shortname] = plugin_path
+    PLUGIN_PATHS[shortname] = plugin_path
+    clear_help_cache()
+    clear_search_index()
+    LOGS.info(f"Successfully registered {shortname} (lazy)")
+
+
+def _drop_plugin(shortname):
+    remove_plugin(shortname)
+    for cmd in PLG_INFO.pop(shortname, []):
+        CMD_INFO.pop(cmd, None)
+
+
+async def import_lazy_plugin(shortname):
+    """
+    Swap the stubs of a lazy plugin for the real module. If the import fails
+    the stubs go back, so the next use tries again.
+    """
+    if shortname not in LAZY_PLUGINS:
+        return
+    plugin_path = LAZY_PLUGINS.pop(shortname)
+    file = _plugin_file(shortname)
+    _drop_plugin(shortname)
+    try:
+        try:
+            load_module(shortname, plugin_path=plugin_path)
+        except ModuleNotFoundError as e:
+            _drop_plugin(shortname)
+            await run_in_thread(install_pip)(e.name)
+            load_module(shortname, plugin_path=plugin_path)
+    except BaseException:
+        _drop_plugin(shortname)
+        if entry := lazy_entry(shortname, file):
+            load_lazy_module(shortname, entry, plugin_path=plugin_path)
+        raise
+
+
+def _detach_handlers():
+    """
+    Telethon iterates the live handler list while dispatching an update, so
+    swapping handlers from inside one would skip or repeat others. Mutate a
+    copy instead, the update in flight keeps walking the old list.
+    """
+    for client in (catub, catub.tgbot):
+        if client is not None:
+            client._event_builders = list(client._event_builders)
+
+
+def _lazy_stub(shortname, cmd, index):
+    async def stub(event):
+        _detach_handlers()
+        await import_lazy_plugin(shortname)
+        handlers = LOADED_CMDS.get(cmd, [])
+        if index < len(handlers):
+            await handlers[index](event)
+
+    return stub
+
+
+def import_profile(names=None, limit=10):
+    "slowest plugin imports, like python -X importtime but grouped by plugin"
+    profile = [
+        (name, IMPORT_PROFILE[name])
+        for name in (IMPORT_PROFILE if names is None else names)
+        if name in IMPORT_PROFILE
+    ]
+    profile.sort(key=lambda item: item[1][0], reverse=True)
+    return profile[:limit]
+
+
 def load_module_sortner(shortname):
     path = Path(f"userbot/plugins/{shortname}.py")
     checkplugins(path)
@@ -72,33 +193,118 @@ def load_module_sortner(shortname):
     LOGS.info(f"Successfully imported {shortname}")
 
 
+def _module_name(shortname, plugin_path=None):
+    if plugin_path is None:
+        return f"userbot.plugins.{shortname}"
+    return f"{plugin_path}/{shortname}".replace("/", ".")
+
+
+def _remove_module_handlers(client, names):
+    "drop handlers registered with client.on() from the given modules"
+    for i in reversed(range(len(client._event_builders))):
+        ev, cb = client._event_builders[i]
+        if getattr(cb, "__module__", None) in names:
+            del client._event_builders[i]
+
+
 def remove_plugin(shortname):
+    LAZY_PLUGINS.pop(shortname, None)
+    clear_help_cache()
+    clear_search_index()
     try:
-        cmd = []
-        if shortname in PLG_INFO:
-            cmd += PLG_INFO[shortname]
-        else:
-            cmd = [shortname]
+        # commands, plus the watchers cat_cmd keeps under the plugin name
+        cmd = PLG_INFO.get(shortname, []) + [shortname]
         for cmdname in cmd:
             if cmdname in LOADED_CMDS:
                 for i in LOADED_CMDS[cmdname]:
                     catub.remove_event_handler(i)
                 del LOADED_CMDS[cmdname]
-        return True
     except Exception as e:
         LOGS.error(e)
     with contextlib.suppress(BaseException):
         for i in LOAD_PLUG[shortname]:
             catub.remove_event_handler(i)
         del LOAD_PLUG[shortname]
+    names = {
+        f"userbot.plugins.{shortname}",
+        _module_name(shortname, PLUGIN_PATHS.get(shortname)),
+    }
     try:
-        name = f"userbot.plugins.{shortname}"
-        for i in reversed(range(len(catub._event_builders))):
-            ev, cb = catub._event_builders[i]
-            if cb.__module__ == name:
-                del catub._event_builders[i]
+        _remove_module_handlers(catub, names)
+        if catub.tgbot is not None:
+            _remove_module_handlers(catub.tgbot, names)
     except BaseException as exc:
         raise ValueError from exc
+    PLUGIN_PATHS.pop(shortname, None)
+    return True
+
+
+def _plugin_file(shortname):
+    return f"{PLUGIN_PATHS.get(shortname) or 'userbot/plugins'}/{shortname}.py"
+
+
+def reload_plugin(shortname):
+    """
+    Swap a plugin's handlers for freshly imported ones, without a restart.
+    Lazy plugins get their stubs registered again instead.
+    """
+    plugin_path = PLUGIN_PATHS.get(shortname)
+    file = _plugin_file(shortname)
+    lazy = shortname in LAZY_PLUGINS
+    _drop_plugin(shortname)
+    if lazy and (entry := lazy_entry(shortname, file)):
+        return load_lazy_module(shortname, entry, plugin_path=plugin_path)
+    load_module(shortname, plugin_path=plugin_path)
+
+
+def reloadable_plugins(names):
+    "plugins whose import only registers handlers, so running it again is safe"
+    reloadable = []
+    for shortname in names:
+        if shortname in LAZY_PLUGINS:
+            reloadable.append(shortname)
+            continue
+        try:
+            with open(_plugin_file(shortname)) as f:
+                if lazy_safe(f.read()):
+                    reloadable.append(shortname)
+        except (OSError, SyntaxError, ValueError):
+            continue
+    return reloadable
+
+
+async def reload_plugins(event=None):
+    """
+    Reload plugins in place, so gvar and config changes that are read when
+    handlers are registered (sudo users and commands, blacklisted chats,
+    command handlers) apply without reconnecting. Plugins that start loops,
+    schedulers or add other handlers at import are left alone, importing them
+    twice would run all of that twice, they pick the change up on restart.
+    """
+    # cat_cmd reads the sudo commands once at import
+    _client.sudo_enabledcmds = sudo_enabled_cmds()
+    names = list(PLUGIN_PATHS)
+    reloadable = await run_in_thread(reloadable_plugins)(names)
+    skipped = [shortname for shortname in names if shortname not in reloadable]
+    # the triggering update is still being dispatched over the handler list
+    _detach_handlers()
+    failed = []
+    for shortname in reloadable:
+        try:
+            reload_plugin(shortname)
+        except Exception as e:
+            LOGS.error(f"unable to reload {shortname} because of error {e}")
+            failed.append(shortname)
+        # let other updates through between plugins
+        await asyncio.sleep(0)
+    if event is not None:
+        text = event.text + "\n\n**Plugins reloaded, changes applied.**"
+        if failed:
+            text += f"\n**Failed to reload:** `{', '.join(failed)}`"
+        if skipped:
+            text += f"\n**Applies after a restart:** `{', '.join(skipped)}`"
+        await event.edit(text)
+    return failed
 
 
 def checkplugins(filename):
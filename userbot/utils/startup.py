@@ -7,10 +7,10 @@
 # Please see: https://github.com/TgCatUB/catuserbot/blob/master/LICENSE
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~#
 
+import asyncio
 import glob
 import os
 import sys
-import urllib.request
 from datetime import timedelta
 from pathlib import Path
 
@@ -19,16 +19,26 @@ from telethon import Button, functions, types, utils
 from userbot import BOTLOG, BOTLOG_CHATID, PM_LOGGER_GROUP_ID
 
 from ..Config import Config
+from ..core import http
 from ..core.logger import logging
+from ..core.manifest import (
+    MANIFEST,
+    lazy_entry,
+    load_manifest,
+    refresh_manifest,
+    save_manifest,
+)
+from ..core.peercache import restore_peers
+from ..core.pool import run_in_thread
 from ..core.session import catub
-from ..helpers.utils import install_pip
+from ..helpers.utils import install_missing, install_pip
 from ..helpers.utils.utils import runcmd
 from ..sql_helper.global_collection import (
     del_keyword_collectionlist,
     get_item_collectionlist,
 )
 from ..sql_helper.globals import addgvar, gvarstatus
-from .pluginmanager import load_module
+from .pluginmanager import import_profile, load_lazy_module, load_module
 from .tools import create_supergroup
 
 ENV = bool(os.environ.get("ENV", False))
@@ -47,6 +57,8 @@ async def setup_bot():
     """
     try:
         await catub.connect()
+        # a string session forgets access hashes, hand back the saved ones
+        restore_peers(catub)
         config = await catub(functions.help.GetConfigRequest())
         for option in config.dc_options:
             if option.ip_address == catub.session.server_address:
@@ -140,6 +152,8 @@ async def load_plugins(folder, extfolder=None):
     """
     To load plugins from the mentioned folder
     """
+    if not MANIFEST:
+        load_manifest()
     if extfolder:
         path = f"{extfolder}/*.py"
         plugin_path = extfolder
@@ -148,6 +162,18 @@ async def load_plugins(folder, extfolder=None):
         plugin_path = f"userbot/{folder}"
     files = glob.glob(path)
     files.sort()
+    if Config.LAZY_PLUGINS:
+        refresh_manifest(files)
+    plugins = [
+        Path(name).stem
+        for name in files
+        if Path(name).stem not in Config.NO_LOAD and Path(name).stem not in VPS_NOLOAD
+    ]
+    # resolve every import up front so missing packages go in one pip call
+    if missing := await run_in_thread(install_missing)(
+        [f"{plugin_path}/{name}.py" for name in plugins]
+    ):
+        LOGS.info(f"Installed missing dependencies: {', '.join(sorted(missing))}")
     success = 0
     failure = []
     for name in files:
@@ -159,6 +185,11 @@ async def load_plugins(folder, extfolder=None):
                 if (pluginname not in Config.NO_LOAD) and (
                     pluginname not in VPS_NOLOAD
                 ):
+                    entry = Config.LAZY_PLUGINS and lazy_entry(pluginname, name)
+                    if entry:
+                        load_lazy_module(pluginname, entry, plugin_path=plugin_path)
+                        success += 1
+                        continue
                     flag = True
                     check = 0
                     while flag:
@@ -187,6 +218,14 @@ async def load_plugins(folder, extfolder=None):
                 LOGS.info(
                     f"unable to load {shortname} because of error {e}\nBase Folder {plugin_path}"
                 )
+    if Config.LAZY_PLUGINS:
+        save_manifest()
+    for shortname, (seconds, packages) in import_profile(plugins):
+        log = LOGS.warning if seconds * 1000 > Config.SLOW_PLUGIN_MS else LOGS.debug
+        log(
+            f"{plugin_path}/{shortname} imported in {seconds * 1000:.1f}ms"
+            + (f" (pulled in {', '.join(packages)})" if packages else "")
+        )
     if extfolder:
         if not failure:
             failure.append("None")
@@ -273,7 +312,8 @@ async def verifyLoggerGroup():
         sys.exit(0)
 
 
-async def install_externalrepo(repo, branch, cfolder):
+async def clone_externalrepo(repo, branch, cfolder):
+    "clone an external repo, returns its url and requirements file or None"
     CATREPO = repo
     rpath = os.path.join(cfolder, "requirements.txt")
     if CATBRANCH := branch:
@@ -284,20 +324,41 @@ async def install_externalrepo(repo, branch, cfolder):
         repourl = CATREPO
         gcmd = f"git clone {CATREPO} {cfolder}"
         errtext = f"The link({CATREPO}) you provided for `EXTERNAL_REPO` in vars is invalid. please recheck that link"
-    response = urllib.request.urlopen(repourl)
-    if response.code != 200:
+    response = await http.get(repourl)
+    if response.status != 200:
         LOGS.error(errtext)
-        return await catub.tgbot.send_message(BOTLOG_CHATID, errtext)
+        await catub.tgbot.send_message(BOTLOG_CHATID, errtext)
+        return None
     await runcmd(gcmd)
     if not os.path.exists(cfolder):
         LOGS.error(
             "There was a problem in cloning the external repo. please recheck external repo link"
         )
-        return await catub.tgbot.send_message(
+        await catub.tgbot.send_message(
             BOTLOG_CHATID,
             "There was a problem in cloning the external repo. please recheck external repo link",
         )
-    if os.path.exists(rpath):
-        await runcmd(f"pip3 install --no-cache-dir -r {rpath}")
-    success, failure = await load_plugins(folder="userbot", extfolder=cfolder)
-    return repourl, cfolder, success, failure
+        return None
+    return repourl, rpath if os.path.exists(rpath) else None
+
+
+async def install_externalrepos(repos):
+    """
+    Clone the given (repo, branch, folder) external repos concurrently, install
+    all their requirements in one pip call and then load them one by one
+    """
+    cloned = await asyncio.gather(
+        *(clone_externalrepo(repo, branch, cfolder) for repo, branch, cfolder in repos)
+    )
+    if requirements := [data[1] for data in cloned if data and data[1]]:
+        await runcmd(
+            "pip3 install --no-cache-dir "
+            + " ".join(f"-r {rpath}" for rpath in requirements)
+        )
+    results = []
+    for (repo, branch, cfolder), data in zip(repos, cloned):
+        if data is None:
+            continue
+        success, failure = await load_plugins(folder="userbot", extfolder=cfolder)
+        results.append((data[0], cfolder, success, failure))
+    return results